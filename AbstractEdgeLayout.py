@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8, vim: expandtab:ts=4 -*-
 
+import copy
+import re
 from abc import ABCMeta, abstractmethod
-from PyQt4 import QtGui, QtCore
 
 """
  * An AbstractEdgeLayout serves as a base class for edge layout classes. It mostly stores properties associated with
@@ -232,6 +233,20 @@ class AbstractEdgeLayout(metaclass=ABCMeta):
                 return self._colors[substring]
         return 0, 0, 0  # Color.BLACK
 
+    """
+     * Return the CSS class for edges of the given type (see SVGWriter.Scene.cssClasses). The class is named after the
+     * substring that selects the color of the type, so all edges of one color can be restyled together (e.g. the FP and
+     * FN edges of a diff).
+     *
+     * @param type the type for which we want the class for.
+     * @return the CSS class for the given edge type or None if no color is set for it.
+    """
+    def getStyleClass(self, type):
+        for substring in self._colors.keys():
+            if substring in type:
+                return "type-" + re.sub("[^A-Za-z0-9_-]", "_", substring)
+        return None
+
     """
      * Add an edge to the selection. Selected edges will be drawn using a bolder stroke.
      *
@@ -317,27 +332,6 @@ class AbstractEdgeLayout(metaclass=ABCMeta):
         return result
     """
 
-    """
-     * Calculate the number of edges under each edge and returns the max. of these numbers.
-     *
-     * @param dominates a map from edges to the edges it dominates.
-     * @param depth     the resulting depths of each edge.
-     * @param root      the root of the graph.
-     * @return the max. depth.
-    """
-    def calculateDepth(self, dominates, depth, root):
-        if depth[root] > 0:
-            return depth[root]
-        if len(dominates[root]) == 0:
-            return 0
-        max = 0
-        for children in dominates[root]:
-            current = self.calculateDepth(dominates, depth, children)
-            if current > max:
-                max = current
-        depth[root] = max + 1
-        return max + 1
-
     """
      * Return the point at the start of the given edge.
      *
@@ -447,3 +441,22 @@ class AbstractEdgeLayout(metaclass=ABCMeta):
         self._visible = set()
         self._maxWidth = 0
         self._maxHeight = 0
+
+    """
+     * Returns a new layout with the same settings (colors, strokes, selected edges etc.) but without the state of the
+     * last drawing, so it can draw in another thread than this layout (see NLPCanvas.scheduleNLPGraphics).
+     *
+     * @return the copy of the layout.
+    """
+    def copy(self):
+        layout = copy.copy(self)
+        layout._colors = dict(self._colors)
+        layout._strokes = dict(self._strokes)
+        layout._selected = set(self._selected)
+        layout._From = {}
+        layout._To = {}
+        layout._shapes = {}
+        layout._visible = set()
+        layout._maxWidth = 0
+        layout._maxHeight = 0
+        return layout
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8, vim: expandtab:ts=4 -*-
 
+import copy
+
 from TokenLayout import TokenLayout
 from Edge import Edge
 # from PyQt4 import QtGui, QtCore
@@ -59,6 +61,15 @@ class AligmentRenderer:
         self._tokenLayout2.toSplitPoint = 0
         self._tokenLayout2.fromSplitPoint = 0
 
+    """
+     * Returns a new renderer with copies of the layouts of this one (see AbstractEdgeLayout.copy).
+    """
+    def copy(self):
+        renderer = copy.copy(self)
+        renderer._tokenLayout1 = self._tokenLayout1.copy()
+        renderer._tokenLayout2 = self._tokenLayout2.copy()
+        return renderer
+
     """
      * Renders the given instance as a single sentence with spans drawn below tokens, and dependencies above tokens.
      *
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from SVGCanvas import SVGCanvas
+from NLPDiff import NLPDiff
+from TokenFilter import TokenFilter
+from EdgeTypeFilter import EdgeTypeFilter
+from EdgeLabelFilter import EdgeLabelFilter
+from EdgeTokenFilter import EdgeTokenFilter
+from FilterPipeline import FilterPipeline
+from ioFormats.LazyCorpus import LazyCorpus
+from ioFormats.TabProcessor import processors
+
+"""
+ * BatchExport renders every sentence of a corpus (or every difference between a gold and a guess corpus) to an SVG
+ * file without the GUI. It draws the sentences with an SVGCanvas and the same filters and diff as the GUI but does not
+ * import PyQt4, and the sentences are rendered by a pool of worker processes.
+ *
+ * Usage: python3 BatchExport.py CoNLL2009 gold.txt [--guess guess.txt] --output svgs/ [filter options]
+"""
+
+
+class BatchExport:
+
+    """
+     * The number of sentences a worker exports in one task.
+    """
+    @property
+    def chunkSize(self):
+        return self._chunkSize
+
+    @chunkSize.setter
+    def chunkSize(self, value):
+        self._chunkSize = value
+
+    """
+     * Creates a new BatchExport. The corpora are opened when they are needed, so an exporter can be sent to the worker
+     * processes.
+     *
+     * @param factory   the processor that creates the instances of the corpus files.
+     * @param gold      the gold corpus file.
+     * @param guess     the guess corpus file (optional). If it is given, the differences to the gold corpus are drawn.
+     * @param output    the output directory.
+     * @param compress  should the files be written as .svgz.
+     * @param encoding  the encoding of the corpus files.
+    """
+    def __init__(self, factory, gold, guess=None, output=".", compress=False, encoding="utf-8"):
+        self._factory = factory
+        self._goldPath = gold
+        self._guessPath = guess
+        self._output = output
+        self._compress = compress
+        self._encoding = encoding
+        self._chunkSize = 200
+        self._allowedTypes = None
+        self._allowedPostfixTypes = {"FP", "FN", "Match"}
+        self._allowedLabels = set()
+        self._allowedTokens = set()
+        self._forbiddenProperties = set()
+        self._wholeWords = False
+        self._gold = None
+        self._guess = None
+        self._canvas = None
+        self._edgeTypeFilter = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_gold", "_guess", "_canvas", "_edgeTypeFilter"):
+            state[name] = None
+        return state
+
+    """
+     * Restricts the edges to the given type prefixes (e.g. dep, role). All types are drawn if this is not called.
+     *
+     * @param types the allowed type prefixes.
+    """
+    def setAllowedTypes(self, types):
+        self._allowedTypes = set(types)
+
+    """
+     * Sets which kinds of differences are drawn.
+     *
+     * @param matches   draw the edges that are in both corpora.
+     * @param falsePositives draw the edges that are only in the guess corpus.
+     * @param falseNegatives draw the edges that are only in the gold corpus.
+    """
+    def setAllowedDifferences(self, matches=True, falsePositives=True, falseNegatives=True):
+        self._allowedPostfixTypes = {postfix for postfix, allowed in (("Match", matches), ("FP", falsePositives),
+                                                                      ("FN", falseNegatives)) if allowed}
+
+    """
+     * Only draws the edges whose label contains one of the given substrings (see EdgeLabelFilter).
+    """
+    def setAllowedLabels(self, labels):
+        self._allowedLabels = set(labels)
+
+    """
+     * Only draws the edges at tokens with one of the given property values (see EdgeTokenFilter).
+    """
+    def setAllowedTokens(self, tokens, wholeWords=False):
+        self._allowedTokens = set(tokens)
+        self._wholeWords = wholeWords
+
+    """
+     * Hides the given token properties (see TokenFilter).
+    """
+    def setForbiddenProperties(self, properties):
+        self._forbiddenProperties = set(properties)
+
+    """
+     * Returns the number of sentences that will be exported.
+    """
+    def __len__(self):
+        return len(self.getGold())
+
+    def getGold(self):
+        if self._gold is None:
+            self._gold = LazyCorpus(self._goldPath, self._factory, encoding=self._encoding)
+        return self._gold
+
+    def getGuess(self):
+        if self._guess is None and self._guessPath is not None:
+            self._guess = LazyCorpus(self._guessPath, self._factory, encoding=self._encoding)
+        return self._guess
+
+    """
+     * Creates the canvas with the same settings as the GUI (see CorpusNavigator) and the filters of the options.
+    """
+    def createCanvas(self):
+        canvas = SVGCanvas()
+        for type, order in (("pos", 0), ("chunk (BIO)", 1), ("chunk", 2), ("ner (BIO)", 2), ("ner", 3), ("sense", 4),
+                            ("role", 5), ("phase", 5)):
+            canvas.renderer.setEdgeTypeOrder(type, order)
+        if self._guessPath is not None:
+            canvas.renderer.setEdgeTypeColor("FN", (0, 0, 255))  # Blue
+            canvas.renderer.setEdgeTypeColor("FP", (255, 0, 0))  # Red
+        self._edgeTypeFilter, canvas.filter = self.createFilter()
+        return canvas
+
+    """
+     * Creates the filter pipeline of the given options in the order of the GUI.
+    """
+    def createFilter(self):
+        tokenFilter = TokenFilter()
+        for property in self._forbiddenProperties:
+            tokenFilter.addForbiddenProperty(property)
+        edgeTypeFilter = EdgeTypeFilter(*(self._allowedTypes or ()))
+        for postfix in self._allowedPostfixTypes:
+            edgeTypeFilter.addAllowedPostfixType(postfix)
+        edgeLabelFilter = EdgeLabelFilter(*self._allowedLabels)
+        edgeTokenFilter = EdgeTokenFilter(*self._allowedTokens)
+        edgeTokenFilter.wholeWords = self._wholeWords
+        return edgeTypeFilter, FilterPipeline(tokenFilter, edgeTypeFilter, edgeLabelFilter, edgeTokenFilter)
+
+    """
+     * Renders the sentence with the given index.
+     *
+     * @param index the index of the sentence.
+     * @return the rendered scene.
+    """
+    def render(self, index):
+        if self._canvas is None:
+            self._canvas = self.createCanvas()
+        instance = self.getGold()[index]
+        if self._guessPath is not None:
+            instance = NLPDiff().diff(instance, self.getGuess()[index])
+        if self._allowedTypes is None:
+            # Like the GUI, all types of the instance are allowed unless they were restricted
+            for edge in instance.getEdges():
+                self._edgeTypeFilter.addAllowedPrefixType(edge.getTypePrefix())
+        self._canvas.setNLPInstance(instance)
+        return self._canvas.renderSVGScene()
+
+    """
+     * Renders the sentence with the given index and writes it into the output directory. The files are named after
+     * the (1-based) sentence number.
+     *
+     * @param index the index of the sentence.
+     * @return the path of the written file.
+    """
+    def export(self, index):
+        name = "{0:0{1}d}".format(index + 1, len(str(len(self))))
+        path = os.path.join(self._output, name + (".svgz" if self._compress else ".svg"))
+        self.render(index).write_svg(path)
+        return path
+
+    """
+     * Exports the sentences from first to last (exclusive).
+     *
+     * @return the number of exported sentences.
+    """
+    def exportRange(self, first, last):
+        for index in range(first, last):
+            self.export(index)
+        return last - first
+
+    """
+     * Exports the given range of sentences with a pool of worker processes.
+     *
+     * @param workers the number of worker processes, None means the number of CPUs.
+     * @param first   the index of the first sentence.
+     * @param last    the index after the last sentence, None means the end of the corpus.
+     * @param progress a function that is called with the number of exported sentences after each chunk (optional).
+     * @return the number of exported sentences.
+    """
+    def run(self, workers=None, first=0, last=None, progress=None):
+        os.makedirs(self._output, exist_ok=True)
+        # Builds the sidecar indices once before the workers open the corpora
+        size = len(self)
+        if self.getGuess() is not None and len(self.getGuess()) < size:
+            raise ValueError("The guess corpus has fewer sentences ({0}) than the gold corpus ({1})".format(
+                len(self.getGuess()), size))
+        last = size if last is None else min(last, size)
+        chunks = [(start, min(start + self._chunkSize, last)) for start in range(first, last, self._chunkSize)]
+        workers = workers if workers is not None else os.cpu_count() or 1
+        done = 0
+        if workers <= 1 or len(chunks) <= 1:
+            for start, end in chunks:
+                done += self.exportRange(start, end)
+                if progress is not None:
+                    progress(done)
+            return done
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_initWorker,
+                                 initargs=(self,)) as executor:
+            for count in executor.map(_exportRange, [start for start, _ in chunks], [end for _, end in chunks]):
+                done += count
+                if progress is not None:
+                    progress(done)
+        return done
+
+
+"""
+ * The exporter of a worker process.
+"""
+_worker = None
+
+
+def _initWorker(exporter):
+    global _worker
+    _worker = exporter
+
+
+def _exportRange(first, last):
+    return _worker.exportRange(first, last)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the sentences of a corpus (or the differences between a gold "
+                                                 "and a guess corpus) to SVG files.")
+    parser.add_argument("format", type=str.lower, choices=sorted(processors.keys()),
+                        help="the format of the corpus files")
+    parser.add_argument("gold", help="the gold corpus file")
+    parser.add_argument("--guess", help="the guess corpus file, the differences to the gold corpus are drawn")
+    parser.add_argument("--output", "-o", default=".", help="the output directory (default: .)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPUs)")
+    parser.add_argument("--first", type=int, default=1, help="the first sentence to export (default: 1)")
+    parser.add_argument("--last", type=int, default=None, help="the last sentence to export (default: all)")
+    parser.add_argument("--svgz", action="store_true", help="write compressed .svgz files")
+    parser.add_argument("--encoding", default="utf-8", help="the encoding of the corpus files (default: utf-8)")
+    parser.add_argument("--types", nargs="+", metavar="TYPE", help="only draw edges of these type prefixes")
+    parser.add_argument("--no-matches", action="store_true", help="do not draw the edges found in both corpora")
+    parser.add_argument("--no-fp", action="store_true", help="do not draw the false positive edges")
+    parser.add_argument("--no-fn", action="store_true", help="do not draw the false negative edges")
+    parser.add_argument("--labels", nargs="+", metavar="LABEL", default=(),
+                        help="only draw edges whose label contains one of these substrings")
+    parser.add_argument("--tokens", nargs="+", metavar="VALUE", default=(),
+                        help="only draw edges at tokens with one of these property values")
+    parser.add_argument("--whole-words", action="store_true", help="match --tokens against whole property values")
+    parser.add_argument("--hide-properties", nargs="+", metavar="PROPERTY", default=(),
+                        help="do not draw these token properties")
+    args = parser.parse_args(argv)
+
+    exporter = BatchExport(processors[args.format](), args.gold, args.guess, args.output, args.svgz,
+                           args.encoding)
+    if args.types is not None:
+        exporter.setAllowedTypes(args.types)
+    exporter.setAllowedDifferences(not args.no_matches, not args.no_fp, not args.no_fn)
+    exporter.setAllowedLabels(args.labels)
+    exporter.setAllowedTokens(args.tokens, args.whole_words)
+    exporter.setForbiddenProperties(args.hide_properties)
+
+    last = args.last if args.last is not None else len(exporter)
+
+    def progress(done):
+        print("{0} sentences exported".format(done), end="\r", file=sys.stderr, flush=True)
+
+    done = exporter.run(args.workers, args.first - 1, last, progress)
+    print("{0} sentences exported to {1}".format(done, args.output))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
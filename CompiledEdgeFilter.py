@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+from EdgeFilter import *
+from EdgeTypeFilter import EdgeTypeFilter
+from EdgeLabelFilter import EdgeLabelFilter
+
+"""
+ * A CompiledEdgeFilter applies a sequence of EdgeTypeFilter and EdgeLabelFilter objects in a single pass over the
+ * edges. The filters only look at the type and the label of an edge, so their decision is computed once per distinct
+ * type and label string and kept in a lookup table until the version of one of the filters changes. Filtering an edge
+ * then costs two dictionary lookups instead of a walk over the edge list per filter.
+ *
+ * The same tables work on the interned string ids of a ColumnarCorpus (see CompiledEdgeFilter.mask), so the edges of a
+ * whole corpus are filtered in one pass over its type and label columns without creating any Edge objects.
+"""
+class CompiledEdgeFilter(EdgeFilter):
+
+    """
+     * Checks whether a filter can be compiled. Subclasses of the edge filters could override filterEdges, so only the
+     * filters themselves are compiled.
+     *
+     * @param filter the filter.
+     * @return true iff the filter is an EdgeTypeFilter or an EdgeLabelFilter.
+    """
+    @staticmethod
+    def isCompilable(filter):
+        return type(filter) in (EdgeTypeFilter, EdgeLabelFilter)
+
+    """
+     * Creates a new CompiledEdgeFilter.
+     *
+     * @param filters the EdgeTypeFilter and EdgeLabelFilter objects to combine.
+    """
+    def __init__(self, *filters):
+        self._filters = list(filters)
+        self._typeFilters = [filter for filter in filters if isinstance(filter, EdgeTypeFilter)]
+        self._labelFilters = [filter for filter in filters if isinstance(filter, EdgeLabelFilter)]
+        self._compiledVersion = None
+        self._types = {}
+        self._labels = {}
+
+    """
+     * The version changes whenever the version of one of the combined filters changes.
+    """
+    @property
+    def version(self):
+        return tuple(filter.version for filter in self._filters)
+
+    """
+     * Empties the lookup tables if one of the filters changed since they were filled.
+    """
+    def _compile(self):
+        version = self.version
+        if version != self._compiledVersion:
+            self._compiledVersion = version
+            self._types = {}
+            self._labels = {}
+
+    """
+     * Checks whether all combined filters allow edges of the given type.
+    """
+    def acceptsType(self, type):
+        accepted = self._types.get(type)
+        if accepted is None:
+            accepted = self._types[type] = all(filter.acceptsType(type) for filter in self._typeFilters)
+        return accepted
+
+    """
+     * Checks whether all combined filters allow edges with the given label.
+    """
+    def acceptsLabel(self, label):
+        accepted = self._labels.get(label)
+        if accepted is None:
+            accepted = self._labels[label] = all(filter.acceptsLabel(label) for filter in self._labelFilters)
+        return accepted
+
+    """
+     * Returns the edges that all combined filters allow, in their original order.
+     *
+     * @param original the original set of edges.
+     * @return the filtered set of edges.
+     * @see EdgeFilter#filterEdges(Collection<Edge>)
+    """
+    def filterEdges(self, original):
+        self._compile()
+        types = self._types
+        labels = self._labels
+        result = []
+        for edge in original:
+            accepted = types.get(edge.type)
+            if accepted is None:
+                accepted = self.acceptsType(edge.type)
+            if accepted:
+                accepted = labels.get(edge.label)
+                if accepted is None:
+                    accepted = self.acceptsLabel(edge.label)
+                if accepted:
+                    result.append(edge)
+        return result
+
+    """
+     * Filters all edges of a ColumnarCorpus at once. The filters are evaluated once per distinct type and label id of
+     * the corpus, the mask is then built from the type and label columns.
+     *
+     * @param corpus the corpus.
+     * @return a bytearray with a 1 for every edge of the corpus that the filters allow and a 0 for the others. The edges
+     *         of the sentence i are mask[corpus.edgeStarts[i]:corpus.edgeStarts[i + 1]] (see ColumnarCorpus.getInstance).
+    """
+    def mask(self, corpus):
+        self._compile()
+        getString = corpus.getString
+        edgeTypes = corpus.edgeTypes
+        edgeLabels = corpus.edgeLabels
+        types = {typeId: self.acceptsType(getString(typeId)) for typeId in set(edgeTypes)}
+        labels = {labelId: self.acceptsLabel(getString(labelId)) for labelId in set(edgeLabels)}
+        return bytearray(types[typeId] and labels[labelId] for typeId, labelId in zip(edgeTypes, edgeLabels))
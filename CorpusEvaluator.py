@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from NLPDiff import NLPDiff
+from ioFormats.LazyCorpus import LazyCorpus
+from ioFormats.TabProcessor import processors
+
+"""
+ * A CorpusEvaluator scores a whole guess corpus against its gold corpus. Every pair of instances is passed through
+ * NLPDiff and the matches, false positives and false negatives are counted by edge type prefix (labeled and unlabeled)
+ * and by label. The sentences are evaluated in chunks by a pool of worker processes and the counts are merged into one
+ * Evaluation.
+ *
+ * Usage: python3 CorpusEvaluator.py CoNLL2009 gold.txt guess.txt [--output report.txt]
+"""
+
+
+class Evaluation:
+
+    """
+     * The counts of the evaluation: a dictionary from a key to a [matches, false positives, false negatives] list.
+     * The keys are ("labeled", type prefix), ("unlabeled", type prefix) and ("label", type prefix, label).
+    """
+    @property
+    def counts(self):
+        return self._counts
+
+    """
+     * The number of evaluated sentences.
+    """
+    @property
+    def sentences(self):
+        return self._sentences
+
+    """
+     * The number of tokens of the evaluated gold sentences, without the artificial root tokens (see isRoot), i.e. the
+     * number of tokens that have a head.
+    """
+    @property
+    def tokens(self):
+        return self._tokens
+
+    def __init__(self):
+        self._counts = {}
+        self._sentences = 0
+        self._tokens = 0
+        self._diff = NLPDiff()
+
+    def __getstate__(self):
+        return self._counts, self._sentences, self._tokens
+
+    def __setstate__(self, state):
+        self._counts, self._sentences, self._tokens = state
+        self._diff = NLPDiff()
+
+    """
+     * Checks whether a token is the artificial root token that the CoNLL 2006, 2008 and 2009 processors put in front of
+     * the sentence. Some of them add it with the name and the value of the property swapped, so both are checked.
+     *
+     * @param token the token.
+     * @return true iff the token is a root token.
+    """
+    @staticmethod
+    def isRoot(token):
+        if token.intIndex != 0:
+            return False
+        return any(property.name == "-Root-" or value == "-Root-" for property, value in token.tokenProperties.items())
+
+    def _count(self, key, position):
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0, 0, 0]
+        counts[position] += 1
+
+    """
+     * Adds the differences of a pair of instances. The labeled counts (by type prefix and by label) are the edges of
+     * NLPDiff.diff, the unlabeled counts compare the edges by their tokens and type only.
+     *
+     * @param gold  the gold instance.
+     * @param guess the guess instance.
+    """
+    def add(self, gold, guess):
+        self._sentences += 1
+        self._tokens += sum(1 for token in gold.tokens if not Evaluation.isRoot(token))
+        positions = {"Match": 0, "FP": 1, "FN": 2}
+        for edge in self._diff.diff(gold, guess).getEdges():
+            prefix = edge.getTypePrefix()
+            self._count(("labeled", prefix), positions[edge.outcome])
+            self._count(("label", prefix, edge.label), positions[edge.outcome])
+        goldEdges = {(edge.From.index, edge.To.index, edge.type) for edge in gold.getEdges()}
+        guessEdges = {(edge.From.index, edge.To.index, edge.type) for edge in guess.getEdges()}
+        for From, to, type in goldEdges:
+            self._count(("unlabeled", type.split(":", 1)[0]), 0 if (From, to, type) in guessEdges else 2)
+        for From, to, type in guessEdges - goldEdges:
+            self._count(("unlabeled", type.split(":", 1)[0]), 1)
+
+    """
+     * Adds the counts of another evaluation (e.g. of another chunk of the corpus) to this one.
+     *
+     * @param other the other evaluation.
+    """
+    def merge(self, other):
+        self._sentences += other.sentences
+        self._tokens += other.tokens
+        for key, (matches, falsePositives, falseNegatives) in other.counts.items():
+            counts = self._counts.setdefault(key, [0, 0, 0])
+            counts[0] += matches
+            counts[1] += falsePositives
+            counts[2] += falseNegatives
+
+    """
+     * Returns the type prefixes of the evaluated edges.
+    """
+    def getTypes(self):
+        return sorted({key[1] for key in self._counts.keys()})
+
+    """
+     * Returns the labels of the evaluated edges of a type prefix.
+    """
+    def getLabels(self, type):
+        return sorted(key[2] for key in self._counts.keys() if key[0] == "label" and key[1] == type)
+
+    """
+     * Returns the precision, recall and F1 score of the counts with the given key.
+     *
+     * @param key a key of the counts (see Evaluation.counts).
+     * @return a (precision, recall, F1) triple, the scores of empty counts are 0.
+    """
+    def getScores(self, *key):
+        matches, falsePositives, falseNegatives = self._counts.get(key, [0, 0, 0])
+        precision = matches / (matches + falsePositives) if matches + falsePositives > 0 else 0.0
+        recall = matches / (matches + falseNegatives) if matches + falseNegatives > 0 else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+        return precision, recall, f1
+
+    """
+     * Writes the report of the evaluation: the labeled and unlabeled scores of every type prefix and the scores of
+     * every label. For dependencies (dep) the labeled and unlabeled attachment scores are the recalls, since every
+     * gold token has one head.
+     *
+     * @param out the file to write the report to.
+    """
+    def writeReport(self, out):
+        row = "{0:<24} {1:>8} {2:>8} {3:>8} {4:>8.2f} {5:>8.2f} {6:>8.2f}\n"
+        header = "{0:<24} {1:>8} {2:>8} {3:>8} {4:>8} {5:>8} {6:>8}\n".format("", "Match", "FP", "FN", "P", "R", "F1")
+        out.write("{0} sentences, {1} tokens\n".format(self._sentences, self._tokens))
+        for type in self.getTypes():
+            out.write("\n" + type + "\n")
+            if type == "dep":
+                out.write("LAS: {0:.2f}  UAS: {1:.2f}\n".format(100 * self.getScores("labeled", type)[1],
+                                                              100 * self.getScores("unlabeled", type)[1]))
+            out.write(header)
+            for name, key in (("labeled", ("labeled", type)), ("unlabeled", ("unlabeled", type))):
+                scores = self.getScores(*key)
+                out.write(row.format(name, *(self._counts.get(key, [0, 0, 0]) + [100 * s for s in scores])))
+            for label in self.getLabels(type):
+                key = ("label", type, label)
+                scores = self.getScores(*key)
+                out.write(row.format("  " + str(label), *(self._counts[key] + [100 * s for s in scores])))
+
+
+class CorpusEvaluator:
+
+    """
+     * The number of sentences a worker evaluates in one task.
+    """
+    @property
+    def chunkSize(self):
+        return self._chunkSize
+
+    @chunkSize.setter
+    def chunkSize(self, value):
+        self._chunkSize = value
+
+    """
+     * Creates a new CorpusEvaluator. The corpora are opened when they are needed, so an evaluator can be sent to the
+     * worker processes.
+     *
+     * @param factory  the processor that creates the instances of the corpus files.
+     * @param gold     the gold corpus file.
+     * @param guess    the guess corpus file.
+     * @param encoding the encoding of the corpus files.
+    """
+    def __init__(self, factory, gold, guess, encoding="utf-8"):
+        self._factory = factory
+        self._goldPath = gold
+        self._guessPath = guess
+        self._encoding = encoding
+        self._chunkSize = 1000
+        self._gold = None
+        self._guess = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_gold"] = None
+        state["_guess"] = None
+        return state
+
+    def getGold(self):
+        if self._gold is None:
+            self._gold = LazyCorpus(self._goldPath, self._factory, encoding=self._encoding)
+        return self._gold
+
+    def getGuess(self):
+        if self._guess is None:
+            self._guess = LazyCorpus(self._guessPath, self._factory, encoding=self._encoding)
+        return self._guess
+
+    """
+     * Evaluates the sentences from first to last (exclusive).
+     *
+     * @return the Evaluation of the sentences.
+    """
+    def evaluateRange(self, first, last):
+        evaluation = Evaluation()
+        gold = self.getGold()
+        guess = self.getGuess()
+        for index in range(first, last):
+            evaluation.add(gold[index], guess[index])
+        return evaluation
+
+    """
+     * Evaluates the whole corpus with a pool of worker processes.
+     *
+     * @param workers the number of worker processes, None means the number of CPUs.
+     * @return the Evaluation of the corpus.
+    """
+    def evaluate(self, workers=None):
+        # Builds the sidecar indices once before the workers open the corpora
+        size = len(self.getGold())
+        if len(self.getGuess()) != size:
+            raise ValueError("The gold corpus has {0} sentences, the guess corpus {1}".format(size,
+                                                                                             len(self.getGuess())))
+        chunks = [(start, min(start + self._chunkSize, size)) for start in range(0, size, self._chunkSize)]
+        workers = workers if workers is not None else os.cpu_count() or 1
+        evaluation = Evaluation()
+        if workers <= 1 or len(chunks) <= 1:
+            for start, end in chunks:
+                evaluation.merge(self.evaluateRange(start, end))
+            return evaluation
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_initWorker,
+                                 initargs=(self,)) as executor:
+            for result in executor.map(_evaluateRange, [start for start, _ in chunks], [end for _, end in chunks]):
+                evaluation.merge(result)
+        return evaluation
+
+
+"""
+ * The evaluator of a worker process.
+"""
+_worker = None
+
+
+def _initWorker(evaluator):
+    global _worker
+    _worker = evaluator
+
+
+def _evaluateRange(first, last):
+    return _worker.evaluateRange(first, last)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a guess corpus against a gold corpus.")
+    parser.add_argument("format", type=str.lower, choices=sorted(processors.keys()),
+                        help="the format of the corpus files")
+    parser.add_argument("gold", help="the gold corpus file")
+    parser.add_argument("guess", help="the guess corpus file")
+    parser.add_argument("--output", "-o", help="write the report to this file instead of the standard output")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPUs)")
+    parser.add_argument("--encoding", default="utf-8", help="the encoding of the corpus files (default: utf-8)")
+    args = parser.parse_args(argv)
+
+    evaluation = CorpusEvaluator(processors[args.format](), args.gold, args.guess, args.encoding).evaluate(args.workers)
+    if args.output is None:
+        evaluation.writeReport(sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            evaluation.writeReport(out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
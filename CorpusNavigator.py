@@ -4,6 +4,7 @@
 from NLPCanvas import NLPCanvas
 from NLPDiff import *
 from utils.Pair import *
+from InstancePrefetcher import InstancePrefetcher
 from PyQt4 import QtGui, QtCore, QtSvg
 
 
@@ -290,7 +291,12 @@ class CorpusNavigator:
         self._indexSearcher = None
         self._diff = NLPDiff()
 
+        # The instances (or differences) by index, see InstancePrefetcher
+        self._prefetcher = None
         self._indicies = {}
+        if goldLoader is not None:
+            self._prefetcher = InstancePrefetcher(goldLoader, guessLoader, self._diff)
+            self._indicies = self._prefetcher.cache
 
         self._guess = guessLoader
         self._gold = goldLoader
@@ -319,6 +325,7 @@ class CorpusNavigator:
 
         def indexChanged(index):
             self.updateCanvas()
+        self._indexChanged = indexChanged
         self._spinner.valueChanged.connect(indexChanged)
 
         if self._goldCorpora is not None:
@@ -342,6 +349,7 @@ class CorpusNavigator:
         def itemClicked(item):
             i = self._searchResultListWidget.row(item)
             self._spinner.setValue(self._searchResultDictModel[i+1])
+        self._itemClicked = itemClicked
         self._searchResultListWidget.itemClicked.connect(itemClicked)
 
         self._searchButton = ui.searchButton
@@ -363,14 +371,10 @@ class CorpusNavigator:
         if text == "":
             self._searchResultListWidget.clear()
             return
+        if self._prefetcher is None:
+            return
         for index in range(self._spinner.minimum()-1, self._spinner.maximum()):
-            if index not in self._indicies:
-                if self._gold is not None:
-                    if self._guess is None:
-                        self._indicies[index] = self._goldCorpora[index]
-                    else:
-                        self._indicies[index] = self.getDiffCorpus(self._goldCorpora[index], self._guessCorpora[index])
-            instance = self._indicies[index]
+            instance = self._prefetcher.findInstance(index)
             sentence = ""
             for token in instance.tokens:
                 word = token.getProperty(TokenProperty("Word"))
@@ -389,19 +393,10 @@ class CorpusNavigator:
     def updateCanvas(self):
         index = self._spinner.value() - 1
         if self._gold is not None:
-            if self._guess is None:
-                if index in self._indicies:
-                    self._instance = self._indicies[index]
-                else:
-                    self._instance = self._goldCorpora[index]
-                    self._indicies[index] = self._instance
-
-            else:
-                if index in self._indicies:
-                    self._instance = self._indicies[index]
-                else:
-                    self._instance = self.getDiffCorpus(self._goldCorpora[index], self._guessCorpora[index])
-                    self._indicies[index] = self._instance
+            self._instance = self._prefetcher.getInstance(index)
+            # Loads the neighbours while the current instance is shown
+            self._prefetcher.prefetch(index)
+            if self._guess is not None:
                 self._canvas.renderer.setEdgeTypeColor("FN", (000,000,255)) #Blue
                 self._canvas.renderer.setEdgeTypeColor("FP", (255,000,000)) #Red
         else:
@@ -422,4 +417,15 @@ class CorpusNavigator:
         self._canvas.setNLPInstance(self._instance)
         self._canvas.updateNLPGraphics()
 
+    """
+     * Disconnects the navigator from the widgets and stops the background thread of its prefetcher, e.g. before the
+     * GUI replaces it with a navigator for other corpora.
+    """
+    def close(self):
+        self._spinner.valueChanged.disconnect(self._indexChanged)
+        self._searchResultListWidget.itemClicked.disconnect(self._itemClicked)
+        self._searchButton.clicked.disconnect(self.searchCorpus)
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+
 
@@ -27,7 +27,8 @@ class DependencyFilterPanel:
             split = text.split(",")
             for label in split:
                 edgeLabelFilter.addAllowedLabel(label)
-            nlpCanvas.updateNLPGraphics()
+            # Called for every keystroke, the canvas is drawn once the typing pauses
+            nlpCanvas.scheduleNLPGraphics()
         labelField.textEdited.connect(labelFieldChanged)
 
         tokenTextField = gui.edgeFilterTokenLineEdit
@@ -38,7 +39,7 @@ class DependencyFilterPanel:
             split = text.split(",")
             for property in split:
                 edgeTokenFilter.addAllowedProperty(property)
-            nlpCanvas.updateNLPGraphics()
+            nlpCanvas.scheduleNLPGraphics()
         tokenTextField.textEdited.connect(tokenTextFieldChanged)
 
         usePath = gui.onlyPathCheckBox
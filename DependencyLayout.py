@@ -7,9 +7,11 @@ import operator
 
 
 from AbstractEdgeLayout import AbstractEdgeLayout
+from EdgeNesting import EdgeNesting
 from utils.Counter import Counter
 from utils.HashMultiMapArrayList import HashMultiMapArrayList
 from SVGWriter import *
+from TextMetrics import TextMetrics
 
 
 """
@@ -73,25 +75,15 @@ class DependencyLayout(AbstractEdgeLayout):
 
         depth = Counter()
         offset = Counter()
-        dominates = HashMultiMapArrayList()  # XXX THIS IS LINKED LIST NOT ARRAY LIST!
+        for edge, edgeDepth in EdgeNesting.dependencyDepths(edges_).items():
+            depth[edge] = edgeDepth
 
-        for over in edges_:
-            for under in edges_:
-                if over != under and (over.covers(under) or over.coversSemi(under) or
-                                          over.coversExactly(under) and over.lexicographicOrder(under) > 0):
-                    dominates[over] = under
-
-        for edge in edges_:
-            self.calculateDepth(dominates, depth, edge)
-
-        for left in edges_:
-            for right in edges_:
-                if left != right and left.crosses(right) and depth[left] == depth[right]:
-                    if offset[left] == 0 and offset[right] == 0:
-                        offset.increment(left, self._heightPerLevel // 2)
-                    elif offset[left] == offset[right]:
-                        offset[left] = self._heightPerLevel // 3
-                        offset[right] = self._heightPerLevel * 2 // 3
+        for left, right in EdgeNesting.crossingPairs(edges_, depth):
+            if offset[left] == 0 and offset[right] == 0:
+                offset.increment(left, self._heightPerLevel // 2)
+            elif offset[left] == offset[right]:
+                offset[left] = self._heightPerLevel // 3
+                offset[right] = self._heightPerLevel * 2 // 3
 
         # calculate maxHeight and maxWidth
         maxHeight = (depth.getMaximum() + 1) * self._heightPerLevel + 3
@@ -165,7 +157,9 @@ class DependencyLayout(AbstractEdgeLayout):
         for edge in edges_:
             # set Color and remember old color
             old = scene.color
+            oldClass = scene.cssClass
             scene.color = self.getColor(edge.type)
+            scene.cssClass = self.getStyleClass(edge.type)
             # draw lines
             height = self._baseline + maxHeight - (depth[edge] + 1) * self._heightPerLevel + offset[edge]
             if edge.From == edge.To:
@@ -193,7 +187,7 @@ class DependencyLayout(AbstractEdgeLayout):
             # write label in the middle under
 
             # XXX Original fontsize is 8
-            labelwith = round(Text(scene, (0, 0), edge.getLabelWithNote(), 12, scene.color).getWidth() * 0.9)
+            labelwith = round(TextMetrics.getWidth(edge.getLabelWithNote(), 12) * 0.9)
             labelx = min(p1[0], p3[0]) + abs(p1[0]-p3[0]) // 2# - labelwith // 2
             # labely = height + 1
             labely = height + 10 + 1  # XXX layout.getAscent()
@@ -201,6 +195,7 @@ class DependencyLayout(AbstractEdgeLayout):
             scene.add(Text(scene, (labelx, labely), edge.getLabelWithNote(), 12, scene.color))
 
             scene.color = old
+            scene.cssClass = oldClass
             self._shapes[shape] = edge
 
         maxWidth = max(itertools.chain(From.values(), To.values()), key=operator.itemgetter(0), default=(0,))[0]
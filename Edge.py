@@ -18,6 +18,8 @@ from enum import Enum
 
 
 class Edge:
+    __slots__ = ('_From', '_To', '_label', '_note', '_type', '_renderType', '_description', '_minIndex', '_maxIndex',
+                 '_typePrefix', '_typePostfix', '_hash')
 
     """
      * The RenderType enum can be used to specify how the edge should be rendered.
@@ -42,6 +44,8 @@ class Edge:
     @From.setter
     def From(self, value):
         self._From = value
+        self._updateIndices()
+        self._updateHash()
 
     """
      * The end token.
@@ -53,6 +57,8 @@ class Edge:
     @To.setter
     def To(self, value):
         self._To = value
+        self._updateIndices()
+        self._updateHash()
 
     """
      * The label of the edge.
@@ -64,6 +70,7 @@ class Edge:
     @label.setter
     def label(self, value):
         self._label = value
+        self._updateHash()
 
     """
      * A description of the edge to be printed when edge is clicked on
@@ -87,6 +94,7 @@ class Edge:
     @note.setter
     def note(self, value):
         self._note = value
+        self._updateHash()
 
     """
      * The type of the edge.
@@ -98,6 +106,8 @@ class Edge:
     @type.setter
     def type(self, value):
         self._type = value
+        self._updateType()
+        self._updateHash()
 
     """
      * How to render the edge
@@ -160,6 +170,61 @@ class Edge:
         self._type = Type
         self._renderType = renderType
         self._description = description
+        self._updateIndices()
+        self._updateType()
+        self._updateHash()
+
+    """
+     * Caches the integer indices of the tokens. They are used by all the predicates below (which are called in the
+     * quadratic loops of the layouts), so they are only computed when a token of the edge is set. (Changing the index
+     * of a token after it was added to an edge is not supported.)
+    """
+    def _updateIndices(self):
+        From = self._From.intIndex if self._From is not None else None
+        to = self._To.intIndex if self._To is not None else None
+        if From is None or to is None:
+            self._minIndex = self._maxIndex = None
+        else:
+            self._minIndex = min(From, to)
+            self._maxIndex = max(From, to)
+
+    """
+     * Caches the prefix and the postfix of the type.
+    """
+    def _updateType(self):
+        if self._type is None:
+            self._typePrefix = None
+            self._typePostfix = None
+        else:
+            prefix, colon, postfix = self._type.partition(':')
+            self._typePrefix = prefix
+            self._typePostfix = postfix
+
+    """
+     * Caches the hashcode (see __hash__).
+    """
+    def _updateHash(self):
+        result = 0
+        if self._From is not None:
+            result = hash(self._From)
+
+        result *= 31
+        if self._To is not None:
+            result += hash(self._To)
+
+        result *= 31
+        if self._label is not None:
+            result += hash(self._label)
+
+        result *= 31
+        if self._type is not None:
+            result += hash(self._type)
+
+        result *= 31
+        if self._note is not None:
+            result += hash(self._note)
+
+        self._hash = result
 
     """
      * If the type of label is qualified with a "qualifier:" prefix this method returns "qualifier". Else it returns the
@@ -169,11 +234,7 @@ class Edge:
      *         string.
     """
     def getTypePrefix(self):
-        index = self._type.find(':')
-        if index == -1:
-            return self._type
-        else:
-            return self._type[0:index]
+        return self._typePrefix
 
     """
      * If the type of label is "prefix:postfix"  this method returns "postfix". Else it returns the empty string.
@@ -181,11 +242,7 @@ class Edge:
      * @return postfix after ":" or empty string if no ":" is contained in the type string.
     """
     def getTypePostfix(self):
-        index = self._type.find(':')
-        if index == -1:
-            return ""
-        else:
-                return self._type[index+1:]
+        return self._typePostfix
 
     """
      * A description of the edge
@@ -200,22 +257,36 @@ class Edge:
      * @return the mimimal index of both tokens in this edge.
     """
     def getMinIndex(self):
-        if int(self._From.index) < int(self._To.index):
+        if self._From.intIndex < self._To.intIndex:
             return self._From.index
         else:
             return self._To.index
 
+    """
+     * The mimimal index of both tokens in this edge as an integer.
+    """
+    @property
+    def minIndex(self):
+        return self._minIndex
+
     """
      * Returns the maximal index of both tokens in this edge.
      *
      * @return the maximal index of both tokens in this edge.
     """
     def getMaxIndex(self):
-        if int(self._From.index) > int(self._To.index):
+        if self._From.intIndex > self._To.intIndex:
             return self._From.index
         else:
             return self._To.index
 
+    """
+     * The maximal index of both tokens in this edge as an integer.
+    """
+    @property
+    def maxIndex(self):
+        return self._maxIndex
+
     """
      * Returns the render type of this edge. For example, if this edge should be drawn as span it would return {@link
      * com.googlecode.whatswrong.Edge.RenderType#span}.
@@ -317,7 +388,7 @@ class Edge:
      * @return true iff both tokens of this edge are to the left of the given token.
     """
     def leftOf(self, token):
-        return int(self._From.index) <= int(token.index) and int(self._To.index) <= int(token.index)
+        return self._maxIndex <= token.intIndex
 
     """
      * Checks whether the edge is to the right of the given token.
@@ -326,7 +397,7 @@ class Edge:
      * @return true iff both tokens of this edge are to the right of the given token.
     """
     def rightOf(self, token):
-        return int(self._From.index) >= int(token.index) and int(self._To.index) >= int(token.index)
+        return self._minIndex >= token.intIndex
 
     """
      * Returns the distance between the from and to token.
@@ -334,7 +405,7 @@ class Edge:
      * @return the distance between the from and to token.
     """
     def getLength(self):
-        return abs(float(self._From.index) - float(self._To.index))
+        return float(self._maxIndex - self._minIndex)
 
     """
      * Check whether this edge completely covers the specified edge.
@@ -343,7 +414,7 @@ class Edge:
      * @return true iff the given edge is completely covered by this edge.
     """
     def covers(self, edge):
-        return int(self.getMinIndex()) < int(edge.getMinIndex()) <= int(edge.getMaxIndex()) < int(self.getMaxIndex())
+        return self._minIndex < edge.minIndex <= edge.maxIndex < self._maxIndex
 
     """
      * Check whether this edge spans the same sequence of tokens as the given edge.
@@ -352,7 +423,7 @@ class Edge:
      * @return true iff this edge covers the same sequence of tokens as the given edge.
     """
     def coversExactly(self, edge):
-        return int(edge.getMinIndex()) == int(self.getMinIndex()) <= int(self.getMaxIndex()) == int(edge.getMaxIndex())
+        return edge.minIndex == self._minIndex <= self._maxIndex == edge.maxIndex
 
     """
      * Checks whether this edge covers the given edge and is aligned with it on one side.
@@ -364,8 +435,8 @@ class Edge:
         #return edge.getMaxIndex() == self.getMaxIndex() >= self.getMinIndex() < edge.getMinIndex() or \
         #       self.getMinIndex() == edge.getMinIndex() <= edge.getMaxIndex() < self.getMaxIndex()
 
-        return int(self.getMinIndex()) < int(edge.getMinIndex()) and int(self.getMaxIndex()) == int(edge.getMaxIndex()) or \
-                int(self.getMinIndex()) == int(edge.getMinIndex()) and int(self.getMaxIndex()) > int(edge.getMaxIndex())
+        return self._minIndex < edge.minIndex and self._maxIndex == edge.maxIndex or \
+            self._minIndex == edge.minIndex and self._maxIndex > edge.maxIndex
 
     """
      * Checks whether this edge overlaps the given edge.
@@ -374,9 +445,8 @@ class Edge:
      * @return true iff the edges overlap.
     """
     def overlaps(self, edge):
-        return int(self.getMinIndex()) <= int(edge.getMinIndex()) <= int(self.getMaxIndex()) <= int(edge.getMaxIndex()) or \
-               int(edge.getMinIndex()) <= int(self.getMinIndex()) <= int(self.getMaxIndex()) <= int(edge.getMinIndex())\
-               <= int(edge.getMaxIndex())
+        return self._minIndex <= edge.minIndex <= self._maxIndex <= edge.maxIndex or \
+               edge.minIndex <= self._minIndex <= self._maxIndex <= edge.minIndex <= edge.maxIndex
 
     """
      * Checks whether the given edge is covered by this edge and at least one token is not aligned.
@@ -385,8 +455,8 @@ class Edge:
      * @return true if this edge covers the given edge and at least one token is not aligned.
     """
     def strictlyCovers(self, edge):
-        return int(self.getMinIndex()) < int(edge.getMinIndex()) <= int(edge.getMaxIndex()) <= int(self.getMaxIndex()) or \
-               int(self.getMinIndex()) <= int(edge.getMinIndex()) <= int(edge.getMaxIndex()) < int(self.getMaxIndex())
+        return self._minIndex < edge.minIndex <= edge.maxIndex <= self._maxIndex or \
+               self._minIndex <= edge.minIndex <= edge.maxIndex < self._maxIndex
 
     """
      * Returns a string representation of this edge.
@@ -403,17 +473,18 @@ class Edge:
      * @return true iff this edge crosses the given edge.
     """
     def crosses(self, edge):
-        return int(self.getMinIndex()) < int(edge.getMinIndex()) < int(self.getMaxIndex()) < int(edge.getMaxIndex()) or \
-               int(edge.getMinIndex()) < int(self.getMinIndex()) < int(edge.getMaxIndex()) < int(self.getMaxIndex())
+        return self._minIndex < edge.minIndex < self._maxIndex < edge.maxIndex or \
+               edge.minIndex < self._minIndex < edge.maxIndex < self._maxIndex
 
     """
      * Checks whether to edges are equal
      *
      * @param o the other edge
-     * @return true if both edges have the same type, label, note and the same from and to tokens.
+     * @return true if both edges have the same type, label, note and the same from and to tokens. Subclasses (such as
+     *         NLPDiff.DiffEdge) compare as edges, so the comparison is symmetric and agrees with the hash.
     """
     def __eq__(self, other):
-        if other is None or not isinstance(other, self.__class__):
+        if other is None or not isinstance(other, Edge):
             return False
 
         if self.From is not None and self.From != other.From or self.From is None and other.From is not None:
@@ -435,24 +506,4 @@ class Edge:
      * @return a hashcode based on type, label, note, from and to token.
     """
     def __hash__(self):
-        result = 0
-        if self.From is not None:
-            result = hash(self.From)
-
-        result *= 31
-        if self.To is not None:
-            result += hash(self.To)
-
-        result *= 31
-        if self.label is not None:
-            result += hash(self.label)
-
-        result *= 31
-        if self.type is not None:
-            result += hash(self.type)
-
-        result *= 31
-        if self.note is not None:
-            result += hash(self.note)
-
-        return result
+        return self._hash
@@ -32,6 +32,7 @@ class EdgeLabelFilter(EdgeFilter):
     """
     def addAllowedLabel(self, label=str):
         self._allowedLabels.add(label)
+        self.changed()
 
     """
     * Removes an allowed label substring.
@@ -40,12 +41,14 @@ class EdgeLabelFilter(EdgeFilter):
     """
     def removeAllowedLabel(self, label):
         self._allowedLabels.remove(label)
+        self.changed()
 
     """
      * Removes all allowed label substrings. In this state the filter allows all labels.
     """
     def clear(self):
         self._allowedLabels.clear()
+        self.changed()
 
     """
      * Filters out all edges that don't have a label that contains one of the allowed label substrings. If the set of
@@ -66,6 +69,18 @@ class EdgeLabelFilter(EdgeFilter):
                     break
         return result
 
+    """
+     * Checks whether the filter allows edges with the given label, i.e. whether filterEdges keeps an edge with this
+     * label.
+     *
+     * @param label the label of an edge.
+     * @return true iff there are no allowed label substrings or the label contains one of them.
+    """
+    def acceptsLabel(self, label):
+        if len(self._allowedLabels) == 0:
+            return True
+        return label is not None and any(allowed in label for allowed in self._allowedLabels)
+
     """
      * Checks whether the filter allows the given label substring.
      *
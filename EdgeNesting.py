@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+"""
+ * EdgeNesting computes how edges are stacked over each other by the edge layouts. An edge dominates the edges it has
+ * to be drawn above, and its depth is the length of the longest chain of dominated edges below it. The layouts used to
+ * find the dominated edges by testing every pair of edges; EdgeNesting computes the same depths with a sweep over the
+ * edges sorted by their start (O(n log n)) and finds the crossing edges of the same depth with binary searches (O(n log
+ * n + k) for k crossing pairs).
+"""
+
+
+class EdgeNesting:
+
+    """
+     * Calculates the depths of dependency edges. An edge dominates another edge if it covers it (see Edge.covers,
+     * Edge.coversSemi) or if both span the same tokens and it is lexicographically larger (see Edge.coversExactly and
+     * Edge.lexicographicOrder). The result is the same as DependencyLayout computed before by testing all pairs and
+     * counting the longest chain of dominated edges (see benchmarks/EdgeNestingBenchmark.py).
+     *
+     * @param edges the edges (without self loops), no two of them equal.
+     * @return a dictionary from each edge to its depth.
+    """
+    @staticmethod
+    def dependencyDepths(edges):
+        depths = {}
+        # Every edge processed before another one starts at or after it, the covered ones are those ending before it
+        EdgeNesting._sweep(edges, attrgetter('maxIndex'), -1, depths)
+        return depths
+
+    """
+     * Calculates the depths (levels) of spans. Spans are grouped by the order of their type prefix and every span
+     * dominates all spans of lower order. Within the same order a span dominates the spans that start inside of it (see
+     * Edge.covers, Edge.coversSemi and Edge.overlaps), the spans that start at the same token and end before it, and the
+     * lexicographically smaller spans over the same tokens. The result is the same as SpanLayout computed before by
+     * testing all pairs (see benchmarks/EdgeNestingBenchmark.py).
+     *
+     * @param edges    the spans.
+     * @param getOrder a function that returns the order of a type prefix.
+     * @return a dictionary from each span to its depth.
+    """
+    @staticmethod
+    def spanDepths(edges, getOrder):
+        groups = {}
+        for edge in edges:
+            order = getOrder(edge.getTypePrefix())
+            if order is None:
+                raise TypeError("No order is set for the span type {0}".format(edge.getTypePrefix()))
+            groups.setdefault(order, []).append(edge)
+        depths = {}
+        below = -1
+        for order in sorted(groups.keys()):
+            # Every span processed before another one starts at or after it, the dominated ones start before its end
+            EdgeNesting._sweep(groups[order], attrgetter('minIndex'), below, depths)
+            below = max(depths[edge] for edge in groups[order])
+        return depths
+
+    """
+     * Sweeps over the edges from right to left (by descending start and ascending end) and calculates the depth of
+     * each edge from the edges processed before it. The depths are stored in a prefix-max tree at the given coordinate
+     * of the edges and the query for an edge covers the coordinates up to its end.
+     *
+     * @param edges  the edges.
+     * @param key    the coordinate an edge is stored at.
+     * @param floor  the depth all edges dominate in any case (-1 if none).
+     * @param depths the dictionary to store the depths in.
+    """
+    @staticmethod
+    def _sweep(edges, key, floor, depths):
+        edges = sorted(edges, key=lambda e: (-e.minIndex, e.maxIndex))
+        coordinates = sorted({key(edge) for edge in edges})
+        tree = _MaxTree(len(coordinates))
+        first = 0
+        while first < len(edges):
+            # The edges spanning the same tokens are processed together: they do not see each other in the tree
+            a, b = edges[first].minIndex, edges[first].maxIndex
+            last = first + 1
+            while last < len(edges) and edges[last].minIndex == a and edges[last].maxIndex == b:
+                last += 1
+            below = max(floor, tree.query(bisect_right(coordinates, b) - 1))
+            EdgeNesting._groupDepths(edges[first:last], below, depths)
+            for edge in edges[first:last]:
+                tree.update(bisect_left(coordinates, key(edge)), depths[edge])
+            first = last
+
+    """
+     * Calculates the depths of a group of edges that span the same tokens. The edges are visited depth first with an
+     * explicit stack, so a large group does not hit the recursion limit, and every depth is calculated once.
+     *
+     * @param group  the edges.
+     * @param below  the largest depth of the edges covered by the group (-1 if there are none).
+     * @param depths the dictionary to store the depths in.
+     * @throws RuntimeError if the lexicographic order of the edges has a cycle.
+    """
+    @staticmethod
+    def _groupDepths(group, below, depths):
+        if len(group) == 1:
+            depths[group[0]] = below + 1
+            return
+        dominated = {edge: [other for other in group if other is not edge and edge.lexicographicOrder(other) > 0]
+                     for edge in group}
+        for root in group:
+            if root in depths:
+                continue
+            onStack = {root}
+            stack = [(root, iter(dominated[root]))]
+            while len(stack) > 0:
+                edge, children = stack[-1]
+                for child in children:
+                    if child in depths:
+                        continue
+                    if child in onStack:
+                        raise RuntimeError("Cyclic lexicographic order of edges: {0}".format(child))
+                    onStack.add(child)
+                    stack.append((child, iter(dominated[child])))
+                    break
+                else:
+                    stack.pop()
+                    onStack.discard(edge)
+                    depths[edge] = max([below] + [depths[other] for other in dominated[edge]]) + 1
+
+    """
+     * Returns the pairs of crossing edges (see Edge.crosses) that have the same depth. The pairs are returned in the
+     * order of a nested loop over the given sequence, i.e. both (left, right) and (right, left) are returned and the
+     * pairs of left are ordered by the position of right in the sequence.
+     *
+     * @param edges  the sequence of edges.
+     * @param depths the depths of the edges (a mapping from edge to depth).
+     * @return a list of (left, right) pairs.
+    """
+    @staticmethod
+    def crossingPairs(edges, depths):
+        edges = list(edges)
+        positions = {edge: position for position, edge in enumerate(edges)}
+        levels = {}
+        for edge in edges:
+            levels.setdefault(depths[edge], []).append(edge)
+        partners = {}
+        for level in levels.values():
+            # Edges of the same depth do not cover each other (only identical spans do), so if they are sorted by
+            # their start their ends are sorted too.
+            level.sort(key=lambda e: (e.minIndex, e.maxIndex))
+            starts = [edge.minIndex for edge in level]
+            ends = [edge.maxIndex for edge in level]
+            for edge in level:
+                a, b = edge.minIndex, edge.maxIndex
+                # starting inside the edge and ending right of it or ending inside the edge and starting left of it
+                crossing = level[bisect_right(starts, a):bisect_left(starts, b)] + \
+                    level[bisect_right(ends, a):bisect_left(ends, b)]
+                partners[edge] = [other for other in crossing if edge.crosses(other)]
+        result = []
+        for left in edges:
+            for right in sorted(partners[left], key=positions.__getitem__):
+                result.append((left, right))
+        return result
+
+
+"""
+ * A Fenwick tree that stores the maximum of the values at each position and returns the maximum of a prefix.
+"""
+
+
+class _MaxTree:
+
+    def __init__(self, size):
+        self._tree = [-1] * (size + 1)
+
+    def update(self, position, value):
+        position += 1
+        while position < len(self._tree):
+            if self._tree[position] < value:
+                self._tree[position] = value
+            position += position & -position
+
+    """
+     * Returns the maximum of the values at the positions up to (and including) the given position, -1 if empty.
+    """
+    def query(self, position):
+        position += 1  # position -1 gives an empty prefix
+        result = -1
+        while position > 0:
+            if self._tree[position] > result:
+                result = self._tree[position]
+            position -= position & -position
+        return result
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+"""
+ * EdgePaths finds the edges that are on a path between two tokens of interest (see EdgeTokenFilter.usePath). A path is
+ * a sequence of edges of the same type prefix that does not use an edge twice, where the direction of the edges does
+ * not matter. EdgeTokenFilter.calculatePaths enumerates all such paths, which is exponential in the number of edges.
+ * EdgePaths decides for every edge whether it is on such a path in O(V + E) per type prefix instead:
+ *
+ * 1. The bridges of the graph are found with one depth first search. The other edges are merged into their
+ *    2-edge-connected components with a union-find structure. A path can enter and leave such a component at any two of
+ *    its tokens and use any of its edges on the way, but it can only cross a bridge once.
+ * 2. The components and the bridges form a forest. The edges on the paths between the tokens of interest are the edges
+ *    of the smallest subtree that contains all components with a token of interest: leaf components without a token of
+ *    interest are pruned until none is left.
+ *
+ * The edges of each component are collected in a bitset over the positions of the edges, so the result is the union of
+ * the bitsets of the remaining components and bridges.
+"""
+
+
+class EdgePaths:
+
+    """
+     * Returns the edges that are on a path between two matching tokens (or from a matching token back to itself).
+     *
+     * @param edges   the edges.
+     * @param matches a function that returns whether a token is a token of interest.
+     * @return the edges on paths between matching tokens, in the order of the given edges.
+    """
+    @staticmethod
+    def pathEdges(edges, matches):
+        edges = list(edges)
+        # Equal edges are the same edge of the graph, they are represented by the position of the first one
+        first = {}
+        groups = {}
+        for position, edge in enumerate(edges):
+            if first.setdefault(edge, position) == position:
+                groups.setdefault(edge.getTypePrefix(), []).append(position)
+        bits = 0
+        for positions in groups.values():
+            bits |= EdgePaths._pathBits(edges, positions, matches)
+        return [edge for edge in edges if bits >> first[edge] & 1]
+
+    """
+     * Returns the bitset of the edges at the given positions that are on a path between matching tokens.
+    """
+    @staticmethod
+    def _pathBits(edges, positions, matches):
+        # The graph: vertex ids of the tokens and adjacency lists of (neighbour, edge position) pairs
+        ids = {}
+        tokens = []
+        adjacent = []
+        ends = {}
+        for position in positions:
+            edge = edges[position]
+            pair = []
+            for token in (edge.From, edge.To):
+                vertex = ids.get(token)
+                if vertex is None:
+                    vertex = ids[token] = len(tokens)
+                    tokens.append(token)
+                    adjacent.append([])
+                pair.append(vertex)
+            a, b = pair
+            ends[position] = a, b
+            if a != b:
+                adjacent[a].append((b, position))
+                adjacent[b].append((a, position))
+
+        bridges = EdgePaths._bridges(adjacent)
+
+        # The 2-edge-connected components: the union of the tokens of all edges that are not bridges
+        parent = list(range(0, len(tokens)))
+
+        def find(vertex):
+            while parent[vertex] != vertex:
+                parent[vertex] = parent[parent[vertex]]
+                vertex = parent[vertex]
+            return vertex
+
+        for position in positions:
+            if position not in bridges:
+                a, b = ends[position]
+                parent[find(a)] = find(b)
+
+        componentBits = {}
+        marked = set()
+        for vertex, token in enumerate(tokens):
+            component = find(vertex)
+            componentBits.setdefault(component, 0)
+            if matches(token):
+                marked.add(component)
+        for position in positions:
+            if position not in bridges:
+                component = find(ends[position][0])
+                componentBits[component] |= 1 << position
+
+        # The bridge forest, pruned from the leaves that have no matching token
+        tree = {component: [] for component in componentBits}
+        for position in bridges:
+            a, b = (find(vertex) for vertex in ends[position])
+            tree[a].append(b)
+            tree[b].append(a)
+        degree = {component: len(neighbours) for component, neighbours in tree.items()}
+        leaves = [component for component, d in degree.items() if d <= 1 and component not in marked]
+        removed = set()
+        while leaves:
+            component = leaves.pop()
+            if component in removed:
+                continue
+            removed.add(component)
+            for neighbour in tree[component]:
+                if neighbour not in removed:
+                    degree[neighbour] -= 1
+                    if degree[neighbour] <= 1 and neighbour not in marked:
+                        leaves.append(neighbour)
+
+        bits = 0
+        for component, componentBit in componentBits.items():
+            if component not in removed:
+                bits |= componentBit
+        for position in bridges:
+            a, b = ends[position]
+            if find(a) not in removed and find(b) not in removed:
+                bits |= 1 << position
+        return bits
+
+    """
+     * Finds the bridges of an undirected multigraph with an iterative depth first search (Tarjan's low-link values).
+     * Parallel edges are never bridges, since the search only skips the edge it came from, not the vertex.
+     *
+     * @param adjacent the adjacency lists of (neighbour, edge position) pairs.
+     * @return the set of the positions of the bridges.
+    """
+    @staticmethod
+    def _bridges(adjacent):
+        bridges = set()
+        discovered = [-1] * len(adjacent)
+        low = [0] * len(adjacent)
+        counter = 0
+        for root in range(0, len(adjacent)):
+            if discovered[root] >= 0:
+                continue
+            discovered[root] = low[root] = counter
+            counter += 1
+            stack = [(root, None, iter(adjacent[root]))]
+            while stack:
+                vertex, via, neighbours = stack[-1]
+                for neighbour, position in neighbours:
+                    if position == via:
+                        continue
+                    if discovered[neighbour] < 0:
+                        discovered[neighbour] = low[neighbour] = counter
+                        counter += 1
+                        stack.append((neighbour, position, iter(adjacent[neighbour])))
+                        break
+                    low[vertex] = min(low[vertex], discovered[neighbour])
+                else:
+                    stack.pop()
+                    if stack:
+                        parentVertex = stack[-1][0]
+                        low[parentVertex] = min(low[parentVertex], low[vertex])
+                        if low[vertex] > discovered[parentVertex]:
+                            bridges.add(via)
+        return bridges
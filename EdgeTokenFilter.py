@@ -4,6 +4,8 @@
 from NLPInstanceFilter import *
 from Token import *
 from NLPInstance import *
+from EdgePaths import EdgePaths
+from PropertyMatcher import PropertyMatcher
 
 class EdgeTokenFilter(NLPInstanceFilter):
 
@@ -46,6 +48,12 @@ class EdgeTokenFilter(NLPInstanceFilter):
 
         self._allowedProperties.update(list(allowedProperties))
 
+        """
+         * The matcher of the allowed property values and the version of the filter it was built for.
+        """
+        self._matcher = None
+        self._matcherVersion = None
+
     """
      * If active this property will cause the filter to filter out all tokens for which all edges where filtered out in
      * the edge filtering step.
@@ -65,6 +73,7 @@ class EdgeTokenFilter(NLPInstanceFilter):
     @collaps.setter
     def collaps(self, value):
         self._collaps = value
+        self.changed()
 
     """
      * Usually the filter allows all edges that have tokens with allowed properties. However, if it "uses paths" an edge
@@ -85,6 +94,7 @@ class EdgeTokenFilter(NLPInstanceFilter):
     @usePath.setter
     def usePath(self, value):
         self._usePath = value
+        self.changed()
 
     """
      * Adds an allowed property value. An Edge must have a least one token with at least one property value that either
@@ -95,6 +105,7 @@ class EdgeTokenFilter(NLPInstanceFilter):
     """
     def addAllowedProperty(self, propertyValue=str):
         self._allowedProperties.add(propertyValue)
+        self.changed()
 
     """
      * Remove an allowed property value.
@@ -103,6 +114,7 @@ class EdgeTokenFilter(NLPInstanceFilter):
     """
     def removeAllowedProperty(self, propertyValue=str):
         self._allowedProperties.remove(propertyValue)
+        self.changed()
 
     """
      * Removes all allowed words. Note that if no allowed words are specified the filter changes it's behaviour and allows
@@ -110,6 +122,7 @@ class EdgeTokenFilter(NLPInstanceFilter):
     """
     def clear(self):
         self._allowedProperties.clear()
+        self.changed()
 
     class Path(set):
         def __hash__(self):
@@ -177,7 +190,8 @@ class EdgeTokenFilter(NLPInstanceFilter):
 
 
     """
-     * Calculates all paths between all tokens of the provided edges.
+     * Calculates all paths between all tokens of the provided edges. The number of paths grows exponentially with the
+     * number of edges, filterEdges uses EdgePaths.pathEdges instead.
      *
      * @param edges the edges (graph) to use for getting all paths.
      * @return all paths defined through the provided edges.
@@ -198,17 +212,18 @@ class EdgeTokenFilter(NLPInstanceFilter):
             paths = EdgeTokenFilter.Paths()
             # go over each paths of the previous length and increase their size by one
             for From in previous.keys():
-                for over in previous.getTos():
-                    for to in first.getTos():
+                for over in previous.getTos(From):
+                    for to in first.getTos(over):
                         for path1 in previous.getPaths(From, over):
                             for path2 in first.getPaths(over, to):
-                                if path2 not in path1 and iter(path1).next().getTypePrefix() == iter(path2).next().getTypePrefix():
+                                if not path2 <= path1 and \
+                                        next(iter(path1)).getTypePrefix() == next(iter(path2)).getTypePrefix():
                                     path = EdgeTokenFilter.Path()
                                     path.update(path1)
                                     path.update(path2)
                                     paths.addPath(From, to, path)
                                     paths.addPath(to, From, path)
-            if len(paths) == 0:
+            if len(paths) != 0:
                 pathsPerLength.append(paths)
             previous = paths
             if len(paths) == 0:
@@ -239,6 +254,7 @@ class EdgeTokenFilter(NLPInstanceFilter):
     @wholeWords.setter
     def wholeWords(self, value):
         self._wholeWords = value
+        self.changed()
 
     """
      * Filters out all edges that do not have at least one token with an allowed property value. If the set of allowed
@@ -250,24 +266,28 @@ class EdgeTokenFilter(NLPInstanceFilter):
     def filterEdges(self, original):
         if len(self._allowedProperties) == 0:
             return original
+        matcher = self.getMatcher()
         if (self._usePath):
-            paths = self.calculatePaths(original)
-            result = set()
-            for From in paths.keys():
-                if From.propertiesContain(substrings=self._allowedProperties, wholeWord=self._wholeWords):
-                    for to in paths.getTos(From):
-                        if to.propertiesContain(substrings=self._allowedProperties, wholeWord=self._wholeWords):
-                            for path in paths.getPaths(From, to):
-                                result.update(path)
-            return result
+            return EdgePaths.pathEdges(original, lambda token: token.propertiesMatch(matcher))
         else:
             result = []
             for edge in original:
-                if edge.From.propertiesContain(substrings=self._allowedProperties, wholeWord=self._wholeWords) or \
-                        edge.To.propertiesContain(substrings=self._allowedProperties, wholeWord=self._wholeWords):
+                if edge.From.propertiesMatch(matcher) or edge.To.propertiesMatch(matcher):
                     result.append(edge)
             return result
 
+    """
+     * Returns the matcher of the allowed property values (see Token.propertiesContain). It is built again only after the
+     * filter was changed.
+     *
+     * @return the PropertyMatcher of the allowed property values.
+    """
+    def getMatcher(self):
+        if self._matcherVersion != self.version:
+            self._matcher = PropertyMatcher.get(self._allowedProperties, self._wholeWords)
+            self._matcherVersion = self.version
+        return self._matcher
+
     """
      * Returns whether the given value is an allowed property value.
      *
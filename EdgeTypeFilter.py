@@ -69,6 +69,7 @@ class EdgeTypeFilter(EdgeFilter):
      * @param allowedPrefixTypes the allowed prefix types.
     """
     def fireChanged(self, Type=str):
+        self.changed()
         for l in self._listeners:
             l.changed(Type)
 
@@ -125,6 +126,19 @@ class EdgeTypeFilter(EdgeFilter):
                 result.append(edge)
         return result
 
+    """
+     * Checks whether the filter allows edges of the given type, i.e. whether filterEdges keeps an edge with this type.
+     *
+     * @param type the type of an edge.
+     * @return true iff the prefix of the type is empty or allowed and the postfix of the type is empty or allowed.
+    """
+    def acceptsType(self, Type):
+        if Type is None:
+            return False
+        prefix, colon, postfix = Type.partition(':')
+        return (prefix == "" or prefix in self._allowedPrefixTypes) and \
+               (postfix == "" or postfix in self._allowedPostfixTypes)
+
     """
      * Does the filter allow the given prefix.
      *
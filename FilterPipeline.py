@@ -3,9 +3,16 @@
 
 from NLPInstanceFilter import *
 from NLPInstance import *
+from CompiledEdgeFilter import CompiledEdgeFilter
+from utils.LRUCache import LRUCache
 
 """
  * A FilterPipeline filters an NLPInstance by iteratively calling a sequence of delegate filters.
+ * <p/>
+ * <p>The result of each filter is cached by the original instance and the versions of the filter and of all filters
+ * before it (see NLPInstanceFilter.version). Filtering the same instance again only re-runs the filters after the first
+ * one that changed since. Consecutive EdgeTypeFilter and EdgeLabelFilter stages are applied together in one pass by a
+ * CompiledEdgeFilter.
  *
  * @author Sebastian Riedel
 """
@@ -13,22 +20,86 @@ class FilterPipeline(NLPInstanceFilter):
     """
      * Creates a new filter pipeline with the given filters.
      *
-     * @param filters the filters of the pipeline. The first filter will be applied first, the last filter last.
+     * @param filters  the filters of the pipeline. The first filter will be applied first, the last filter last.
+     * @param capacity the number of results cached for each filter.
     """
-    def __init__(self, *filters):
+    def __init__(self, *filters, capacity=16):
         # * The list of filters.
         self._filters = []
         self._filters.extend(list(filters))
+        # * The cached results of each filter by the id of the original instance and the versions of the filters.
+        self._capacity = capacity
+        self._caches = [LRUCache(capacity) for _ in self._filters]
+        # * For each filter the end (exclusive) of the run of compilable filters that starts with it.
+        self._runEnds = [index + 1 for index in range(0, len(self._filters))]
+        for index in range(len(self._filters) - 2, -1, -1):
+            if CompiledEdgeFilter.isCompilable(self._filters[index]) and \
+                    CompiledEdgeFilter.isCompilable(self._filters[index + 1]):
+                self._runEnds[index] = self._runEnds[index + 1]
+        # * The compiled filters by their (start, end) range of filters.
+        self._compiled = {}
+
+    """
+     * The version of a pipeline changes whenever the version of one of its filters changes.
+    """
+    @property
+    def version(self):
+        return tuple(filter.version for filter in self._filters)
+
+    """
+     * Returns the filter that applies the filters from start to end (exclusive).
+    """
+    def _getStage(self, start, end):
+        if end - start == 1:
+            return self._filters[start]
+        compiled = self._compiled.get((start, end))
+        if compiled is None:
+            compiled = self._compiled[(start, end)] = CompiledEdgeFilter(*self._filters[start:end])
+        return compiled
+
+    """
+     * Returns a pipeline of copies of the filters (see NLPInstanceFilter.copy) with empty caches.
+     *
+     * @return the copy of the pipeline.
+    """
+    def copy(self):
+        return FilterPipeline(*(filter.copy() for filter in self._filters), capacity=self._capacity)
+
+    """
+     * Removes all cached results.
+    """
+    def clearCache(self):
+        for cache in self._caches:
+            cache.clear()
 
     """
      * Applies the 1st filter to the original instance, the 2nd filter to the result of the 1st filter, and so on.
+     * Results of earlier calls with the same original instance and filter versions are reused.
      *
      * @param original the original instance.
      * @return the result of the last filter applied to the previous result.
      * @see NLPInstanceFilter#filter(NLPInstance)
      """
     def filter(self, original=NLPInstance):
-        instance = original
+        keys = []
+        versions = ()
         for filter in self._filters:
-            instance = filter.filter(instance)
-        return instance
\ No newline at end of file
+            versions += (filter.version,)
+            keys.append((id(original), versions))
+        # Starts after the last filter with a cached result. The original instance is kept with the results, so its id
+        # is not reused by another instance while they are cached.
+        instance = original
+        start = 0
+        for stage in range(len(self._filters) - 1, -1, -1):
+            cached = self._caches[stage].get(keys[stage])
+            if cached is not None and cached[0] is original:
+                instance = cached[1]
+                start = stage + 1
+                break
+        stage = start
+        while stage < len(self._filters):
+            end = self._runEnds[stage]
+            instance = self._getStage(stage, end).filter(instance)
+            self._caches[end - 1][keys[end - 1]] = (original, instance)
+            stage = end
+        return instance
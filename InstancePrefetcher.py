@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import threading
+
+from NLPDiff import NLPDiff
+from utils.LRUCache import LRUCache
+
+"""
+ * An InstancePrefetcher provides the instances the CorpusNavigator draws: the instances of the gold corpus or, if there
+ * is a guess corpus, the differences between the gold and the guess instances. The instances are kept in a bounded LRU
+ * cache and a background thread loads (and diffs) the instances before and after the current one while it is shown, so
+ * stepping through the corpus does not have to wait for them. The thread ends after it was idle for a while.
+"""
+
+
+class InstancePrefetcher:
+
+    """
+     * The cache of the instances by their index.
+    """
+    @property
+    def cache(self):
+        return self._cache
+
+    """
+     * The number of instances that are prefetched in each direction.
+    """
+    @property
+    def radius(self):
+        return self._radius
+
+    @radius.setter
+    def radius(self, value):
+        self._radius = value
+
+    """
+     * Creates a new InstancePrefetcher.
+     *
+     * @param gold     the gold corpus (a sequence of instances).
+     * @param guess    the guess corpus (optional).
+     * @param diff     the NLPDiff that compares the instances requested by getInstance.
+     * @param capacity the maximal number of cached instances.
+     * @param radius   the number of instances to prefetch before and after the current one.
+    """
+    def __init__(self, gold, guess=None, diff=None, capacity=256, radius=16):
+        self._gold = gold
+        self._guess = guess
+        self._diff = diff if diff is not None else NLPDiff()
+        # The ids of an NLPDiff are not shared between threads, so the background thread has its own
+        self._prefetchDiff = NLPDiff()
+        self._cache = LRUCache(capacity)
+        self._radius = radius
+        self._size = len(gold) if guess is None else min(len(gold), len(guess))
+        self._center = None
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        # The index the background thread is loading and the condition that is notified when it is done
+        self._building = None
+        self._built = threading.Condition(self._lock)
+        self._running = False
+        self._closed = False
+
+    def __len__(self):
+        return self._size
+
+    """
+     * Loads (and diffs) the instance with the given index.
+    """
+    def _create(self, index, diff):
+        if self._guess is None:
+            return self._gold[index]
+        return diff.diff(self._gold[index], self._guess[index])
+
+    """
+     * Waits until the background thread is not loading the instance with the given index.
+     *
+     * @return the cached instance or None if it is not cached.
+    """
+    def _waitForInstance(self, index):
+        with self._lock:
+            while self._building == index:
+                self._built.wait()
+            return self._cache.peek(index)
+
+    """
+     * Caches an instance unless another thread cached the same index meanwhile.
+     *
+     * @return the cached instance.
+    """
+    def _store(self, index, instance):
+        with self._lock:
+            cached = self._cache.peek(index)
+            if cached is not None:
+                return cached
+            self._cache[index] = instance
+            return instance
+
+    """
+     * Returns the instance with the given index from the cache or creates it.
+     *
+     * @param index the index of the instance.
+     * @return the instance (the difference of the gold and guess instance if there is a guess corpus).
+    """
+    def getInstance(self, index):
+        instance = self._cache.get(index)
+        if instance is None:
+            instance = self._waitForInstance(index)
+        if instance is None:
+            instance = self._store(index, self._create(index, self._diff))
+        return instance
+
+    """
+     * Returns the instance with the given index without adding it to the cache or marking it as used, e.g. for a search
+     * over the whole corpus that should not evict the instances around the current one.
+     *
+     * @param index the index of the instance.
+     * @return the instance (the difference of the gold and guess instance if there is a guess corpus).
+    """
+    def findInstance(self, index):
+        instance = self._waitForInstance(index)
+        if instance is None:
+            instance = self._create(index, self._diff)
+        return instance
+
+    """
+     * Starts prefetching the instances around the given index in the background. Instances around an older index that
+     * are not loaded yet are skipped.
+     *
+     * @param index the index of the current instance.
+    """
+    def prefetch(self, index):
+        if self._radius <= 0 or self._closed:
+            return
+        with self._lock:
+            self._center = index
+            if not self._running:
+                self._running = True
+                threading.Thread(target=self._run, name="InstancePrefetcher", daemon=True).start()
+            # Set with the lock held, so the thread can not end in between because it saw no request
+            self._wakeup.set()
+
+    """
+     * Returns the indices around the given index, nearest first and the next one before the previous one.
+    """
+    def _window(self, center):
+        for offset in range(1, self._radius + 1):
+            for index in (center + offset, center - offset):
+                if 0 <= index < self._size:
+                    yield index
+
+    """
+     * The number of seconds the background thread waits for a new index before it ends.
+    """
+    idleTimeout = 30
+
+    def _run(self):
+        while not self._closed:
+            if not self._wakeup.wait(InstancePrefetcher.idleTimeout):
+                with self._lock:
+                    if not self._wakeup.is_set():
+                        self._running = False
+                        return
+                continue
+            self._wakeup.clear()
+            center = self._center
+            for index in self._window(center):
+                if self._closed or self._center != center:
+                    break
+                with self._lock:
+                    if index in self._cache:
+                        continue
+                    self._building = index
+                instance = None
+                try:
+                    instance = self._create(index, self._prefetchDiff)
+                finally:
+                    with self._lock:
+                        if instance is not None and index not in self._cache:
+                            self._cache[index] = instance
+                        self._building = None
+                        self._built.notify_all()
+
+    """
+     * Stops the background thread.
+    """
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
@@ -7,13 +7,19 @@ from SingleSentenceRenderer import SingleSentenceRenderer
 from NLPInstance import NLPInstance
 from AligmentRenderer import AligmentRenderer
 from NLPInstanceFilter import *
+from SVGCanvas import SVGCanvas
+from RenderScheduler import RenderScheduler
+from TextMetrics import TextMetrics
 
 """
- * An NLPCanvas is responsible for drawing the tokens and edges of an NLPInstance using different edge and token
- * layouts. In order to draw an NLPInstance clients have to first set the instance to draw by calling {@link
+ * An NLPCanvas shows the drawing of an SVGCanvas in the graphics view of the GUI. In order to draw an NLPInstance
+ * clients have to first set the instance to draw by calling {@link
  * com.googlecode.whatswrong.NLPCanvas#setNLPInstance(NLPInstance)} and then update the graphical representation by
  * calling {@link NLPCanvas#updateNLPGraphics()}. The latter method should also be called whenever changes are made to
- * the layout configuration (curved edges vs straight edges, antialiasing etc.).
+ * the layout configuration (curved edges vs straight edges, antialiasing etc.). Everything except the Qt view is
+ * implemented by SVGCanvas. Edits that come in bursts (typing in a filter field) should call {@link
+ * NLPCanvas#scheduleNLPGraphics()} instead, which filters the instance right away and lays it out in a background
+ * thread once the edits pause, and only shows the drawing of the latest filter state.
  *
  * @author Sebastian Riedel
  * @see com.googlecode.whatswrong.EdgeLayout
@@ -21,129 +27,35 @@ from NLPInstanceFilter import *
 """
 
 
-class NLPCanvas:
+class _RenderedSignal(QtCore.QObject):
+    rendered = QtCore.pyqtSignal(int, object)
 
-    """
-     * Renderers for different render types.
-    """
-    @property
-    def renderers(self):
-        return self._renderers
-
-    @renderers.setter
-    def renderers(self, value):
-        self._renderers = value
-
-    """
-     * All tokens.
-    """
-    @property
-    def tokens(self):
-        return self._tokens
-
-    @tokens.setter
-    def tokens(self, value):
-        self._tokens = value
-
-    """
-     * All edges.
-    """
-    @property
-    def dependencies(self):
-        return self._dependencies
-
-    @dependencies.setter
-    def dependencies(self, value):
-        self._dependencies = value
-
-    """
-     * A collection of all edge types used in the current nlp instance.
-    """
-    @property
-    def usedTypes(self):
-        return self._usedTypes
 
-    @usedTypes.setter
-    def usedTypes(self, value):
-        self._usedTypes = value
-
-    """
-     * A collection of all token properties used in the current nlp instance.
-    """
-    @property
-    def usedProperties(self):
-        return self._usedProperties
-
-    @usedProperties.setter
-    def usedProperties(self, value):
-        self._usedProperties = value
-
-    """
-     * The filter that processes the current instance before it is drawn.
-    """
-    @property
-    def filter(self):
-        return self._filter
-
-    @filter.setter
-    def filter(self, value=NLPInstanceFilter):
-        self._filter = value
-
-    """
-     * Adds a new listener.
-     *
-     * @param listener the listener to add.
-    """
-
-    def addListener(self, listener):
-        self._listeners.append(listener)
-
-    """
-     * The renderer that draws the filtered NLPInstance to the canvas.
-    """
-    @property
-    def renderer(self):
-        return self._renderer
-
-    @renderer.setter
-    def renderer(self, value):
-        self._renderer = value
+class NLPCanvas(SVGCanvas):
 
     """
          * Creates a new canvas with default size.
     """
     def __init__(self, ui):
-        self._renderer = SingleSentenceRenderer()
-        self._renderers = {NLPInstance.RenderType.single: self._renderer,
-                           NLPInstance.RenderType.alignment: AligmentRenderer()}
-        self._tokens = []
-        self._dependencies = []
-        self._usedTypes = set()
-        self._usedProperties = set()
-        self._filter = None
+        SVGCanvas.__init__(self)
         self._ui = ui
         self._scene = QtGui.QGraphicsScene()
-        self._SVGScene = None
-        self._nlpInstance = None
-        self._listeners = []
-        self._changeListeners =[]
-
-    def addChangeListener(self, changeListener):
-        self._changeListeners.append(changeListener)
+        self._svgRenderer = QtSvg.QSvgRenderer()
+        self._svgItem = None
+        # The signal passes the background renders to the GUI thread
+        self._renderedSignal = _RenderedSignal()
+        self._renderedSignal.rendered.connect(self._showRendered, QtCore.Qt.QueuedConnection)
+        self._renderScheduler = RenderScheduler(self._renderInBackground, self._renderedSignal.rendered.emit)
+        # The unfiltered instance whose texts were measured last and their widths (see scheduleNLPGraphics)
+        self._measured = None
+        self._widths = {}
 
     """
-     * Fired whenever this canvas is changed.
+     * The scheduler of the background renders (see scheduleNLPGraphics).
     """
-    def fireChanged(self):
-        for changeListener in self._changeListeners:
-            changeListener.stateChanged()
-
-    """
-     * Notifies all listeners about an instance change event.
-    """
-    def fireInstanceChanged(self):
-        for l in self._listeners:
-            l.instanceChanged()
+    @property
+    def renderScheduler(self):
+        return self._renderScheduler
 
     # XXX TO BE DELETED?
     def updateCanvas(self):
@@ -155,121 +67,95 @@ class NLPCanvas:
         pass
 
     """
-     * Return the renderer that draws the NLPInstance onto this canvas.
-     *
-     * @return the renderer that draws the NLPInstance onto this canvas.
-    """
-    # See the getter above...
-
-    """
-     * Sets the current NLP instance to draw. Note that this does not cause to canvas to be immediately updated.
-     * For this {@link NLPCanvas#updateNLPGraphics()} needs to be called.
-     *
-     * @param nlpInstance the new NLP instance.
-    """
-    def setNLPInstance(self, nlpIntance):
-        self._nlpInstance = nlpIntance
-        self._dependencies = []
-        self._dependencies.extend(self._nlpInstance.getEdges())
-        self._usedTypes.clear()
-        for edge in self._dependencies:
-            self._usedTypes.add(edge.type)  # Union
-        self._tokens = []
-        self._tokens.extend(self._nlpInstance.tokens)
-        self._usedProperties.clear()
-        for token in self._tokens:
-            self._usedProperties = self._usedProperties.union(token.getPropertyTypes())  # XXX Tuple and set!
-        self.fireInstanceChanged()
-
-    """
-     * Returns the set of all token properties in the current nlp instance.
-     *
-     * @return the set of all token properties in the current nlp instance.
+     * Updates the current graph. This takes into account all changes to the filter,
+      NLP instance and drawing parameters. The SVG is passed to the renderer of the graphics item in memory, the item and
+      the graphics scene are created once and reused.
     """
-    # See the getter above...
+    def updateNLPGraphics(self):
+        # A background render of an older state must not replace this one
+        self._renderScheduler.cancel()
+        self.renderSVGScene()
+        self._showScene(self._SVGScene.tobytes())
 
     """
-     * Returns the set of all edge types in the current nlp instance.
+     * Updates the current graph in the background once the changes pause (see RenderScheduler). Use this instead of
+     * updateNLPGraphics for changes that come in bursts, such as every edit of a filter text field.
      *
-     * @return the set of all edge types in the current nlp instance.
-    """
-    # See the getter above...
-
-    """
-     * Returns the filter this canvas is applying to the nlp instance before it is drawn.
+     * The filters are changed in this (the GUI) thread while the background thread filters, so only a snapshot is taken
+     * here: copies of the filter and of the renderer (a few small sets and dictionaries) and the unfiltered instance.
+     * The filters never add texts, so the texts of the unfiltered instance are measured with the Qt fonts once per
+     * instance. The background thread filters, lays out and serializes the snapshot and shares no state with the
+     * canvas.
+    """
+    def scheduleNLPGraphics(self):
+        unfiltered = self.getUnfiltered()
+        if self._measured is not unfiltered:
+            self._widths = TextMetrics.measure(NLPCanvas._textsOf(unfiltered), 12)
+            self._measured = unfiltered
+        renderer = self._renderers[unfiltered.renderType].copy()
+        self._renderScheduler.schedule(unfiltered, self._filter.copy(), renderer, self._widths)
+
+    """
+     * Returns the texts the renderers measure: the token property values and the edge labels (with notes).
+    """
+    @staticmethod
+    def _textsOf(instance):
+        texts = set()
+        for token in instance.tokens:
+            texts.update(token.tokenProperties.values())
+        for edge in instance.getEdges():
+            texts.add(edge.label)
+            texts.add(edge.getLabelWithNote())
+        return texts
+
+    """
+     * Filters and renders an instance, called in the background thread of the scheduler.
      *
-     * @return the filter of this canvas.
+     * @param isStale    returns true once a newer update was requested.
+     * @param unfiltered the unfiltered instance.
+     * @param filter     the copy of the filter.
+     * @param renderer   the copy of the renderer to draw with.
+     * @param widths     the widths of the texts of the instance (see TextMetrics.measure).
+     * @return the (scene, SVG bytes) pair, None if the render became stale.
     """
-    # See the getter above...
+    def _renderInBackground(self, isStale, unfiltered, filter, renderer, widths):
+        filtered = filter.filter(unfiltered)
+        if isStale():
+            return None
+        with TextMetrics.using(widths):
+            scene = self.createSVGScene(filtered, renderer)
+        if isStale():
+            return None
+        return scene, scene.tobytes()
 
     """
-     * Sets the filter this canvas should apply to the nlp instance before it is drawn.
-     *
-     * @param filter the filter to use.
+     * Shows a background render in the GUI thread unless a newer update was requested since.
     """
-    # See the setter above...
+    def _showRendered(self, generation, result):
+        if not self._renderScheduler.isCurrent(generation):
+            return
+        self._SVGScene, svg = result
+        self._showScene(svg)
 
     """
-     * Just calls the filter on the current instance.
-     *
-     * @return the filtered instance.
+     * Stops the background thread of the scheduler, e.g. before the GUI replaces this canvas.
     """
-    def filterInstance(self):
-        return self._filter.filter(NLPInstance(tokens=self._tokens, edges=self._dependencies,
-                                        renderType=self._nlpInstance.renderType,
-                                        splitPoints=self._nlpInstance.splitPoints))
+    def close(self):
+        self._renderScheduler.close()
 
     """
-     * Updates the current graph. This takes into account all changes to the filter,
-      NLP instance and drawing parameters.
+     * Shows an SVG document in the graphics view.
     """
-    def updateNLPGraphics(self):
-        filtered = self.filterInstance()
-        self._SVGScene = Scene(width=800)
-
-        renderer = self._renderers[filtered.renderType]
-
-        dim = renderer.render(filtered, self._SVGScene)
+    def _showScene(self, svg):
+        self._svgRenderer.load(QtCore.QByteArray(svg))
 
-        self._SVGScene = Scene(width=dim[0], height=dim[1])
-
-        renderer.render(filtered, self._SVGScene)
-        self._SVGScene.write_svg("tmp.svg")
-        path = os.path.abspath("tmp.svg")
-
-        scene = QtGui.QGraphicsScene()
-        self._ui.graphicsView.setScene(scene)
-        br = QtSvg.QGraphicsSvgItem(path)
-        scene.addItem(br)
+        if self._svgItem is None:
+            self._svgItem = QtSvg.QGraphicsSvgItem()
+            self._svgItem.setSharedRenderer(self._svgRenderer)
+            self._scene.addItem(self._svgItem)
+        else:
+            self._svgItem.setElementId("")  # Updates the size of the item to the new document
+        self._scene.setSceneRect(self._svgItem.boundingRect())
+        self._ui.graphicsView.setScene(self._scene)
         self._ui.graphicsView.show()
         self.fireChanged()
-
-    def exportNLPGraphics(self, filepath):
-        filtered = self.filterInstance()
-        self._SVGScene = Scene(width=800)
-
-        renderer = self._renderers[filtered.renderType]
-
-        dim = renderer.render(filtered, self._SVGScene)
-
-        self._SVGScene = Scene(width=dim[0], height=dim[1])
-
-        renderer.render(filtered, self._SVGScene)
-        self._SVGScene.write_svg(filepath)
-
-    """
-     * Clears the current instance.
-    """
-    def clear(self):
-        self._tokens.clear()
-        self._dependencies.clear()
-        self._usedTypes.clear()
-        self._usedProperties.clear()
-
-    """
-     * Exports the current graph to EPS.
-     *
-     * @param file the eps file to export to.
-     * @throws IOException if IO goes wrong.
-    """
-    # Will be implemented in the far future...
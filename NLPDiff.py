@@ -80,7 +80,52 @@ class NLPDiff():
                 result = 31*result + hash(self._label)
             return result
     """
-     * Calculates the difference between two NLP instances in terms of their edges.
+     * Creates a new NLPDiff. The diff types (e.g. dep:FN) are cached, their number is bounded by the number of edge
+     * types.
+    """
+    def __init__(self):
+        self._diffTypes = {}
+
+    """
+     * Returns the identities of the given edges as a sorted list of (from, to, type, label) id tuples and a dictionary
+     * from each identity to the first edge with it. The identities are equal iff the EdgeIdentity objects are equal.
+     *
+     * @param edges the edges.
+     * @param ids   the integer ids of the strings (token indices, types and labels) of the diff, new strings are added.
+    """
+    @staticmethod
+    def _identities(edges, ids):
+        def getId(string):
+            if string is None:
+                return -1
+            result = ids.get(string)
+            if result is None:
+                result = ids[string] = len(ids)
+            return result
+
+        result = {}
+        for edge in edges:
+            key = (getId(edge.From.index), getId(edge.To.index), getId(edge.type), getId(edge.label))
+            if key not in result:
+                result[key] = edge
+        return sorted(result.keys()), result
+
+    """
+     * Returns the DiffEdge of an edge with the given outcome (FN, FP or Match). The diff types are cached.
+    """
+    def _diffEdge(self, edge, outcome):
+        key = (edge.type, outcome)
+        Type = self._diffTypes.get(key)
+        if Type is None:
+            Type = self._diffTypes[key] = edge.type + ":" + outcome
+        return DiffEdge(edge, outcome, Type)
+
+    """
+     * Calculates the difference between two NLP instances in terms of their edges. The edges are identified by their
+     * tokens, type and label (see EdgeIdentity) and the false negatives, false positives and matches are found in one
+     * merge pass over the sorted identities of both instances. The strings are interned into integer ids for each diff,
+     * so a long-lived NLPDiff does not collect the strings of all instances it compared. The edges of the result are DiffEdge objects that wrap
+     * the edges of the instances (the gold edge in case of a match).
      *
      * @param goldInstance  the gold instance
      * @param guessInstance the (system) guess instance.
@@ -92,36 +137,85 @@ class NLPDiff():
         for splitPoint in tuple(goldInstance.splitPoints):
             diff.splitPoints.append(splitPoint)
         diff.addTokens(goldInstance.tokens)
-        goldIdentities = set()
-        goldIdentities.update(self.createIdentities(goldInstance.getEdges()))
-        guessIdentities = set()
-        guessIdentities.update(self.createIdentities(guessInstance.getEdges()))
-        fn = set()
-        fn = goldIdentities - guessIdentities
-        fp = set()
-        fp =  guessIdentities - goldIdentities
-        matches = set()
-        matches = goldIdentities & guessIdentities
-        for edgeid in fn:
-            edge = edgeid.edge
-            Type = edge.type +":FN"
-            diff.addEdge(edge=Edge(From=edge.From, To=edge.To, label=edge.label, note=edge.note, Type=Type,
-                                   renderType=edge.renderType, description=edge.description))
-        for edgeid in fp:
-            edge = edgeid.edge
-            Type = edge.type +":FP"
-            diff.addEdge(edge=Edge(From=edge.From, To=edge.To, label=edge.label, note=edge.note, Type=Type,
-                                   renderType=edge.renderType, description=edge.description))
-
-        for edgeid in matches:
-            edge = edgeid.edge
-            Type = edge.type +":Match"
-            diff.addEdge(edge=Edge(From=edge.From, To=edge.To, label=edge.label, note=edge.note, Type=Type,
-                                   renderType=edge.renderType, description=edge.description))
+        ids = {}
+        goldKeys, goldEdges = NLPDiff._identities(goldInstance.getEdges(), ids)
+        guessKeys, guessEdges = NLPDiff._identities(guessInstance.getEdges(), ids)
+        fn = []
+        fp = []
+        matches = []
+        i = 0
+        j = 0
+        while i < len(goldKeys) and j < len(guessKeys):
+            gold = goldKeys[i]
+            guess = guessKeys[j]
+            if gold == guess:
+                matches.append(self._diffEdge(goldEdges[gold], "Match"))
+                i += 1
+                j += 1
+            elif gold < guess:
+                fn.append(self._diffEdge(goldEdges[gold], "FN"))
+                i += 1
+            else:
+                fp.append(self._diffEdge(guessEdges[guess], "FP"))
+                j += 1
+        for gold in goldKeys[i:]:
+            fn.append(self._diffEdge(goldEdges[gold], "FN"))
+        for guess in guessKeys[j:]:
+            fp.append(self._diffEdge(guessEdges[guess], "FP"))
+        diff.addEdges(fn)
+        diff.addEdges(fp)
+        diff.addEdges(matches)
         return diff
 
     def createIdentities(self, edges):
         result = set()
         for edge in edges:
             result.add(NLPDiff.EdgeIdentity(edge))
-        return result
\ No newline at end of file
+        return result
+
+
+"""
+ * A DiffEdge is an edge of the result of NLPDiff.diff: an edge of the gold or the guess instance with its type extended
+ * by the outcome of the comparison (e.g. dep:FN). It shares the tokens, the label and the cached indices of the wrapped
+ * edge instead of copying the edge through its constructor.
+"""
+
+
+class DiffEdge(Edge):
+    __slots__ = ('_edge', '_outcome')
+
+    """
+     * The wrapped edge of the gold or guess instance.
+    """
+    @property
+    def edge(self):
+        return self._edge
+
+    """
+     * The outcome of the comparison: FN, FP or Match.
+    """
+    @property
+    def outcome(self):
+        return self._outcome
+
+    """
+     * Creates a new DiffEdge.
+     *
+     * @param edge    the edge of the gold or the guess instance.
+     * @param outcome the outcome of the comparison.
+     * @param Type    the type of the DiffEdge (the type of the edge followed by ':' and the outcome).
+    """
+    def __init__(self, edge, outcome, Type):
+        self._edge = edge
+        self._outcome = outcome
+        self._From = edge.From
+        self._To = edge.To
+        self._label = edge.label
+        self._note = edge.note
+        self._type = Type
+        self._renderType = edge.renderType
+        self._description = edge.description
+        self._minIndex = edge.minIndex
+        self._maxIndex = edge.maxIndex
+        self._updateType()
+        self._updateHash()
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8, vim: expandtab:ts=4 -*-
 
+import copy
+
 """
  * An NLPInstanceFilter takes an NLPInstance and filters out edges, tokens, or token properties.
  *
@@ -9,6 +11,36 @@
 
 
 class NLPInstanceFilter():
+
+    """
+     * The version of the state of the filter. It is increased by every change that can change the result of the filter,
+     * so the results of a filter can be reused as long as its version is the same (see FilterPipeline).
+    """
+    _version = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    """
+     * Increases the version of the filter. Called by every method that changes the state of the filter.
+    """
+    def changed(self):
+        self._version += 1
+
+    """
+     * Returns a copy of the filter with the same state and version. The sets, dictionaries and lists of the filter are
+     * copied, so the copy can filter in another thread while this filter is changed (see NLPCanvas.scheduleNLPGraphics).
+     *
+     * @return the copy of the filter.
+    """
+    def copy(self):
+        filter = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, (set, dict, list)):
+                setattr(filter, name, type(value)(value))
+        return filter
+
     """
      * Filter the given instance.
      *
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+
+"""
+ * A PropertyMatcher checks token property values against a set of allowed strings, as TokenFilter and
+ * Token.propertiesContain (and hence EdgeTokenFilter) do. It is built once for a set of allowed strings:
+ * <ul>
+ * <li>in substring mode the strings are compiled into an Aho-Corasick automaton, so a value is scanned once for all
+ *     strings;</li>
+ * <li>in whole word mode the strings are kept in a hash set;</li>
+ * <li>strings of the form "from-to" (e.g. "3-7") are also index ranges. They are merged into a sorted list of
+ *     intervals that is searched with bisection.</li>
+ * </ul>
+ * Property values repeat a lot (words, tags), so the results of the text matches are cached by value.
+"""
+
+
+class PropertyMatcher:
+
+    """
+     * The pattern of an index range.
+    """
+    rangePattern = re.compile(r"(\d+)-(\d+)$")
+
+    """
+     * The number of cached text matches.
+    """
+    cacheSize = 65536
+
+    # The flags of the patterns in the automaton: the allowed strings that are not index ranges and those that are
+    _TEXT = 1
+    _RANGE = 2
+
+    """
+     * Returns the (shared) matcher for the given allowed strings.
+     *
+     * @param strings   the allowed strings.
+     * @param wholeWord whether a value has to be equal to an allowed string or only has to contain one.
+     * @return the matcher.
+    """
+    @staticmethod
+    def get(strings, wholeWord):
+        return _getMatcher(frozenset(strings), bool(wholeWord))
+
+    """
+     * Creates a new matcher.
+     *
+     * @param strings   the allowed strings.
+     * @param wholeWord whether a value has to be equal to an allowed string or only has to contain one.
+    """
+    def __init__(self, strings, wholeWord):
+        self._wholeWord = wholeWord
+        intervals = []
+        flags = {}
+        for string in strings:
+            match = PropertyMatcher.rangePattern.match(string)
+            if match is not None:
+                intervals.append((int(match.group(1)), int(match.group(2))))
+                flags[string] = PropertyMatcher._RANGE
+            else:
+                flags[string] = PropertyMatcher._TEXT
+        self._starts, self._ends = PropertyMatcher._mergeIntervals(intervals)
+        if wholeWord:
+            self._flags = flags
+        else:
+            self._goto, self._fail, self._out = PropertyMatcher._buildAutomaton(flags)
+        self._cachedMatch = lru_cache(maxsize=PropertyMatcher.cacheSize)(self._match)
+
+    """
+     * Sorts the intervals and merges the overlapping ones.
+     *
+     * @return the (starts, ends) lists of the merged intervals.
+    """
+    @staticmethod
+    def _mergeIntervals(intervals):
+        starts = []
+        ends = []
+        for start, end in sorted(intervals):
+            if start > end:
+                continue
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    """
+     * Builds the Aho-Corasick automaton of the patterns: the trie (a dictionary of transitions per state), the failure
+     * links and the flags of the patterns that end in every state (including those that end in its failure states).
+     *
+     * @param flags a dictionary from each pattern to its flag.
+    """
+    @staticmethod
+    def _buildAutomaton(flags):
+        goto = [{}]
+        fail = [0]
+        out = [0]
+        for pattern, flag in flags.items():
+            state = 0
+            for char in pattern:
+                next = goto[state].get(char)
+                if next is None:
+                    next = len(goto)
+                    goto[state][char] = next
+                    goto.append({})
+                    fail.append(0)
+                    out.append(0)
+                state = next
+            out[state] |= flag
+        # Breadth first, so the failure state of a state is done before the state
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0)
+                out[child] |= out[fail[child]]
+        return goto, fail, out
+
+    """
+     * Returns the flags of the allowed strings that occur in (or are equal to) the value.
+    """
+    def _match(self, value):
+        if self._wholeWord:
+            return self._flags.get(value, 0)
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found = out[0]
+        state = 0
+        for char in value:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= out[state]
+        return found
+
+    """
+     * Checks the value as text: whether it contains (or is equal to, in whole word mode) one of the allowed strings.
+     *
+     * @param value  the property value.
+     * @param ranges whether the allowed strings that are index ranges count as text, too.
+     * @return true iff the value matches one of the allowed strings.
+    """
+    def matchesText(self, value, ranges=False):
+        mask = PropertyMatcher._TEXT | PropertyMatcher._RANGE if ranges else PropertyMatcher._TEXT
+        return self._cachedMatch(value) & mask != 0
+
+    """
+     * Checks whether the value is a number in one of the index ranges.
+     *
+     * @param value the property value.
+     * @return true iff the value is a number and lies in one of the ranges.
+    """
+    def matchesRange(self, value):
+        if not self._starts or not value.isdigit() or not value.isascii():
+            return False
+        number = int(value)
+        position = bisect_right(self._starts, number) - 1
+        return position >= 0 and number <= self._ends[position]
+
+    """
+     * Checks a value as Token.propertiesContain does: numbers are checked against the index ranges and all values
+     * against the other allowed strings.
+     *
+     * @param value the property value.
+     * @return true iff the value matches.
+    """
+    def matches(self, value):
+        return self.matchesText(value) or self.matchesRange(value)
+
+
+@lru_cache(maxsize=64)
+def _getMatcher(strings, wholeWord):
+    return PropertyMatcher(strings, wholeWord)
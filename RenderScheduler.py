@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import sys
+import threading
+import time
+import traceback
+
+"""
+ * A RenderScheduler renders in a background thread after a burst of requests is over, e.g. while a filter text field
+ * is edited. Every request (see schedule) starts a new generation and moves the start of the render to the end of the
+ * debounce window, so typing a word triggers one render and not one per keystroke. A render that is overtaken by a
+ * newer request is stale: the render function can stop early when it sees that, and its result is never delivered.
+ * Only the result of the latest request is passed to the deliver function. The thread ends after it was idle for a
+ * while.
+ *
+ * The render function only gets what was passed to schedule, so the caller has to pass a snapshot of everything the
+ * render reads (e.g. the filtered instance and a copy of the renderer, see NLPCanvas) and must not change it later.
+ * The scheduler does not depend on Qt. The deliver function is called in the background thread, a GUI has to pass the
+ * result to its own thread (e.g. with a queued signal, see NLPCanvas) and check isCurrent there again.
+"""
+
+
+class RenderScheduler:
+
+    """
+     * The debounce window in seconds: a render starts when there was no request for this long.
+    """
+    @property
+    def delay(self):
+        return self._delay
+
+    @delay.setter
+    def delay(self, value):
+        self._delay = value
+
+    """
+     * The generation of the latest request.
+    """
+    @property
+    def generation(self):
+        return self._generation
+
+    """
+     * Creates a new RenderScheduler.
+     *
+     * @param render  the function that renders in the background. It gets a function that returns true once the render
+     *                is stale and the arguments of the request, and returns the result, or None if it stopped early.
+     * @param deliver the function that gets the generation and the result of a render that is not stale.
+     * @param delay   the debounce window in seconds.
+    """
+    def __init__(self, render, deliver, delay=0.15):
+        self._render = render
+        self._deliver = deliver
+        self._delay = delay
+        self._generation = 0
+        self._due = None
+        self._args = ()
+        self._condition = threading.Condition()
+        self._running = False
+        self._closed = False
+
+    """
+     * Requests a render. A render that is scheduled or running is made stale.
+     *
+     * @param args the arguments for the render function, a snapshot that is not changed afterwards.
+    """
+    def schedule(self, *args):
+        with self._condition:
+            if self._closed:
+                return
+            self._generation += 1
+            self._args = args
+            self._due = time.monotonic() + self._delay
+            if not self._running:
+                self._running = True
+                threading.Thread(target=self._run, name="RenderScheduler", daemon=True).start()
+            self._condition.notify()
+
+    """
+     * Makes the scheduled and the running render stale, e.g. because the canvas is drawn synchronously instead.
+    """
+    def cancel(self):
+        with self._condition:
+            self._generation += 1
+            self._due = None
+            self._args = ()
+
+    """
+     * Checks whether a render of the given generation is the latest one.
+     *
+     * @param generation the generation of a render.
+     * @return true iff there was no request or cancellation after it.
+    """
+    def isCurrent(self, generation):
+        return generation == self._generation
+
+    """
+     * The number of seconds the background thread waits for a request before it ends.
+    """
+    idleTimeout = 30
+
+    """
+     * Waits (with the lock held) until the latest request is due.
+     *
+     * @return the generation and the arguments to render, None if the thread should end.
+    """
+    def _waitForRequest(self):
+        while not self._closed:
+            if self._due is None:
+                if not self._condition.wait(RenderScheduler.idleTimeout) and self._due is None:
+                    break
+                continue
+            remaining = self._due - time.monotonic()
+            if remaining > 0:
+                self._condition.wait(remaining)
+                continue
+            self._due = None
+            args = self._args
+            self._args = ()
+            return self._generation, args
+        self._running = False
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                request = self._waitForRequest()
+            if request is None:
+                return
+            generation, args = request
+            try:
+                result = self._render(lambda: not self.isCurrent(generation), *args)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+                continue
+            if result is not None and self.isCurrent(generation):
+                self._deliver(generation, result)
+
+    """
+     * Stops the background thread. Renders that are scheduled are dropped.
+    """
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._due = None
+            self._args = ()
+            self._condition.notify()
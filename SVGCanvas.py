@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+from SVGWriter import *
+from SingleSentenceRenderer import SingleSentenceRenderer
+from NLPInstance import NLPInstance
+from AligmentRenderer import AligmentRenderer
+from NLPInstanceFilter import *
+
+"""
+ * An SVGCanvas is responsible for drawing the tokens and edges of an NLPInstance using different edge and token
+ * layouts. In order to draw an NLPInstance clients have to first set the instance to draw by calling {@link
+ * SVGCanvas#setNLPInstance(NLPInstance)} and then render it by calling {@link
+ * SVGCanvas#renderSVGScene()}. The SVGCanvas does not depend on Qt, so it can be used to render instances in headless
+ * processes (see BatchExport); NLPCanvas is the Qt view on top of it.
+ *
+ * @author Sebastian Riedel
+ * @see com.googlecode.whatswrong.EdgeLayout
+ * @see com.googlecode.whatswrong.TokenLayout
+"""
+
+
+class SVGCanvas:
+
+    """
+     * Renderers for different render types.
+    """
+    @property
+    def renderers(self):
+        return self._renderers
+
+    @renderers.setter
+    def renderers(self, value):
+        self._renderers = value
+
+    """
+     * All tokens.
+    """
+    @property
+    def tokens(self):
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, value):
+        self._tokens = value
+        self._unfiltered = None
+
+    """
+     * All edges.
+    """
+    @property
+    def dependencies(self):
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, value):
+        self._dependencies = value
+        self._unfiltered = None
+
+    """
+     * A collection of all edge types used in the current nlp instance.
+    """
+    @property
+    def usedTypes(self):
+        return self._usedTypes
+
+    @usedTypes.setter
+    def usedTypes(self, value):
+        self._usedTypes = value
+
+    """
+     * A collection of all token properties used in the current nlp instance.
+    """
+    @property
+    def usedProperties(self):
+        return self._usedProperties
+
+    @usedProperties.setter
+    def usedProperties(self, value):
+        self._usedProperties = value
+
+    """
+     * The filter that processes the current instance before it is drawn.
+    """
+    @property
+    def filter(self):
+        return self._filter
+
+    @filter.setter
+    def filter(self, value=NLPInstanceFilter):
+        self._filter = value
+
+    """
+     * Adds a new listener.
+     *
+     * @param listener the listener to add.
+    """
+
+    def addListener(self, listener):
+        self._listeners.append(listener)
+
+    """
+     * The renderer that draws the filtered NLPInstance to the canvas.
+    """
+    @property
+    def renderer(self):
+        return self._renderer
+
+    @renderer.setter
+    def renderer(self, value):
+        self._renderer = value
+
+    """
+     * Should consecutive line and curve segments (e.g. the segments of an edge and its arrowhead) be written as one
+     * SVG path (see SVGWriter.Scene).
+    """
+    @property
+    def batchPaths(self):
+        return self._batchPaths
+
+    @batchPaths.setter
+    def batchPaths(self, value):
+        self._batchPaths = value
+
+    """
+     * Should the colors of the SVG elements be set by CSS classes in a style block instead of inline styles (see
+     * SVGWriter.Scene).
+    """
+    @property
+    def cssClasses(self):
+        return self._cssClasses
+
+    @cssClasses.setter
+    def cssClasses(self, value):
+        self._cssClasses = value
+
+    """
+     * Creates a new canvas.
+    """
+    def __init__(self):
+        self._renderer = SingleSentenceRenderer()
+        self._renderers = {NLPInstance.RenderType.single: self._renderer,
+                           NLPInstance.RenderType.alignment: AligmentRenderer()}
+        self._tokens = []
+        self._dependencies = []
+        self._usedTypes = set()
+        self._usedProperties = set()
+        self._filter = None
+        self._batchPaths = True
+        self._cssClasses = True
+        self._SVGScene = None
+        self._nlpInstance = None
+        self._unfiltered = None
+        self._listeners = []
+        self._changeListeners =[]
+
+    def addChangeListener(self, changeListener):
+        self._changeListeners.append(changeListener)
+
+    """
+     * Fired whenever this canvas is changed.
+    """
+    def fireChanged(self):
+        for changeListener in self._changeListeners:
+            changeListener.stateChanged()
+
+    """
+     * Notifies all listeners about an instance change event.
+    """
+    def fireInstanceChanged(self):
+        for l in self._listeners:
+            l.instanceChanged()
+
+    """
+     * Return the renderer that draws the NLPInstance onto this canvas.
+     *
+     * @return the renderer that draws the NLPInstance onto this canvas.
+    """
+    # See the getter above...
+
+    """
+     * Sets the current NLP instance to draw. Note that this does not cause to canvas to be immediately updated.
+     * For this {@link NLPCanvas#updateNLPGraphics()} needs to be called.
+     *
+     * @param nlpInstance the new NLP instance.
+    """
+    def setNLPInstance(self, nlpIntance):
+        self._nlpInstance = nlpIntance
+        self._unfiltered = None
+        self._dependencies = []
+        self._dependencies.extend(self._nlpInstance.getEdges())
+        self._usedTypes.clear()
+        for edge in self._dependencies:
+            self._usedTypes.add(edge.type)  # Union
+        self._tokens = []
+        self._tokens.extend(self._nlpInstance.tokens)
+        self._usedProperties.clear()
+        for token in self._tokens:
+            self._usedProperties = self._usedProperties.union(token.getPropertyTypes())  # XXX Tuple and set!
+        self.fireInstanceChanged()
+
+    """
+     * Returns the set of all token properties in the current nlp instance.
+     *
+     * @return the set of all token properties in the current nlp instance.
+    """
+    # See the getter above...
+
+    """
+     * Returns the set of all edge types in the current nlp instance.
+     *
+     * @return the set of all edge types in the current nlp instance.
+    """
+    # See the getter above...
+
+    """
+     * Returns the filter this canvas is applying to the nlp instance before it is drawn.
+     *
+     * @return the filter of this canvas.
+    """
+    # See the getter above...
+
+    """
+     * Sets the filter this canvas should apply to the nlp instance before it is drawn.
+     *
+     * @param filter the filter to use.
+    """
+    # See the setter above...
+
+    """
+     * Just calls the filter on the current instance. The filter gets the same instance until the instance, the tokens or
+     * the edges are changed, so a FilterPipeline can reuse its results when the canvas is redrawn.
+     *
+     * @return the filtered instance.
+    """
+    def filterInstance(self):
+        return self._filter.filter(self.getUnfiltered())
+
+    """
+     * Returns the instance the filter gets: the current tokens and edges in an instance that stays the same until the
+     * instance, the tokens or the edges are changed.
+     *
+     * @return the unfiltered instance.
+    """
+    def getUnfiltered(self):
+        if self._unfiltered is None:
+            self._unfiltered = NLPInstance(tokens=self._tokens, edges=self._dependencies,
+                                           renderType=self._nlpInstance.renderType,
+                                           splitPoints=self._nlpInstance.splitPoints)
+        return self._unfiltered
+
+    """
+     * Renders a filtered instance into a new SVG scene. The renderers do not depend on the size of the scene, so the
+     * instance is drawn only once and the scene is resized to the dimensions the renderer returns afterwards.
+     *
+     * @param filtered the filtered instance (see filterInstance).
+     * @param renderer the renderer to draw with, by default the renderer of this canvas for the render type of the
+     *                 instance. The renderers keep state while they draw, so other threads must pass their own copy.
+     * @return the rendered scene.
+    """
+    def createSVGScene(self, filtered, renderer=None):
+        if renderer is None:
+            renderer = self._renderers[filtered.renderType]
+
+        scene = Scene(batchPaths=self._batchPaths, cssClasses=self._cssClasses)
+        scene.width, scene.height = renderer.render(filtered, scene)
+        return scene
+
+    """
+     * Renders the filtered current instance into a new SVG scene.
+     *
+     * @return the rendered scene.
+    """
+    def renderSVGScene(self):
+        self._SVGScene = self.createSVGScene(self.filterInstance())
+        return self._SVGScene
+
+    def exportNLPGraphics(self, filepath):
+        self.renderSVGScene()
+        self._SVGScene.write_svg(filepath)
+
+    """
+     * Clears the current instance.
+    """
+    def clear(self):
+        self._tokens.clear()
+        self._dependencies.clear()
+        self._unfiltered = None
+        self._usedTypes.clear()
+        self._usedProperties.clear()
+
+    """
+     * Exports the current graph to EPS.
+     *
+     * @param file the eps file to export to.
+     * @throws IOException if IO goes wrong.
+    """
+    # Will be implemented in the far future...
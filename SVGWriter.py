@@ -19,10 +19,24 @@ import os
 display_prog = "display"
 
 import copy
+import gzip
+import io
+from xml.sax.saxutils import escape, quoteattr
+
+from TextMetrics import TextMetrics
 
 class Scene:
-    def __init__(self, name="svg", width=400, height=400):
+    # If batchPaths is set, consecutive Line and QuadraticBezierCurve items of the same color and width (e.g. the
+    # segments and the arrowhead of one edge) are merged into one Path, and the paths are written grouped by their
+    # stroke style.
+    # If cssClasses is set, the colors of lines, paths, texts and rectangles are written as classes in a <style> block
+    # instead of inline styles. An item gets the class in cssClass when it is created (the layouts set it to a class of
+    # the edge type, see AbstractEdgeLayout.getStyleClass) or a class of its color if there is none.
+    def __init__(self, name="svg", width=400, height=400, batchPaths=False, cssClasses=False):
         self.name = name
+        self.batchPaths = batchPaths
+        self.cssClasses = cssClasses
+        self.cssClass = None
         self.items = []
         self.height = height
         self.width = width
@@ -43,27 +57,125 @@ class Scene:
     def color(self, value):
         self._color = value
 
-    def add(self, item): self.items.append(item)
+    def add(self, item):
+        if self.batchPaths and isinstance(item, (Line, QuadraticBezierCurve)):
+            last = self.items[-1] if len(self.items) > 0 else None
+            if isinstance(last, Path) and last.color == item.color and last.width == item.width and \
+                    last.cssClass == item.cssClass:
+                last.append(item)
+                return
+            path = Path(item.color, item.width, item.cssClass)
+            path.append(item)
+            item = path
+        self.items.append(item)
+
+    header = "<?xml version=\"1.0\"?>\n" \
+             "<svg height=\"%d\" width=\"%d\" xmlns=\"http://www.w3.org/2000/svg\">\n" \
+             " <g style=\"fill-opacity:1.0; stroke:black;\n" \
+             "  stroke-width:1;\">\n"
+    footer = " </g>\n</svg>\n"
+
+    # Streams the SVG document into a file-like object (with a write method), one write per element
+    def write(self, out):
+        out.write(self.header % (self.height, self.width))
+        if self.cssClasses:
+            self.writeStyle(out)
+        if self.batchPaths:
+            self.writeBatched(out)
+        else:
+            for item in self.items:
+                self.writeItem(out, item)
+        out.write(self.footer)
 
-    def strarray(self):
-        var = ["<?xml version=\"1.0\"?>\n",
-               "<svg height=\"%d\" width=\"%d\" xmlns=\"http://www.w3.org/2000/svg\">\n" % (self.height, self.width),
-               " <g style=\"fill-opacity:1.0; stroke:black;\n",
-               "  stroke-width:1;\">\n"]
+    def writeItem(self, out, item):
+        if self.cssClasses and hasattr(item, "writeClassed"):
+            item.writeClassed(out)
+        else:
+            item.write(out)
+
+    styleHeader = "  <style type=\"text/css\"><![CDATA[\n" \
+                  "   line, path { fill:none }\n" \
+                  "   text { font-family: Consolas }\n"
+    strokeRule = "   line.%s, path.%s, g.%s { stroke:rgb(%d,%d,%d) }\n"
+    fillRule = "   text.%s { fill:rgb(%d,%d,%d) }\n"
+    rectangleRule = "   rect.%s { fill:%s; stroke:%s; stroke-width:%d }\n"
+    styleFooter = "  ]]></style>\n"
+
+    # Writes the <style> block with the classes used by the items
+    def writeStyle(self, out):
+        strokes = {}
+        fills = {}
+        rectangles = {}
         for item in self.items:
-            var += item.strarray()
-        var += [" </g>\n</svg>\n"]
-        return var
+            if isinstance(item, (Line, QuadraticBezierCurve, Path)):
+                strokes.setdefault(classname(item), item.color)
+            elif isinstance(item, (Text, TextToken)):
+                fills.setdefault(classname(item), item.color)
+            elif isinstance(item, Rectangle):
+                rectangles.setdefault(item.classname(), item)
+        out.write(self.styleHeader)
+        for name, color in strokes.items():
+            out.write(self.strokeRule % (name, name, name, color[0], color[1], color[2]))
+        for name, color in fills.items():
+            out.write(self.fillRule % (name, color[0], color[1], color[2]))
+        for name, item in rectangles.items():
+            out.write(self.rectangleRule % (name, colorstr(item.fill_color), colorstr(item.line_color),
+                                            item.line_width))
+        out.write(self.styleFooter)
+
+    # Writes the paths of each run of paths and texts grouped by stroke style under one <g>, followed by the texts of
+    # the run. Filled shapes end a run, so nothing is moved across an element that could cover it.
+    def writeBatched(self, out):
+        groups = {}
+        texts = []
+        for item in self.items:
+            if isinstance(item, Path):
+                groups.setdefault((item.color, item.width, item.cssClass), []).append(item)
+            elif isinstance(item, (Text, TextToken)):
+                texts.append(item)
+            else:
+                self.writeRun(out, groups, texts)
+                groups = {}
+                texts = []
+                self.writeItem(out, item)
+        self.writeRun(out, groups, texts)
+
+    def writeRun(self, out, groups, texts):
+        for (color, width, cssClass), paths in groups.items():
+            if self.cssClasses:
+                out.write(Path.classedGroupTemplate % (quoteattr(classname(paths[0])), width))
+            else:
+                out.write(Path.groupTemplate % (color[0], color[1], color[2], width))
+            for path in paths:
+                path.writeData(out)
+            out.write("  </g>\n")
+        for text in texts:
+            self.writeItem(out, text)
+
+    def strarray(self):
+        return [self.tostring()]
+
+    def tostring(self):
+        out = io.StringIO()
+        self.write(out)
+        return out.getvalue()
 
+    def tobytes(self, encoding="utf-8"):
+        return self.tostring().encode(encoding)
+
+    # The document is serialized into memory and written with a single write call, gzip compressed if the name of the
+    # file ends with .svgz
     def write_svg(self, filename=None):
         if filename:
             self.svgname = filename
         else:
             self.svgname = self.name + ".svg"
-        file = open(self.svgname, 'w')
-        print(self.svgname)
-        file.writelines(self.strarray())
-        file.close()
+        if self.svgname.endswith(".svgz"):
+            with gzip.open(self.svgname, 'wb') as file:
+                file.write(self.tobytes())
+        else:
+            with open(self.svgname, 'w') as file:
+                file.write(self.tostring())
         return
 
     def display(self, prog=display_prog):
@@ -79,12 +191,25 @@ class Line:
         self.width = width
         self.offsetx = scene.offsetx
         self.offsety = scene.offsety
+        self.cssClass = scene.cssClass
         return
 
+    template = "  <line x1=\"%d\" y1=\"%d\" x2=\"%d\" y2=\"%d\" style=\"stroke:rgb(%d,%d,%d);stroke-width:%d\"/>\n"
+
+    classedTemplate = "  <line x1=\"%d\" y1=\"%d\" x2=\"%d\" y2=\"%d\" class=%s%s/>\n"
+
+    def write(self, out):
+        color = self.color
+        out.write(self.template % (self.start[0]+self.offsetx, self.start[1]+self.offsety, self.end[0]+self.offsetx,
+                                   self.end[1]+self.offsety, color[0], color[1], color[2], self.width))
+
+    def writeClassed(self, out):
+        out.write(self.classedTemplate % (self.start[0]+self.offsetx, self.start[1]+self.offsety,
+                                          self.end[0]+self.offsetx, self.end[1]+self.offsety,
+                                          quoteattr(classname(self)), widthattr(self.width)))
+
     def strarray(self):
-        return ["  <line x1=\"%d\" y1=\"%d\" x2=\"%d\" y2=\"%d\" style=\"stroke:%s;stroke-width:%d\"/>\n" %
-                (self.start[0]+self.offsetx, self.start[1]+self.offsety, self.end[0]+self.offsetx,
-                 self.end[1]+self.offsety, colorstr(self.color), self.width)]
+        return [elementstr(self)]
 
 
 class QuadraticBezierCurve:
@@ -102,17 +227,83 @@ class QuadraticBezierCurve:
         self.width = width
         self.offsetx = scene.offsetx
         self.offsety = scene.offsety
+        self.cssClass = scene.cssClass
         return
 
+    template = "  <path d=\"M %d %d C %d %d %d %d %d %d\" style=\"stroke:rgb(%d,%d,%d);stroke-width:%d\" fill=\"none\" />\n"
+
+    def write(self, out):
+        color = self.color
+        out.write(self.template % (self.start[0]+self.offsetx, self.start[1]+self.offsety, self.control1[0]+self.offsetx,
+                                   self.control1[1]+self.offsety, self.control2[0]+self.offsetx,
+                                   self.control2[1]+self.offsety, self.end[0]+self.offsetx, self.end[1]+self.offsety,
+                                   color[0], color[1], color[2], self.width))
+
+    classedTemplate = "  <path d=\"M %d %d C %d %d %d %d %d %d\" class=%s%s/>\n"
+
+    def writeClassed(self, out):
+        out.write(self.classedTemplate % (self.start[0]+self.offsetx, self.start[1]+self.offsety,
+                                          self.control1[0]+self.offsetx, self.control1[1]+self.offsety,
+                                          self.control2[0]+self.offsetx, self.control2[1]+self.offsety,
+                                          self.end[0]+self.offsetx, self.end[1]+self.offsety,
+                                          quoteattr(classname(self)), widthattr(self.width)))
+
     def strarray(self):
-        return ["  <path d=\"M %d %d C %d %d %d %d %d %d\" style=\"stroke:%s;stroke-width:%d\" fill=\"none\" />\n" %
-                (self.start[0]+self.offsetx, self.start[1]+self.offsety, self.control1[0]+self.offsetx,
-                 self.control1[1]+self.offsety, self.control2[0]+self.offsetx, self.control2[1]+self.offsety,
-                 self.end[0]+self.offsetx, self.end[1]+self.offsety, colorstr(self.color), self.width)]
+        return [elementstr(self)]
 
 # TODO <path d="M 100 350 q 150 -300 300 0" stroke="blue" stroke-width="5" fill="none" />
 
 
+# A Path is a sequence of line and cubic bezier segments drawn with the same stroke (see Scene.batchPaths). A segment
+# that does not start where the previous one ended starts a new subpath.
+class Path:
+    template = "  <path d=\"%s\" style=\"stroke:rgb(%d,%d,%d);stroke-width:%d\" fill=\"none\" />\n"
+    groupTemplate = "  <g style=\"stroke:rgb(%d,%d,%d);stroke-width:%d;fill:none\">\n"
+    classedGroupTemplate = "  <g class=%s style=\"stroke-width:%d;fill:none\">\n"
+    classedTemplate = "  <path d=\"%s\" class=%s%s/>\n"
+    dataTemplate = "   <path d=\"%s\" />\n"
+
+    def __init__(self, color, width=1, cssClass=None):
+        self.color = color
+        self.width = width
+        self.cssClass = cssClass
+        self.commands = []
+        self.position = None
+
+    # Adds a Line or a QuadraticBezierCurve item as a segment of the path
+    def append(self, item):
+        start = (int(item.start[0]+item.offsetx), int(item.start[1]+item.offsety))
+        end = (int(item.end[0]+item.offsetx), int(item.end[1]+item.offsety))
+        if isinstance(item, Line) and start != self.position and end == self.position:
+            start, end = end, start  # e.g. the second stroke of an arrowhead, drawn back from the tip
+        if start != self.position:
+            self.commands.append("M %d %d" % start)
+        if isinstance(item, QuadraticBezierCurve):
+            self.commands.append("C %d %d %d %d %d %d" % (item.control1[0]+item.offsetx, item.control1[1]+item.offsety,
+                                                           item.control2[0]+item.offsetx, item.control2[1]+item.offsety,
+                                                           end[0], end[1]))
+        else:
+            self.commands.append("L %d %d" % end)
+        self.position = end
+
+    def data(self):
+        return " ".join(self.commands)
+
+    def write(self, out):
+        color = self.color
+        out.write(self.template % (self.data(), color[0], color[1], color[2], self.width))
+
+    def writeClassed(self, out):
+        out.write(self.classedTemplate % (self.data(), quoteattr(classname(self)), widthattr(self.width)))
+
+    # Writes the path without its style (inside of a group that sets it)
+    def writeData(self, out):
+        out.write(self.dataTemplate % self.data())
+
+    def strarray(self):
+        return [elementstr(self)]
+
+
 class Circle:
     def __init__(self, center, radius, fill_color, line_color, line_width):
         self.center = center
@@ -122,11 +313,15 @@ class Circle:
         self.line_width = line_width
         return
 
+    template = "  <circle cx=\"%d\" cy=\"%d\" r=\"%d\"\n" \
+               "    style=\"fill:%s;stroke:%s;stroke-width:%d\"  />\n"
+
+    def write(self, out):
+        out.write(self.template % (self.center[0], self.center[1], self.radius, colorstr(self.fill_color),
+                                   colorstr(self.line_color), self.line_width))
+
     def strarray(self):
-        return ["  <circle cx=\"%d\" cy=\"%d\" r=\"%d\"\n" %
-                (self.center[0], self.center[1], self.radius),
-                "    style=\"fill:%s;stroke:%s;stroke-width:%d\"  />\n" %
-                (colorstr(self.fill_color), colorstr(self.line_color), self.line_width)]
+        return [elementstr(self)]
 
 
 class HalfCircle:
@@ -141,13 +336,17 @@ class HalfCircle:
         self.id = HalfCircle.id
         return
 
+    template = "<clipPath id=\"cut-off-bottom%d\"> \n <rect x=\"%d\" y=\"%d\" width=\"%d\" height=\"%d\" /> \n" \
+               " </clipPath>\n" \
+               "<circle cx=\"%d\" cy=\"%d\" r=\"%d\" clip-path=\"url(#cut-off-bottom%d)\" style=\"stroke:%s;stroke-width:%dfill-opacity: 1\"/>"
+
+    def write(self, out):
+        out.write(self.template % (self.id, self.center[0]-self.radius, self.center[1], self.radius*2, self.radius,
+                                   self.center[0], self.center[1], self.radius, self.id, colorstr(self.line_color),
+                                   self.line_width))
+
     def strarray(self):
-        clip = "<clipPath id=\"cut-off-bottom%d\"> \n <rect x=\"%d\" y=\"%d\" width=\"%d\" height=\"%d\" /> \n" \
-               " </clipPath>" % (self.id, self.center[0]-self.radius, self.center[1], self.radius*2,
-                                 self.radius)
-        circle = "<circle cx=\"%d\" cy=\"%d\" r=\"%d\" clip-path=\"url(#cut-off-bottom%d)\" style=\"stroke:%s;stroke-width:%dfill-opacity: 1\"/>" %\
-                 (self.center[0], self.center[1], self.radius, self.id, colorstr(self.line_color), self.line_width)
-        return clip + "\n" + circle
+        return elementstr(self)
         # return ["  <circle cx=\"%d\" cy=\"%d\" r=\"%d\"\n" %
         #        (self.center[0],self.center[1],self.radius),
         #        "    style=\"fill:%s;stroke:%s;stroke-width:%d\"  />\n" % (colorstr(self.fill_color),colorstr(self.line_color),self.line_width)]
@@ -162,11 +361,15 @@ class Ellipse:
         self.line_color = line_color
         self.line_width = line_width
 
+    template = "  <ellipse cx=\"%d\" cy=\"%d\" rx=\"%d\" ry=\"%d\"\n" \
+               "    style=\"fill:%s;stroke:%s;stroke-width:%d\"/>\n"
+
+    def write(self, out):
+        out.write(self.template % (self.center[0], self.center[1], self.radiusx, self.radiusy, colorstr(self.fill_color),
+                                   colorstr(self.line_color), self.line_width))
+
     def strarray(self):
-        return ["  <ellipse cx=\"%d\" cy=\"%d\" rx=\"%d\" ry=\"%d\"\n" %
-                (self.center[0], self.center[1], self.radiusx, self.radiusy),
-                "    style=\"fill:%s;stroke:%s;stroke-width:%d\"/>\n" %
-                (colorstr(self.fill_color), colorstr(self.line_color), self.line_width)]
+        return [elementstr(self)]
 
 
 class Polygon:
@@ -176,13 +379,14 @@ class Polygon:
         self.line_color = line_color
         self.line_width = line_width
 
+    template = "<polygon points=\"%s\" \nstyle=\"fill:%s;stroke:%s;stroke-width:%d\"/>\n"
+
+    def write(self, out):
+        points = "".join(" %d,%d" % (point[0], point[1]) for point in self.points)
+        out.write(self.template % (points, colorstr(self.fill_color), colorstr(self.line_color), self.line_width))
+
     def strarray(self):
-        polygon = "<polygon points=\""
-        for point in self.points:
-            polygon += " %d,%d" % (point[0], point[1])
-        return [polygon,
-                "\" \nstyle=\"fill:%s;stroke:%s;stroke-width:%d\"/>\n" %
-                (colorstr(self.fill_color), colorstr(self.line_color), self.line_width)]
+        return [elementstr(self)]
 
 
 class Rectangle:
@@ -197,11 +401,25 @@ class Rectangle:
         self.offsety = scene.offsety
         return
 
+    template = "  <rect x=\"%d\" y=\"%d\" height=\"%d\"\n" \
+               "    width=\"%d\" style=\"fill:%s;stroke:%s;stroke-width:%d\" />\n"
+
+    classedTemplate = "  <rect x=\"%d\" y=\"%d\" height=\"%d\" width=\"%d\" class=%s />\n"
+
+    def write(self, out):
+        out.write(self.template % (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.height, self.width,
+                                   colorstr(self.fill_color), colorstr(self.line_color), self.line_width))
+
+    def writeClassed(self, out):
+        out.write(self.classedTemplate % (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.height,
+                                          self.width, quoteattr(self.classname())))
+
+    # Rectangles are styled by their colors and line width
+    def classname(self):
+        return "r%02x%02x%02x-%02x%02x%02x-%d" % (tuple(self.fill_color) + tuple(self.line_color) + (self.line_width,))
+
     def strarray(self):
-        return ["  <rect x=\"%d\" y=\"%d\" height=\"%d\"\n" %
-                (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.height),
-                "    width=\"%d\" style=\"fill:%s;stroke:%s;stroke-width:%d\" />\n" %
-                (self.width, colorstr(self.fill_color), colorstr(self.line_color), self.line_width)]
+        return [elementstr(self)]
 
 
 class Text:
@@ -212,17 +430,33 @@ class Text:
         self.color = color
         self.offsetx = scene.offsetx
         self.offsety = scene.offsety
+        self.cssClass = scene.cssClass
         return
 
+    template = "  <text x=\"%d\" y=\"%d\" font-size=\"%d\" fill=\"rgb(%d,%d,%d)\" text-anchor=\"middle\" " \
+               "alignment-baseline=\"central\" style=\"font-family: Consolas\" >\n" \
+               "   %s\n" \
+               "  </text>\n"
+
+    classedTemplate = "  <text x=\"%d\" y=\"%d\" font-size=\"%d\" class=%s text-anchor=\"middle\" " \
+                      "alignment-baseline=\"central\" >\n" \
+                      "   %s\n" \
+                      "  </text>\n"
+
+    def write(self, out):
+        color = self.color
+        out.write(self.template % (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.size, color[0],
+                                   color[1], color[2], escape(str(self.text))))
+
+    def writeClassed(self, out):
+        out.write(self.classedTemplate % (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.size,
+                                          quoteattr(classname(self)), escape(str(self.text))))
+
     def strarray(self):
-        return ["  <text x=\"%d\" y=\"%d\" font-size=\"%d\" fill=\"%s\" text-anchor=\"middle\" "
-                "alignment-baseline=\"central\" style=\"font-family: Consolas\" >\n" %
-                (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.size, colorstr(self.color)),
-                "   %s\n" % self.text,
-                "  </text>\n"]
+        return [elementstr(self)]
 
     def getWidth(self):
-        return len(self.text) * 6
+        return TextMetrics.getWidth(self.text, self.size)
 
 
 class TextToken:
@@ -233,22 +467,59 @@ class TextToken:
         self.color = color
         self.offsetx = scene.offsetx
         self.offsety = scene.offsety
+        self.cssClass = scene.cssClass
         return
 
+    template = "  <text x=\"%d\" y=\"%d\" font-size=\"%d\" fill=\"rgb(%d,%d,%d)\" style=\"font-family: Consolas\">\n" \
+               "   %s\n" \
+               "  </text>\n"
+
+    classedTemplate = "  <text x=\"%d\" y=\"%d\" font-size=\"%d\" class=%s>\n" \
+                      "   %s\n" \
+                      "  </text>\n"
+
+    def write(self, out):
+        color = self.color
+        out.write(self.template % (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.size, color[0],
+                                   color[1], color[2], escape(str(self.text))))
+
+    def writeClassed(self, out):
+        out.write(self.classedTemplate % (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.size,
+                                          quoteattr(classname(self)), escape(str(self.text))))
+
     def strarray(self):
-        return ["  <text x=\"%d\" y=\"%d\" font-size=\"%d\" fill=\"%s\" style=\"font-family: Consolas\">\n" %
-                (self.origin[0]+self.offsetx, self.origin[1]+self.offsety, self.size, colorstr(self.color)),
-                "   %s\n" % self.text,
-                "  </text>\n"]
+        return [elementstr(self)]
 
     def getWidth(self):
-        return len(self.text) * 6
+        return TextMetrics.getWidth(self.text, self.size)
 
 
 def colorstr(rgb):
     return "rgb(%d,%d,%d)" % (rgb[0], rgb[1], rgb[2])
 
 
+# The CSS class of an item: the class it was created with or a class of its color
+def classname(item):
+    if item.cssClass is not None:
+        return item.cssClass
+    return "c%02x%02x%02x" % (item.color[0], item.color[1], item.color[2])
+
+
+# The stroke-width attribute for widths other than the default inherited from the enclosing group. The style block sets
+# no stroke-width for lines and paths, since a CSS rule would override this attribute (and the width of a batched <g>).
+def widthattr(width):
+    if width == 1:
+        return ""
+    return " stroke-width=\"%d\"" % width
+
+
+# Serializes a single element (for the old strarray interface)
+def elementstr(item):
+    out = io.StringIO()
+    item.write(out)
+    return out.getvalue()
+
+
 def test():
     scene = Scene("test")
     scene.add(Rectangle(scene, (100, 100), 200, 200, (0, 255, 255), (0, 0, 0), 1))
@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8, vim: expandtab:ts=4 -*-
 
+import copy
+from collections import namedtuple
+
 from Edge import Edge
 from SpanLayout import SpanLayout
 from DependencyLayout import DependencyLayout
 from TokenLayout import TokenLayout
-from PyQt4 import QtCore
+
+"""
+ * A point of the canvas (instead of QtCore.QPoint, so the renderer does not depend on Qt).
+"""
+Point = namedtuple("Point", ("x", "y"))
 
 """
  * A SingleSentenceRenderer renders an NLPInstance as a single sentence with spans drawn below the tokens, and
@@ -91,6 +98,16 @@ class SingleSentenceRenderer:
         self._startOfTokens = 0
         self._startOfSpans = 0
 
+    """
+     * Returns a new renderer with copies of the layouts of this one (see AbstractEdgeLayout.copy).
+    """
+    def copy(self):
+        renderer = copy.copy(self)
+        renderer._spanLayout = self._spanLayout.copy()
+        renderer._dependencyLayout = self._dependencyLayout.copy()
+        renderer._tokenLayout = self._tokenLayout.copy()
+        return renderer
+
     """
      * Renders the given instance as a single sentence with spans drawn below tokens, and dependencies above tokens.
      *
@@ -171,7 +188,7 @@ class SingleSentenceRenderer:
         if p.y < self._startOfTokens:
             return self._dependencyLayout.getEdgeAt(p, radius)
         else:
-            shifted = QtCore.QPoint(p.x, p.y - self._startOfSpans)
+            shifted = Point(p.x, p.y - self._startOfSpans)
             return self._spanLayout.getEdgeAt(shifted, radius)
 
     """
@@ -2,9 +2,11 @@
 # -*- coding: utf-8, vim: expandtab:ts=4 -*-
 
 from AbstractEdgeLayout import AbstractEdgeLayout
+from EdgeNesting import EdgeNesting
 from utils.Counter import Counter
 from utils.HashMultiMapArrayList import HashMultiMapArrayList
 from SVGWriter import *
+from TextMetrics import TextMetrics
 
 
 """
@@ -73,6 +75,14 @@ class SpanLayout(AbstractEdgeLayout):
         self._orders = {}
         self._totalTextMargin = 6
 
+    """
+     * Returns a new layout with the same settings (see AbstractEdgeLayout.copy).
+    """
+    def copy(self):
+        layout = AbstractEdgeLayout.copy(self)
+        layout._orders = dict(self._orders)
+        return layout
+
     """
      * Sets the order/vertical layer in which the area of a certain type should be drawn.
      *
@@ -123,7 +133,7 @@ class SpanLayout(AbstractEdgeLayout):
         result = {}
         for edge in edges:
             if edge.From == edge.To:
-                labelwith = Text(scene, (0, 0), edge.label, 12, scene.color).getWidth()  # Original fontsize is 8
+                labelwith = TextMetrics.getWidth(edge.label, 12)  # Original fontsize is 8
                 if edge.From in result:
                     width = max(labelwith, result[edge.From])  # oldWith is result[...]
                 else:
@@ -149,21 +159,8 @@ class SpanLayout(AbstractEdgeLayout):
 
         depth = Counter()
         offset = Counter()
-        dominates = HashMultiMapArrayList()
-
-        for over in edges:
-            for under in edges:
-                orderOver = self.getOrder(over.getTypePrefix())
-                orderUnder = self.getOrder(under.getTypePrefix())
-                if orderOver > orderUnder or orderOver == orderUnder and (
-                    over.covers(under) or over.coversSemi(under) or
-                    over.coversExactly(under) and
-                    over.lexicographicOrder(under) > 0 or
-                    over.overlaps(under) and over.getMinIndex() < under.getMinIndex()):
-                    dominates.add(over, under)
-
-        for edge in edges:
-            self.calculateDepth(dominates, depth, edge)
+        for edge, edgeDepth in EdgeNesting.spanDepths(edges, self.getOrder).items():
+            depth[edge] = edgeDepth
 
         # calculate maxHeight and maxWidth
         maxDepth = depth.getMaximum()
@@ -189,10 +186,12 @@ class SpanLayout(AbstractEdgeLayout):
 
             # set Color and remember old color
             old = scene.color
+            oldClass = scene.cssClass
             scene.color = self.getColor(edge.type)
+            scene.cssClass = self.getStyleClass(edge.type)
 
             # prepare label (will be needed for spacing)
-            labelwith = Text(scene, (0, 0), edge.label, 12, scene.color).getWidth() * 0
+            labelwith = TextMetrics.getWidth(edge.label, 12) * 0
             # draw lines
             if self._revert:
                 spanLevel = maxDepth - depth[edge]
@@ -235,6 +234,7 @@ class SpanLayout(AbstractEdgeLayout):
 
             scene.add(Text(scene, (labelx, labely), edge.getLabelWithNote(), 12, scene.color))
             scene.color = old
+            scene.cssClass = oldClass
             self._shapes[(minX, height-buffer, maxX-minX, self._heightPerLevel - 2 * buffer)] = edge
 
         # int maxWidth = 0;
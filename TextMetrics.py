@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import math
+import sys
+import threading
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+
+"""
+ * TextMetrics measures the width of rendered text for the layouts. If a Qt application is running, the width is taken
+ * from QFontMetrics, otherwise it is calculated from the advance widths of the fonts in TextMetrics.fonts, so the SVG
+ * output has the same layout with and without a display. The widths are cached by (text, size, font).
+ *
+ * Qt fonts may only be used in the GUI (main) thread. A layout that runs in another thread gets the widths measured in
+ * the GUI thread beforehand (see TextMetrics.measure and TextMetrics.using), other texts are measured with the advance
+ * widths there.
+"""
+
+
+class TextMetrics:
+
+    """
+     * The font of the SVG texts (see SVGWriter.Text).
+    """
+    defaultFont = "Consolas"
+
+    """
+     * The advance widths of the known fonts as (units per em, advance of a glyph) in font units. The fonts are
+     * monospaced, so every glyph of a font has the same advance.
+    """
+    fonts = {"Consolas": (2048, 1126),
+             "DejaVu Sans Mono": (2048, 1233),
+             "Courier New": (2048, 1229)}
+
+    """
+     * The number of cached widths.
+    """
+    cacheSize = 8192
+
+    """
+     * Returns the width of a text in pixels.
+     *
+     * @param text the text (converted with str()).
+     * @param size the font size in pixels.
+     * @param font the font family.
+     * @return the width of the text, rounded up to whole pixels.
+    """
+    @staticmethod
+    def getWidth(text, size=12, font=defaultFont):
+        text = str(text)
+        widths = getattr(_local, "widths", None)
+        if widths is not None:
+            width = widths.get((text, size, font))
+            if width is not None:
+                return width
+        if threading.current_thread() is not threading.main_thread():
+            return _headlessWidth(text, size, font)
+        return _cachedWidth(text, size, font)
+
+    """
+     * Measures texts in the current thread, e.g. in the GUI thread before they are laid out in another thread.
+     *
+     * @param texts the texts (converted with str()).
+     * @param size  the font size in pixels.
+     * @param font  the font family.
+     * @return a dictionary from (text, size, font) to the width of the text (see TextMetrics.using).
+    """
+    @staticmethod
+    def measure(texts, size=12, font=defaultFont):
+        return {(str(text), size, font): TextMetrics.getWidth(text, size, font) for text in texts}
+
+    """
+     * Makes getWidth return the given widths in the current thread while the context is active.
+     *
+     * @param widths the widths, as returned by TextMetrics.measure.
+    """
+    @staticmethod
+    @contextmanager
+    def using(widths):
+        previous = getattr(_local, "widths", None)
+        _local.widths = widths
+        try:
+            yield
+        finally:
+            _local.widths = previous
+
+    """
+     * Clears the cache of widths, e.g. after a Qt application was started.
+    """
+    @staticmethod
+    def clearCache():
+        _qtMetrics.cache_clear()
+        _cachedWidth.cache_clear()
+        _headlessWidth.cache_clear()
+
+    """
+     * Returns the width of a text from the advance widths of TextMetrics.fonts. Wide (east asian) characters are
+     * taken from a fallback font and are one em wide, combining and format characters have no width.
+     *
+     * @param text the text.
+     * @param size the font size in pixels.
+     * @param font the font family (Consolas if it is not known).
+     * @return the width of the text in pixels.
+    """
+    @staticmethod
+    def advanceWidth(text, size=12, font=defaultFont):
+        unitsPerEm, advance = TextMetrics.fonts.get(font, TextMetrics.fonts[TextMetrics.defaultFont])
+        ems = 0.0
+        for char in text:
+            if char.isascii():
+                if char.isprintable():
+                    ems += advance / unitsPerEm
+            elif unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Me", "Cf", "Cc"):
+                continue
+            elif unicodedata.east_asian_width(char) in ("W", "F"):
+                ems += 1.0
+            else:
+                ems += advance / unitsPerEm
+        return ems * size
+
+
+"""
+ * Returns the QFontMetrics of a font if a Qt application is running, None otherwise.
+"""
+@lru_cache(maxsize=32)
+def _qtMetrics(size, font):
+    # A running application has imported QtGui already, headless processes do not import it at all
+    QtGui = sys.modules.get("PyQt4.QtGui")
+    if QtGui is None or QtGui.QApplication.instance() is None:
+        return None
+    qfont = QtGui.QFont(font)
+    qfont.setPixelSize(size)
+    return QtGui.QFontMetrics(qfont)
+
+
+@lru_cache(maxsize=TextMetrics.cacheSize)
+def _cachedWidth(text, size, font):
+    metrics = _qtMetrics(size, font)
+    if metrics is not None:
+        return metrics.width(text)
+    return _headlessWidth(text, size, font)
+
+
+@lru_cache(maxsize=TextMetrics.cacheSize)
+def _headlessWidth(text, size, font):
+    return int(math.ceil(TextMetrics.advanceWidth(text, size, font)))
+
+
+"""
+ * The widths measured beforehand for the layouts of the current thread (see TextMetrics.using).
+"""
+_local = threading.local()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8, vim: expandtab:ts=4 -*-
 
 from TokenProperty import *
+from PropertyMatcher import PropertyMatcher
 import re
 from operator import attrgetter
 
@@ -14,6 +15,7 @@ from operator import attrgetter
 
 
 class Token:
+    __slots__ = ('_index', '_intIndex', '_tokenProperties')
 
     """
      * The index of the token.
@@ -25,6 +27,14 @@ class Token:
     @index.setter
     def index(self, value):
         self._index = value
+        self._intIndex = Token._toInt(value)
+
+    """
+     * The index of the token as an integer (the index is usually stored as a string), None if it is not a number.
+    """
+    @property
+    def intIndex(self):
+        return self._intIndex
 
     """
      * A mapping from properties to values.
@@ -44,8 +54,22 @@ class Token:
     """
     def __init__(self, index):
         self._index = index
+        self._intIndex = Token._toInt(index)
         self._tokenProperties = {}
 
+    """
+     * Converts an index to an integer.
+     *
+     * @param index the index.
+     * @return the index as an integer or None if it is not a number.
+    """
+    @staticmethod
+    def _toInt(index):
+        try:
+            return int(index)
+        except (TypeError, ValueError):
+            return None
+
     """
      * Returns the index of the token.
      *
@@ -159,7 +183,8 @@ class Token:
      *                   the token value.
      * @return true iff a) if there is a property value equal to one of the strings in <code>substrings</code>
      *         (wholeword=true) or b) if there is a property value that contains one of the strings in
-     *         <code>substrings</code> (wholeword=false).
+     *         <code>substrings</code> (wholeword=false). Strings of the form "from-to" match the numeric property
+     *         values in that range instead.
     """
     def propertiesContain(self, substring=None, substrings=None, wholeWord=None):
         if substring is not None:
@@ -169,16 +194,22 @@ class Token:
             return False
         else:
             if substrings is not None and wholeWord is not None:
-                for property in self._tokenProperties.values():
-                    for substr in substrings:
-                        if re.match("\d+-\d+$", substr):  # Full string match in JAVA!
-                            From, To = substr.split("-")
-                            if int(From) <= property <= int(To):
-                                return True
-                        elif (wholeWord and property == substr) or (not wholeWord and substr in property):
-                            return True
+                return self.propertiesMatch(PropertyMatcher.get(substrings, wholeWord))
             return False
 
+    """
+     * Check whether any of the property values of this token matches a PropertyMatcher (see
+     * PropertyMatcher.matches). This is propertiesContain with a matcher that is built once for the allowed strings.
+     *
+     * @param matcher the matcher of the allowed strings.
+     * @return true iff one of the property values matches.
+    """
+    def propertiesMatch(self, matcher):
+        for property in self._tokenProperties.values():
+            if matcher.matches(property):
+                return True
+        return False
+
     """
      * Checks whether the two tokens have the same index. (Hence equality is only defined through the position of the
      * token in the sentence.
@@ -195,7 +226,9 @@ class Token:
      * @return the index of the token.
     """
     def __hash__(self):
-        return int(self.index)
+        if self._intIndex is None:
+            return hash(self._index)
+        return self._intIndex
 
     """
      * Inserts all properties and values of the other token into this token. In case of clashes the value of the other
@@ -225,4 +258,4 @@ class Token:
 
     @property
     def int_index(self):
-        return int(self._index)
\ No newline at end of file
+        return self._intIndex
@@ -5,6 +5,7 @@ from NLPInstanceFilter import *
 from NLPInstance import *
 from TokenProperty import *
 from Token import *
+from PropertyMatcher import PropertyMatcher
 
 class TokenFilter(NLPInstanceFilter):
     """
@@ -26,6 +27,11 @@ class TokenFilter(NLPInstanceFilter):
          * sufficient if one value contains one of the allowed strings.
         """
         self._wholeWord = False
+        """
+         * The matcher of the allowed strings and the version of the filter it was built for.
+        """
+        self._matcher = None
+        self._matcherVersion = None
 
     """
      * Are tokens allowed only if they have a property value that equals one of the allowed strings or is it sufficient
@@ -47,6 +53,7 @@ class TokenFilter(NLPInstanceFilter):
     @wholeWord.setter
     def wholeWord(self, value):
         self._wholeWord = value
+        self.changed()
 
     """
      * Add a an allowed property value.
@@ -55,12 +62,14 @@ class TokenFilter(NLPInstanceFilter):
     """
     def addAllowedString(self, string=str):
         self._allowedStrings.add(string)
+        self.changed()
 
     """
      * Remove all allowed strings. In this state the filter allows all tokens.
     """
     def clearAllowedStrings(self):
         self._allowedStrings.clear()
+        self.changed()
 
     """
      * Add a property that is forbidden so that the corresponding values are removed from each token.
@@ -69,6 +78,7 @@ class TokenFilter(NLPInstanceFilter):
     """
     def addForbiddenProperty(self, name=str):
         self._forbiddenProperties.add(TokenProperty(name))
+        self.changed()
 
     """
      * Remove a property that is forbidden so that the corresponding values shown again.
@@ -79,6 +89,7 @@ class TokenFilter(NLPInstanceFilter):
         p = TokenProperty(name)
         if p in self._forbiddenProperties:
             self._forbiddenProperties.remove(p)
+            self.changed()
 
     """
      * Returns an unmodifiable view on the set of all allowed token properties.
@@ -89,6 +100,36 @@ class TokenFilter(NLPInstanceFilter):
     def forbiddenProperties(self):
         return self._forbiddenProperties
 
+    """
+     * Returns the matcher of the allowed strings. It is built again only after the filter was changed.
+     *
+     * @return the PropertyMatcher of the allowed strings.
+    """
+    def getMatcher(self):
+        if self._matcherVersion != self.version:
+            self._matcher = PropertyMatcher.get(self._allowedStrings, self._wholeWord)
+            self._matcherVersion = self.version
+        return self._matcher
+
+    """
+     * Checks whether a token has a property value that matches one of the allowed strings. Allowed strings of the form
+     * "from-to" match the values of the Index property in that range, the values of all other properties are matched as
+     * text.
+     *
+     * @param token   the token.
+     * @param matcher the matcher of the allowed strings (see getMatcher).
+     * @return true iff the token is allowed.
+    """
+    def allowsToken(self, token, matcher):
+        for property in token.getPropertyTypes():
+            prop = token.getProperty(property)
+            if property.name == "Index":
+                if matcher.matchesRange(prop) or matcher.matchesText(prop):
+                    return True
+            elif matcher.matchesText(prop, ranges=True):
+                return True
+        return False
+
     """
      * Filter a set of tokens by removing property values and individual tokens according to the set of allowed strings
      * and forbidden properties.
@@ -120,42 +161,14 @@ class TokenFilter(NLPInstanceFilter):
             old2new = {}
             new2old = {}
             tokens = []
+            matcher = self.getMatcher()
             for t in original.tokens:
-                stopped = False
-                for property in t.getPropertyTypes():
-                    if stopped:
-                        break
-                    prop = t.getProperty(property)
-                    for allowed in self._allowedStrings:
-                        if stopped:
-                            break
-                        # todo: this can surely be implemented in a nicer way (e.g. no reparsing of interval)
-                        if property.name == "Index" and re.match("\d+-\d+", allowed):
-                            split = allowed.split("-")
-                            From = int(split[0])
-                            to = int(split[1])
-                            for i in range(From, to+1):
-                                if(prop == str(i)):
-                                    newVertex = Token(len(tokens))
-                                    newVertex.merge(t)
-                                    tokens.append(newVertex)
-                                    old2new[t] = newVertex
-                                    new2old[newVertex] = t
-                                    stopped = True
-                                    break
-                        else:
-                            if self._wholeWord:
-                                b = prop == allowed
-                            else:
-                                b= allowed in prop
-                            if b:
-                                newVertex = Token(len(tokens))
-                                newVertex.merge(t)
-                                tokens.append(newVertex)
-                                old2new[t] = newVertex
-                                new2old[newVertex] = t
-                                stopped = True
-                                break
+                if self.allowsToken(t, matcher):
+                    newVertex = Token(len(tokens))
+                    newVertex.merge(t)
+                    tokens.append(newVertex)
+                    old2new[t] = newVertex
+                    new2old[newVertex] = t
             # update edges and remove those that have vertices not in the new vertex set
             edges = []
             for e in original.getEdges():
@@ -42,7 +42,8 @@ class TokenFilterPanel():
             split = text.split(',')
             for property in split:
                 self._tokenFilter.addAllowedString(property)
-            self._canvas.updateNLPGraphics()
+            # Called for every keystroke, the canvas is drawn once the typing pauses
+            self._canvas.scheduleNLPGraphics()
         self._allowed.textEdited.connect(allowedChanged)
 
         self._wholeWords = gui.tokenFilterWholeWordsCheckBox
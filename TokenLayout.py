@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8, vim: expandtab:ts=4 -*-
 
-from PyQt4 import QtGui, QtCore
+import copy
+
 from SVGWriter import *
+from TextMetrics import TextMetrics
 from Bounds1D import Bounds1D
 
 """
@@ -208,6 +210,18 @@ class TokenLayout:
         self._width = 0
         self._height = 0
 
+    """
+     * Returns a new layout with the same settings but without the state of the last drawing (see
+     * AbstractEdgeLayout.copy).
+    """
+    def copy(self):
+        layout = copy.copy(self)
+        layout._textLayouts = {}
+        layout._bounds = {}
+        layout._width = 0
+        layout._height = 0
+        return layout
+
     """
      * Method estimateTokenBounds calculates the horizontal bounds of each token in the layout of the tokens.
      *
@@ -244,7 +258,7 @@ class TokenLayout:
             lasty = self._baseLine + self._rowHeight
             for p in token.getSortedProperties():
                 property = token.getProperty(p)
-                labelwith = Text(scene, (0, 0), property, 12, scene.color).getWidth()
+                labelwith = TextMetrics.getWidth(property, 12)
                 lasty += self._rowHeight
                 if labelwith > maxX:
                     maxX = labelwith
@@ -307,7 +321,7 @@ class TokenLayout:
                     scene.color = (120, 120, 120)  # GREY
                 scene.add(TextToken(scene, (lastx, lasty), property, 12, scene.color))
                 lasty += self._rowHeight
-                labelwidth = Text(scene, (0, 0), property, 12, scene.color).getWidth()
+                labelwidth = TextMetrics.getWidth(property, 12)
                 if labelwidth > maxX:
                     maxX = labelwidth
                 self._textLayouts[(token, index+1)] = property
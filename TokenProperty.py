@@ -12,6 +12,8 @@
 
 
 class TokenProperty:
+    __slots__ = ('_name', '_level', '_hash')
+
     """
      * The name of the property.
     """
@@ -22,6 +24,7 @@ class TokenProperty:
     @name.setter
     def name(self, value):
         self._name = value
+        self._hash = hash(value) if value is not None else 0
 
     """
      * The level of the property.
@@ -59,6 +62,7 @@ class TokenProperty:
             name = "Property {0}".format(level)
         self._name = name
         self._level = level
+        self._hash = hash(name)
 
     """
      * Returns the name of the property.
@@ -97,10 +101,7 @@ class TokenProperty:
      * @return a hashcode based on the property name.
     """
     def __hash__(self):
-        if self._name is not None:
-            return hash(self._name)
-        else:
-            return 0
+        return self._hash
 
     """
      * First compares the level of the two properties and if these are equal the property names are compared.
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from NLPInstance import *
+from EdgeTypeFilter import EdgeTypeFilter
+from EdgeLabelFilter import EdgeLabelFilter
+from CompiledEdgeFilter import CompiledEdgeFilter
+from ioFormats.ColumnarCorpus import ColumnarCorpus
+
+"""
+ * Compares an EdgeTypeFilter followed by an EdgeLabelFilter with the CompiledEdgeFilter of both on random diff-like
+ * sentences, and with the mask of the CompiledEdgeFilter over a ColumnarCorpus of the same sentences. All three must
+ * keep the same edges.
+ *
+ * Usage: python3 benchmarks/CompiledEdgeFilterBenchmark.py [--tokens 40] [--sentences 5000]
+"""
+
+_labels = ("SBJ", "OBJ", "NMOD", "PMOD", "P", "A0", "A1", "AM-TMP")
+
+
+def randomInstance(tokens, rnd):
+    instance = NLPInstance()
+    for i in range(0, tokens):
+        instance.addToken().addProperty(name="Word", value="w{0}".format(i))
+    for i in range(1, tokens):
+        instance.addDependency(str(rnd.randrange(tokens)), str(i), rnd.choice(_labels),
+                               rnd.choice(("dep", "role", "dep:Match", "dep:FP", "dep:FN", "role:Match")))
+    return instance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare and benchmark the compiled edge filter.")
+    parser.add_argument("--tokens", type=int, default=40, help="tokens per sentence (default: 40)")
+    parser.add_argument("--sentences", type=int, default=5000, help="number of sentences (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (default: 3)")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(42)
+    instances = [randomInstance(rnd.randint(2, args.tokens), rnd) for _ in range(0, args.sentences)]
+    corpus = ColumnarCorpus(instances)
+    edgeTypeFilter = EdgeTypeFilter("dep")
+    edgeTypeFilter.addAllowedPostfixType("FP")
+    edgeTypeFilter.addAllowedPostfixType("FN")
+    edgeLabelFilter = EdgeLabelFilter("SBJ", "A")
+    compiled = CompiledEdgeFilter(edgeTypeFilter, edgeLabelFilter)
+
+    def sequential():
+        return [edgeLabelFilter.filterEdges(edgeTypeFilter.filterEdges(instance.getEdges())) for instance in instances]
+
+    def single():
+        return [compiled.filterEdges(instance.getEdges()) for instance in instances]
+
+    mask = compiled.mask(corpus)
+    starts = corpus.edgeStarts
+    expected = sequential()
+    for index, (edges, compiledEdges) in enumerate(zip(expected, single())):
+        masked = [edge for edge, allowed in zip(instances[index].getEdges(), mask[starts[index]:starts[index + 1]])
+                  if allowed]
+        if edges != compiledEdges or edges != masked:
+            print("Mismatch on sentence {0}".format(index))
+            return 1
+    print("{0} sentences: same edges with the separate filters, the compiled filter and the mask".format(len(instances)))
+
+    separate = min(timeit.repeat(sequential, number=1, repeat=args.repeat))
+    fused = min(timeit.repeat(single, number=1, repeat=args.repeat))
+    columnar = min(timeit.repeat(lambda: compiled.mask(corpus), number=1, repeat=args.repeat))
+    print("EdgeTypeFilter + EdgeLabelFilter: {0:.3f} s".format(separate))
+    print("CompiledEdgeFilter.filterEdges:   {0:.3f} s ({1:.1f}x)".format(fused, separate / fused))
+    print("CompiledEdgeFilter.mask:          {0:.3f} s ({1:.1f}x, {2} edges)".format(columnar, separate / columnar,
+                                                                                     len(mask)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from NLPInstance import *
+from EdgeNesting import EdgeNesting
+
+"""
+ * Compares EdgeNesting with the pairwise loops DependencyLayout.layoutEdges and SpanLayout.layoutEdges used before on
+ * random graphs (the depths and the crossing pairs must be the same) and times both.
+ *
+ * Usage: python3 benchmarks/EdgeNestingBenchmark.py [--tokens 60] [--edges 300] [--graphs 200]
+"""
+
+
+def calculateDepth(dominates, depth, root):
+    if depth.get(root, 0) > 0:
+        return depth[root]
+    if len(dominates.get(root, ())) == 0:
+        return 0
+    max = 0
+    for children in dominates[root]:
+        current = calculateDepth(dominates, depth, children)
+        if current > max:
+            max = current
+    depth[root] = max + 1
+    return max + 1
+
+
+def pairwiseDependencyNesting(edges):
+    dominates = {}
+    for over in edges:
+        for under in edges:
+            if over != under and (over.covers(under) or over.coversSemi(under) or
+                                  over.coversExactly(under) and over.lexicographicOrder(under) > 0):
+                dominates.setdefault(over, []).append(under)
+    depth = {}
+    for edge in edges:
+        calculateDepth(dominates, depth, edge)
+    depth = {edge: depth.get(edge, 0) for edge in edges}
+    pairs = [(left, right) for left in edges for right in edges
+             if left != right and left.crosses(right) and depth[left] == depth[right]]
+    return depth, pairs
+
+
+def sweepDependencyNesting(edges):
+    depth = EdgeNesting.dependencyDepths(edges)
+    return depth, EdgeNesting.crossingPairs(edges, depth)
+
+
+spanOrders = {"pos": 0, "chunk": 2, "ner": 3, "sense": 4, "role": 5}
+
+
+def pairwiseSpanNesting(edges):
+    dominates = {}
+    for over in edges:
+        for under in edges:
+            orderOver = spanOrders.get(over.getTypePrefix())
+            orderUnder = spanOrders.get(under.getTypePrefix())
+            if orderOver > orderUnder or orderOver == orderUnder and (
+                    over.covers(under) or over.coversSemi(under) or
+                    over.coversExactly(under) and over.lexicographicOrder(under) > 0 or
+                    over.overlaps(under) and over.minIndex < under.minIndex):
+                dominates.setdefault(over, []).append(under)
+    depth = {}
+    for edge in edges:
+        calculateDepth(dominates, depth, edge)
+    return {edge: depth.get(edge, 0) for edge in edges}
+
+
+def sweepSpanNesting(edges):
+    return EdgeNesting.spanDepths(edges, spanOrders.get)
+
+
+"""
+ * Creates a random graph without self loops. Few labels and types are used, so there are many edges that span the same
+ * tokens.
+"""
+def randomEdges(tokens, edges, rnd):
+    instance = NLPInstance()
+    for i in range(0, tokens):
+        instance.addToken()
+    result = set()
+    while len(result) < edges:
+        From = rnd.randrange(tokens)
+        to = rnd.randrange(tokens)
+        if From != to:
+            result.add(Edge(instance.getToken(str(From)), instance.getToken(str(to)), rnd.choice(("A0", "A1", "AM")),
+                            rnd.choice(("dep", "role"))))
+    return list(result)
+
+
+"""
+ * Creates random spans (including single token spans) of the types in spanOrders.
+"""
+def randomSpans(tokens, spans, rnd):
+    instance = NLPInstance()
+    for i in range(0, tokens):
+        instance.addToken()
+    result = []
+    for i in range(0, spans):
+        From = rnd.randrange(tokens)
+        to = min(tokens - 1, From + rnd.choice((0, 0, 1, 2, 5)))
+        result.append(Edge(instance.getToken(str(From)), instance.getToken(str(to)), rnd.choice(("NP", "PER", "B")),
+                           rnd.choice(tuple(spanOrders.keys())), renderType=Edge.RenderType.span))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare and benchmark the edge nesting of the layouts.")
+    parser.add_argument("--tokens", type=int, default=60, help="tokens per graph (default: 60)")
+    parser.add_argument("--edges", type=int, default=300, help="edges per graph (default: 300)")
+    parser.add_argument("--graphs", type=int, default=200, help="number of random graphs to compare (default: 200)")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(42)
+    for i in range(0, args.graphs):
+        tokens = rnd.randint(2, args.tokens)
+        edges = randomEdges(tokens, rnd.randint(0, min(args.edges, tokens * (tokens - 1))), rnd)
+        rnd.shuffle(edges)
+        if pairwiseDependencyNesting(edges) != sweepDependencyNesting(edges):
+            print("Mismatch on graph {0}: {1}".format(i, ", ".join(str(edge) for edge in edges)))
+            return 1
+        spans = randomSpans(tokens, rnd.randint(0, args.edges), rnd)
+        if pairwiseSpanNesting(spans) != sweepSpanNesting(spans):
+            print("Mismatch on spans {0}: {1}".format(i, ", ".join(str(edge) for edge in spans)))
+            return 1
+    print("{0} random graphs: same depths and crossing pairs".format(args.graphs))
+
+    edges = randomEdges(args.tokens, args.edges, rnd)
+    spans = randomSpans(args.tokens, args.edges, rnd)
+    for name, pairwiseNesting, sweepNesting, edges in (("dependencies", pairwiseDependencyNesting,
+                                                        sweepDependencyNesting, edges),
+                                                       ("spans", pairwiseSpanNesting, sweepSpanNesting, spans)):
+        pairwise = min(timeit.repeat(lambda: pairwiseNesting(edges), number=1, repeat=3))
+        sweep = min(timeit.repeat(lambda: sweepNesting(edges), number=1, repeat=3))
+        print("{0}: {1} tokens, {2} edges".format(name, args.tokens, args.edges))
+        print("pairwise: {0:.3f} s".format(pairwise))
+        print("sweep:    {0:.3f} s ({1:.1f}x)".format(sweep, pairwise / sweep))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
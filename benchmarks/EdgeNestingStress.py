@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from NLPInstance import *
+from EdgeNesting import EdgeNesting
+
+"""
+ * Stress test of the depth calculation of the edge layouts (EdgeNesting) with adversarial nesting: a sentence in which
+ * every dependency covers the next one, a chain of spans nested the same way, and as many edges over the same two
+ * tokens (whose depths follow their lexicographic order), so each chain is as deep as the sentence is long. A
+ * recursive depth calculation exceeds the recursion limit on these. A cycle in the lexicographic order must be
+ * reported.
+ *
+ * Usage: python3 benchmarks/EdgeNestingStress.py [--tokens 500]
+"""
+
+
+"""
+ * An edge whose lexicographic order is cyclic (by the label modulo 3, like rock-paper-scissors).
+"""
+class CyclicEdge(Edge):
+
+    def lexicographicOrder(self, edge):
+        difference = (int(self.label) - int(edge.label)) % 3
+        return 0 if difference == 0 else 1 if difference == 1 else -1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress test the depth calculation of EdgeNesting.")
+    parser.add_argument("--tokens", type=int, default=500, help="length of the sentence (default: 500)")
+    args = parser.parse_args(argv)
+
+    instance = NLPInstance()
+    for i in range(0, args.tokens):
+        instance.addToken()
+    first = instance.getToken("0")
+    last = instance.getToken(str(args.tokens - 1))
+    dependencies = [Edge(first, instance.getToken(str(i)), "dep", "dep") for i in range(1, args.tokens)]
+    spans = [Edge(first, instance.getToken(str(i)), "ner", "ner", renderType=Edge.RenderType.span)
+             for i in range(0, args.tokens)]
+    # Zero padded, so the lexicographic order of the labels is their numeric order
+    parallel = [Edge(first, last, "{0:06d}".format(i), "dep") for i in range(0, args.tokens)]
+
+    for name, edges, calculate, expected in (
+            ("nested dependencies", dependencies, EdgeNesting.dependencyDepths, lambda i: i),
+            ("nested spans", spans, lambda edges: EdgeNesting.spanDepths(edges, lambda prefix: 0), lambda i: i),
+            ("dependencies over the same tokens", parallel, EdgeNesting.dependencyDepths,
+             lambda i: len(parallel) - 1 - i)):
+        depths = {}
+
+        def run():
+            depths.update(calculate(edges))
+
+        seconds = timeit.timeit(run, number=1)
+        if any(depths[edge] != expected(i) for i, edge in enumerate(edges)):
+            print("Wrong depths for the {0}".format(name))
+            return 1
+        print("{0} {1}: max. depth {2} in {3:.3f} s".format(len(edges), name, max(depths.values()), seconds))
+
+    # A cycle must be reported instead of looping forever
+    cyclic = [CyclicEdge(first, last, str(i), "dep") for i in range(0, 3)]
+    try:
+        EdgeNesting.dependencyDepths(cyclic)
+    except RuntimeError:
+        print("cycle detected")
+    else:
+        print("cycle NOT detected")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from NLPInstance import *
+
+"""
+ * Microbenchmark of the pairwise edge loops of DependencyLayout.layoutEdges and SpanLayout.layoutEdges (the dominance
+ * and the crossing checks). The loops are run on random sentences once with the Edge predicates and once with the
+ * predicates as they were before the indices were cached (converting the string indices with int() on every call).
+ *
+ * Usage: python3 benchmarks/EdgePredicatesBenchmark.py [--tokens 40] [--edges 60] [--repeat 5]
+"""
+
+
+def legacyMin(edge):
+    return edge.From.index if int(edge.From.index) < int(edge.To.index) else edge.To.index
+
+
+def legacyMax(edge):
+    return edge.From.index if int(edge.From.index) > int(edge.To.index) else edge.To.index
+
+
+def legacyCovers(over, under):
+    return int(legacyMin(over)) < int(legacyMin(under)) <= int(legacyMax(under)) < int(legacyMax(over))
+
+
+def legacyCoversSemi(over, under):
+    return int(legacyMin(over)) < int(legacyMin(under)) and int(legacyMax(over)) == int(legacyMax(under)) or \
+        int(legacyMin(over)) == int(legacyMin(under)) and int(legacyMax(over)) > int(legacyMax(under))
+
+
+def legacyCoversExactly(over, under):
+    return int(legacyMin(under)) == int(legacyMin(over)) <= int(legacyMax(over)) == int(legacyMax(under))
+
+
+def legacyCrosses(left, right):
+    return int(legacyMin(left)) < int(legacyMin(right)) < int(legacyMax(left)) < int(legacyMax(right)) or \
+        int(legacyMin(right)) < int(legacyMin(left)) < int(legacyMax(right)) < int(legacyMax(left))
+
+
+def legacyPrefix(edge):
+    index = edge.type.find(':')
+    return edge.type if index == -1 else edge.type[0:index]
+
+
+def legacyLoops(edges):
+    count = 0
+    for over in edges:
+        for under in edges:
+            if legacyPrefix(over) == legacyPrefix(under) and over != under and (
+                    legacyCovers(over, under) or legacyCoversSemi(over, under) or
+                    legacyCoversExactly(over, under) and over.lexicographicOrder(under) > 0):
+                count += 1
+            if over != under and legacyCrosses(over, under):
+                count += 1
+    return count
+
+
+def cachedLoops(edges):
+    count = 0
+    for over in edges:
+        for under in edges:
+            if over.getTypePrefix() == under.getTypePrefix() and over != under and (
+                    over.covers(under) or over.coversSemi(under) or
+                    over.coversExactly(under) and over.lexicographicOrder(under) > 0):
+                count += 1
+            if over != under and over.crosses(under):
+                count += 1
+    return count
+
+
+"""
+ * Creates a random sentence with the given number of tokens and edges.
+"""
+def randomEdges(tokens, edges, rnd):
+    instance = NLPInstance()
+    for i in range(0, tokens):
+        instance.addToken().addProperty(name="Word", value="w{0}".format(i))
+    result = []
+    for i in range(0, edges):
+        From = str(rnd.randrange(tokens))
+        to = str(rnd.randrange(tokens))
+        result.append(Edge(instance.getToken(From), instance.getToken(to), rnd.choice(("SBJ", "OBJ", "NMOD", "A0")),
+                           rnd.choice(("dep", "role", "dep:FP", "role:FN"))))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pairwise edge loops of the layouts.")
+    parser.add_argument("--tokens", type=int, default=40, help="tokens per sentence (default: 40)")
+    parser.add_argument("--edges", type=int, default=60, help="edges per sentence (default: 60)")
+    parser.add_argument("--sentences", type=int, default=20, help="number of sentences (default: 20)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions (default: 5)")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(42)
+    sentences = [randomEdges(args.tokens, args.edges, rnd) for _ in range(0, args.sentences)]
+    for edges in sentences:
+        assert legacyLoops(edges) == cachedLoops(edges)
+    legacy = min(timeit.repeat(lambda: [legacyLoops(edges) for edges in sentences], number=1, repeat=args.repeat))
+    cached = min(timeit.repeat(lambda: [cachedLoops(edges) for edges in sentences], number=1, repeat=args.repeat))
+    print("{0} sentences, {1} tokens, {2} edges".format(args.sentences, args.tokens, args.edges))
+    print("int() on every call: {0:.3f} s".format(legacy))
+    print("cached indices:      {0:.3f} s ({1:.1f}x)".format(cached, legacy / cached))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from NLPInstance import *
+from EdgeTokenFilter import EdgeTokenFilter
+
+"""
+ * Compares the path mode of EdgeTokenFilter (EdgePaths.pathEdges) with the union of the paths enumerated by
+ * EdgeTokenFilter.calculatePaths on small random graphs, where the enumeration is still feasible, and measures the
+ * path mode on sentences of 100 tokens.
+ *
+ * Usage: python3 benchmarks/EdgeTokenPathBenchmark.py [--tokens 100] [--sentences 1000]
+"""
+
+
+def enumeratedPathEdges(edgeTokenFilter, edges):
+    paths = edgeTokenFilter.calculatePaths(edges)
+    result = set()
+    for From in paths.keys():
+        if From.propertiesContain(substrings={"match"}, wholeWord=True):
+            for to in paths.getTos(From):
+                if to.propertiesContain(substrings={"match"}, wholeWord=True):
+                    for path in paths.getPaths(From, to):
+                        result.update(path)
+    return result
+
+
+"""
+ * Creates a random sentence with a head for every token, a few roles (which close cycles with the dependencies of the
+ * same type prefix only if they have the same type) and some tokens with the word "match".
+"""
+def randomInstance(tokens, roles, rnd):
+    instance = NLPInstance()
+    for i in range(0, tokens):
+        instance.addToken().addProperty(name="Word", value="match" if rnd.random() < 0.1 else "w{0}".format(i))
+    for i in range(1, tokens):
+        instance.addDependency(str(rnd.randrange(i)), str(i), rnd.choice(("SBJ", "OBJ", "NMOD")), "dep")
+    for _ in range(0, roles):
+        instance.addDependency(str(rnd.randrange(tokens)), str(rnd.randrange(tokens)), rnd.choice(("A0", "A1")),
+                               rnd.choice(("role", "dep")))
+    return instance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare and benchmark the path mode of EdgeTokenFilter.")
+    parser.add_argument("--tokens", type=int, default=100, help="tokens per sentence (default: 100)")
+    parser.add_argument("--sentences", type=int, default=1000, help="number of sentences (default: 1000)")
+    parser.add_argument("--checks", type=int, default=300, help="number of small graphs to compare (default: 300)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (default: 3)")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(42)
+    edgeTokenFilter = EdgeTokenFilter("match")
+    edgeTokenFilter.wholeWords = True
+    edgeTokenFilter.usePath = True
+    for number in range(0, args.checks):
+        instance = randomInstance(rnd.randint(2, 7), rnd.randint(0, 4), rnd)
+        edges = instance.getEdges()
+        if set(edgeTokenFilter.filterEdges(edges)) != enumeratedPathEdges(edgeTokenFilter, edges):
+            print("Mismatch on graph {0}".format(number))
+            return 1
+    print("{0} small graphs: same edges as the enumerated paths".format(args.checks))
+
+    instances = [randomInstance(args.tokens, args.tokens // 5, rnd) for _ in range(0, args.sentences)]
+    edges = sum(len(instance.getEdges()) for instance in instances)
+    seconds = min(timeit.repeat(lambda: [edgeTokenFilter.filterEdges(instance.getEdges()) for instance in instances],
+                                number=1, repeat=args.repeat))
+    print("{0} sentences of {1} tokens ({2} edges): {3:.3f} s, {4:.1f} us per sentence".format(
+        len(instances), args.tokens, edges, seconds, 1e6 * seconds / len(instances)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import subprocess
+import sys
+
+"""
+ * Measures the import time and the memory of a fresh interpreter that imports the headless rendering stack (SVGCanvas
+ * and BatchExport) and checks that PyQt4 is not imported by it.
+ *
+ * Usage: python3 benchmarks/HeadlessImport.py [--repeat 5]
+"""
+
+_script = """
+import resource, sys, time
+start = time.perf_counter()
+import SVGCanvas, BatchExport
+seconds = time.perf_counter() - start
+print(seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, int(any(name.startswith("PyQt4") for name in sys.modules)))
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the import of the headless rendering stack.")
+    parser.add_argument("--repeat", type=int, default=5, help="number of fresh interpreters (default: 5)")
+    args = parser.parse_args(argv)
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    results = []
+    for _ in range(0, args.repeat):
+        output = subprocess.check_output([sys.executable, "-c", _script], cwd=root, universal_newlines=True)
+        seconds, memory, qt = output.split()
+        if qt != "0":
+            print("PyQt4 was imported by the headless modules")
+            return 1
+        results.append((float(seconds), int(memory)))
+    print("import SVGCanvas, BatchExport: {0:.3f} s, max. RSS {1} KiB (best of {2})".format(
+        min(seconds for seconds, _ in results), min(memory for _, memory in results), args.repeat))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from NLPInstance import *
+from NLPDiff import NLPDiff
+
+"""
+ * Compares NLPDiff.diff with the diff as it was before the identities were interned (sets of EdgeIdentity objects
+ * and a new Edge for every edge of the result) on random gold/guess pairs. Both must find the same false negatives,
+ * false positives and matches.
+ *
+ * Usage: python3 benchmarks/NLPDiffBenchmark.py [--tokens 40] [--sentences 2000]
+"""
+
+
+def legacyDiff(goldInstance, guessInstance):
+    diff = NLPInstance()
+    diff.renderType = goldInstance.renderType
+    for splitPoint in tuple(goldInstance.splitPoints):
+        diff.splitPoints.append(splitPoint)
+    diff.addTokens(goldInstance.tokens)
+    goldIdentities = {NLPDiff.EdgeIdentity(edge) for edge in goldInstance.getEdges()}
+    guessIdentities = {NLPDiff.EdgeIdentity(edge) for edge in guessInstance.getEdges()}
+    for identities, outcome in ((goldIdentities - guessIdentities, ":FN"), (guessIdentities - goldIdentities, ":FP"),
+                                (goldIdentities & guessIdentities, ":Match")):
+        for edgeid in identities:
+            edge = edgeid.edge
+            diff.addEdge(edge=Edge(From=edge.From, To=edge.To, label=edge.label, note=edge.note, Type=edge.type + outcome,
+                                   renderType=edge.renderType, description=edge.description))
+    return diff
+
+
+def outcomes(diff):
+    return sorted((edge.From.index, edge.To.index, edge.label, edge.type) for edge in diff.getEdges())
+
+
+"""
+ * Creates a random gold sentence with a head for every token and a few roles, and a guess with some of its heads and
+ * labels changed.
+"""
+def randomPair(tokens, rnd):
+    instances = []
+    for _ in range(0, 2):
+        instance = NLPInstance()
+        for i in range(0, tokens):
+            instance.addToken().addProperty(name="Word", value="w{0}".format(i))
+        instances.append(instance)
+    gold, guess = instances
+    for i in range(1, tokens):
+        head = str(rnd.randrange(tokens))
+        label = rnd.choice(("SBJ", "OBJ", "NMOD", "P"))
+        gold.addDependency(head, str(i), label, "dep")
+        if rnd.random() < 0.15:
+            head = str(rnd.randrange(tokens))
+        if rnd.random() < 0.1:
+            label = rnd.choice(("SBJ", "OBJ", "NMOD", "P"))
+        guess.addDependency(head, str(i), label, "dep")
+    for _ in range(0, tokens // 5):
+        pred, arg = str(rnd.randrange(tokens)), str(rnd.randrange(tokens))
+        gold.addDependency(pred, arg, rnd.choice(("A0", "A1")), "role")
+        if rnd.random() < 0.8:
+            guess.addDependency(pred, arg, rnd.choice(("A0", "A1")), "role")
+    return gold, guess
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare and benchmark NLPDiff.diff.")
+    parser.add_argument("--tokens", type=int, default=40, help="tokens per sentence (default: 40)")
+    parser.add_argument("--sentences", type=int, default=2000, help="number of sentence pairs (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (default: 3)")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(42)
+    pairs = [randomPair(rnd.randint(2, args.tokens), rnd) for _ in range(0, args.sentences)]
+    nlpDiff = NLPDiff()
+    for number, (gold, guess) in enumerate(pairs):
+        if outcomes(legacyDiff(gold, guess)) != outcomes(nlpDiff.diff(gold, guess)):
+            print("Mismatch on sentence {0}".format(number))
+            return 1
+    print("{0} sentence pairs: same false negatives, false positives and matches".format(len(pairs)))
+
+    legacy = min(timeit.repeat(lambda: [legacyDiff(gold, guess) for gold, guess in pairs], number=1,
+                               repeat=args.repeat))
+    fast = min(timeit.repeat(lambda: [nlpDiff.diff(gold, guess) for gold, guess in pairs], number=1,
+                             repeat=args.repeat))
+    print("EdgeIdentity sets: {0:.3f} s".format(legacy))
+    print("merge pass:        {0:.3f} s ({1:.1f}x)".format(fast, legacy / fast))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Token import Token
+from TokenFilter import TokenFilter
+
+"""
+ * Compares the token tests of TokenFilter and Token.propertiesContain with the loops over all allowed strings they
+ * used before the PropertyMatcher, on random tokens and random sets of allowed strings (words, substrings and index
+ * ranges), in substring and in whole word mode.
+ *
+ * Usage: python3 benchmarks/PropertyMatcherBenchmark.py [--tokens 20000] [--strings 50]
+"""
+
+
+def legacyAllowsToken(token, allowedStrings, wholeWord):
+    for property in token.getPropertyTypes():
+        prop = token.getProperty(property)
+        for allowed in allowedStrings:
+            if property.name == "Index" and re.match(r"\d+-\d+", allowed):
+                From, to = allowed.split("-")
+                for i in range(int(From), int(to) + 1):
+                    if prop == str(i):
+                        return True
+            elif (wholeWord and prop == allowed) or (not wholeWord and allowed in prop):
+                return True
+    return False
+
+
+def legacyPropertiesContain(token, substrings, wholeWord):
+    for property in token.tokenProperties.values():
+        for substr in substrings:
+            if re.match(r"\d+-\d+$", substr):
+                From, To = substr.split("-")
+                if property.isdigit() and int(From) <= int(property) <= int(To):
+                    return True
+            elif (wholeWord and property == substr) or (not wholeWord and substr in property):
+                return True
+    return False
+
+
+def randomWord(rnd):
+    return "".join(rnd.choice("abcdeilmnorst") for _ in range(0, rnd.randint(1, 9)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare and benchmark the PropertyMatcher.")
+    parser.add_argument("--tokens", type=int, default=20000, help="number of tokens (default: 20000)")
+    parser.add_argument("--strings", type=int, default=50, help="number of allowed strings (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (default: 3)")
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(42)
+    vocabulary = [randomWord(rnd) for _ in range(0, 2000)]
+    tokens = []
+    for i in range(0, args.tokens):
+        token = Token(i % 60)
+        token.addProperty(name="Index", value=str(i % 60))
+        token.addProperty(name="Word", value=rnd.choice(vocabulary))
+        token.addProperty(name="Pos", value=rnd.choice(("NN", "NNS", "VB", "VBD", "JJ", "DT", "IN")))
+        tokens.append(token)
+    allowed = {randomWord(rnd)[:3] for _ in range(0, args.strings)}
+    allowed.update(rnd.choice(vocabulary) for _ in range(0, args.strings // 5))
+    allowed.update("{0}-{1}".format(start, start + rnd.randint(0, 5)) for start in rnd.sample(range(0, 60), 3))
+
+    for wholeWord in (False, True):
+        tokenFilter = TokenFilter()
+        tokenFilter.wholeWord = wholeWord
+        for string in allowed:
+            tokenFilter.addAllowedString(string)
+        matcher = tokenFilter.getMatcher()
+        for token in tokens:
+            if tokenFilter.allowsToken(token, matcher) != legacyAllowsToken(token, allowed, wholeWord) or \
+                    token.propertiesContain(substrings=allowed, wholeWord=wholeWord) != \
+                    legacyPropertiesContain(token, allowed, wholeWord):
+                print("Mismatch on token {0} (whole words: {1})".format(token, wholeWord))
+                return 1
+
+        mode = "whole words" if wholeWord else "substrings "
+        legacy = min(timeit.repeat(lambda: [legacyAllowsToken(token, allowed, wholeWord) for token in tokens],
+                                   number=1, repeat=args.repeat))
+        # The cache of the matcher is cleared before every repetition, so it is filled during the measurement
+        fast = min(timeit.repeat(lambda: [tokenFilter.allowsToken(token, matcher) for token in tokens],
+                                 setup=matcher._cachedMatch.cache_clear, number=1, repeat=args.repeat))
+        print("{0}: {1} tokens, {2} allowed strings: loops {3:.3f} s, matcher {4:.3f} s ({5:.1f}x)".format(
+            mode, len(tokens), len(allowed), legacy, fast, legacy / fast))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+from array import array
+
+from NLPInstance import *
+from ioFormats.ParallelCorpusLoader import ParallelCorpusLoader
+
+"""
+ * A ColumnarCorpus holds a whole corpus in memory in a compact, column oriented form. Instead of one Token object with a
+ * property dictionary per word and one Edge object per edge, the corpus keeps a few flat arrays:
+ * <ul>
+ * <li>one array of string ids per token property (plus one for the token indices), all tokens of the corpus in order,
+ *     -1 where a token does not have the property;</li>
+ * <li>parallel arrays for the edges: from and to (positions of the tokens in their sentence), label, type, note and
+ *     description (string ids, -1 for None) and the render type;</li>
+ * <li>the offsets of the tokens, edges and split points of every sentence in these arrays.</li>
+ * </ul>
+ * All strings are interned in one string table, so a label or a PoS tag is stored only once for the whole corpus.
+ * NLPInstance objects (with their Token and Edge objects) are only created on demand when an instance is requested by
+ * its index, e.g. to render it. This makes it possible to keep both the gold and the guess corpus in memory for corpus
+ * wide comparisons.
+"""
+
+
+class ColumnarCorpus:
+
+    _edgeRenderTypes = (Edge.RenderType.dependency, Edge.RenderType.span, None)
+    _instanceRenderTypes = (NLPInstance.RenderType.single, NLPInstance.RenderType.alignment, None)
+
+    """
+     * The string table: the string with the id i is at position i.
+    """
+    @property
+    def strings(self):
+        return self._strings
+
+    """
+     * The token properties of the corpus in the order of their columns.
+    """
+    @property
+    def properties(self):
+        return tuple(self._properties)
+
+    """
+     * The string ids of the types of all edges of the corpus.
+    """
+    @property
+    def edgeTypes(self):
+        return self._edgeType
+
+    """
+     * The string ids of the labels of all edges of the corpus.
+    """
+    @property
+    def edgeLabels(self):
+        return self._edgeLabel
+
+    """
+     * The offsets of the edges of every sentence in the edge columns: the edges of the sentence i are at the positions
+     * edgeStarts[i] to edgeStarts[i + 1] (exclusive).
+    """
+    @property
+    def edgeStarts(self):
+        return self._edgeStarts
+
+    """
+     * Creates an empty corpus.
+     *
+     * @param instances the instances to add to the corpus (optional).
+    """
+    def __init__(self, instances=None):
+        self._strings = []
+        self._stringIds = {}
+        self._properties = []
+        self._propertyIds = {}
+        self._propertyColumns = []
+        self._tokenIndices = array('i')
+        self._edgeFrom = array('I')
+        self._edgeTo = array('I')
+        self._edgeLabel = array('i')
+        self._edgeType = array('i')
+        self._edgeNote = array('i')
+        self._edgeDescription = array('i')
+        self._edgeRenderType = array('b')
+        self._splitPoints = array('i')
+        self._renderTypes = array('b')
+        self._tokenStarts = array('q', [0])
+        self._edgeStarts = array('q', [0])
+        self._splitStarts = array('q', [0])
+        if instances is not None:
+            self.extend(instances)
+
+    """
+     * Loads a corpus file into a new ColumnarCorpus. The file is parsed by a ParallelCorpusLoader and its packed chunks
+     * are added directly, so no NLPInstance objects are kept while loading.
+     *
+     * @param path       the corpus file.
+     * @param factory    the processor that creates an NLPInstance from the rows of a sentence.
+     * @param workers    the number of worker processes, None means the number of CPUs.
+     * @param encoding   the encoding of the file.
+     * @param renderType the render type for the instances.
+     * @return the loaded corpus.
+    """
+    @staticmethod
+    def load(path, factory, workers=None, encoding="utf-8", renderType=NLPInstance.RenderType.single):
+        corpus = ColumnarCorpus()
+        loader = ParallelCorpusLoader(factory, workers=workers, encoding=encoding, renderType=renderType)
+        for packed in loader.iterPacked(path):
+            corpus.extendPacked(packed)
+        return corpus
+
+    """
+     * Returns the id of the given string and adds it to the string table if needed.
+     *
+     * @param string the string (or None).
+     * @return the id of the string, -1 for None.
+    """
+    def intern(self, string):
+        if string is None:
+            return -1
+        stringId = self._stringIds.get(string)
+        if stringId is None:
+            stringId = len(self._strings)
+            self._strings.append(string)
+            self._stringIds[string] = stringId
+        return stringId
+
+    """
+     * Returns the string with the given id.
+     *
+     * @param stringId the id of the string.
+     * @return the string, None for -1.
+    """
+    def getString(self, stringId):
+        if stringId < 0:
+            return None
+        return self._strings[stringId]
+
+    """
+     * Returns the column of the given property, adds a new column if the property was not seen before.
+    """
+    def _getColumn(self, name, level):
+        propertyId = self._propertyIds.get(name)
+        if propertyId is None:
+            propertyId = len(self._properties)
+            self._properties.append(TokenProperty(name, level))
+            self._propertyIds[name] = propertyId
+            self._propertyColumns.append(array('i', [-1]) * len(self._tokenIndices))
+        return propertyId
+
+    """
+     * Adds a sentence given by its render type and its tokens and edges in packed form.
+    """
+    def _add(self, renderType, splitPoints, tokens, edges):
+        intern = self.intern
+        columns = self._propertyColumns
+        for index, values in tokens:
+            position = len(self._tokenIndices)
+            self._tokenIndices.append(intern(index))
+            for column in columns:
+                column.append(-1)
+            for propertyId, value in values:
+                columns[propertyId][position] = intern(value)
+        for From, to, label, type, note, edgeRenderType, description in edges:
+            self._edgeFrom.append(From)
+            self._edgeTo.append(to)
+            self._edgeLabel.append(intern(label))
+            self._edgeType.append(intern(type))
+            self._edgeNote.append(intern(note))
+            self._edgeDescription.append(intern(description))
+            self._edgeRenderType.append(ColumnarCorpus._edgeRenderTypes.index(edgeRenderType))
+        self._splitPoints.extend(splitPoints)
+        self._renderTypes.append(ColumnarCorpus._instanceRenderTypes.index(renderType))
+        self._tokenStarts.append(len(self._tokenIndices))
+        self._edgeStarts.append(len(self._edgeFrom))
+        self._splitStarts.append(len(self._splitPoints))
+
+    """
+     * Adds an instance to the end of the corpus. The instance itself is not kept.
+     *
+     * @param instance the instance to add.
+    """
+    def append(self, instance):
+        positions = {}
+        tokens = []
+        for position, token in enumerate(instance.tokens):
+            positions[token] = position
+            tokens.append((token.index, [(self._getColumn(property.name, property.level), value)
+                                         for property, value in token.tokenProperties.items()]))
+        edges = [(positions[edge.From], positions[edge.To], edge.label, edge.type, edge.note, edge.renderType,
+                  edge.description) for edge in instance.getEdges()]
+        self._add(instance.renderType, instance.splitPoints, tokens, edges)
+
+    """
+     * Adds the given instances to the end of the corpus.
+     *
+     * @param instances the instances to add.
+    """
+    def extend(self, instances):
+        for instance in instances:
+            self.append(instance)
+
+    """
+     * Adds instances in the packed form of ioFormats.ParallelCorpusLoader.packInstances to the end of the corpus.
+     *
+     * @param packed a (property table, packed instances) pair.
+    """
+    def extendPacked(self, packed):
+        propertyIds = [self._getColumn(name, level) for name, level in packed[0]]
+        for alignment, splitPoints, packedTokens, packedEdges in packed[1]:
+            tokens = [(index, [(propertyIds[values[i]], values[i + 1]) for i in range(0, len(values), 2)])
+                      for index, values in packedTokens]
+            edges = [(From, to, label, type, note, Edge.RenderType.span if span else Edge.RenderType.dependency,
+                      description) for From, to, label, type, note, span, description in packedEdges]
+            if alignment:
+                renderType = NLPInstance.RenderType.alignment
+            else:
+                renderType = NLPInstance.RenderType.single
+            self._add(renderType, splitPoints, tokens, edges)
+
+    """
+     * Returns the number of sentences in the corpus.
+     *
+     * @return the number of sentences.
+    """
+    def __len__(self):
+        return len(self._renderTypes)
+
+    """
+     * Returns the number of tokens of the sentence with the given index without creating the instance.
+     *
+     * @param index the index of the sentence.
+     * @return the number of tokens of the sentence.
+    """
+    def getTokenCount(self, index):
+        return self._tokenStarts[index + 1] - self._tokenStarts[index]
+
+    """
+     * Returns the number of edges of the sentence with the given index without creating the instance.
+     *
+     * @param index the index of the sentence.
+     * @return the number of edges of the sentence.
+    """
+    def getEdgeCount(self, index):
+        return self._edgeStarts[index + 1] - self._edgeStarts[index]
+
+    """
+     * Returns the value of a token property without creating the instance.
+     *
+     * @param index    the index of the sentence.
+     * @param position the position of the token in the sentence.
+     * @param property the property (or its name).
+     * @return the value of the property or None if the token does not have it.
+    """
+    def getProperty(self, index, position, property):
+        propertyId = self._propertyIds.get(str(property))
+        if propertyId is None:
+            return None
+        return self.getString(self._propertyColumns[propertyId][self._tokenStarts[index] + position])
+
+    """
+     * Returns the edges of a sentence as tuples of strings without creating the instance. Tokens are given by their
+     * index (as in Token.index).
+     *
+     * @param index the index of the sentence.
+     * @return a list of (from index, to index, label, type, render type) tuples.
+    """
+    def getEdgeTuples(self, index):
+        strings = self._strings
+        tokenIndices = self._tokenIndices
+        tokenStart = self._tokenStarts[index]
+        result = []
+        for e in range(self._edgeStarts[index], self._edgeStarts[index + 1]):
+            label = self._edgeLabel[e]
+            type = self._edgeType[e]
+            result.append((strings[tokenIndices[tokenStart + self._edgeFrom[e]]],
+                           strings[tokenIndices[tokenStart + self._edgeTo[e]]],
+                           strings[label] if label >= 0 else None, strings[type] if type >= 0 else None,
+                           ColumnarCorpus._edgeRenderTypes[self._edgeRenderType[e]]))
+        return result
+
+    """
+     * Creates the instance with the given index (including its Token and Edge objects).
+     *
+     * @param index the index of the instance.
+     * @return the NLPInstance at the given index.
+    """
+    def __getitem__(self, index):
+        return self.getInstance(index)
+
+    """
+     * Creates the instance with the given index (including its Token and Edge objects).
+     *
+     * @param index    the index of the instance.
+     * @param edgeMask a mask over all edges of the corpus (see CompiledEdgeFilter.mask), only the edges with a non-zero
+     *                 entry are created. None creates all edges.
+     * @return the NLPInstance at the given index.
+    """
+    def getInstance(self, index, edgeMask=None):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("instance index out of range")
+        getString = self.getString
+        properties = self._properties
+        columns = self._propertyColumns
+        tokens = []
+        for position in range(self._tokenStarts[index], self._tokenStarts[index + 1]):
+            token = Token(getString(self._tokenIndices[position]))
+            tokenProperties = token.tokenProperties
+            for propertyId, column in enumerate(columns):
+                value = column[position]
+                if value >= 0:
+                    tokenProperties[properties[propertyId]] = self._strings[value]
+            tokens.append(token)
+        edges = []
+        for e in range(self._edgeStarts[index], self._edgeStarts[index + 1]):
+            if edgeMask is not None and not edgeMask[e]:
+                continue
+            edges.append(Edge(tokens[self._edgeFrom[e]], tokens[self._edgeTo[e]], getString(self._edgeLabel[e]),
+                              getString(self._edgeType[e]), note=getString(self._edgeNote[e]),
+                              renderType=ColumnarCorpus._edgeRenderTypes[self._edgeRenderType[e]],
+                              description=getString(self._edgeDescription[e])))
+        splitPoints = self._splitPoints[self._splitStarts[index]:self._splitStarts[index + 1]]
+        return NLPInstance(tokens=tokens, edges=edges,
+                           renderType=ColumnarCorpus._instanceRenderTypes[self._renderTypes[index]],
+                           splitPoints=splitPoints)
+
+    def __iter__(self):
+        for index in range(0, len(self)):
+            yield self[index]
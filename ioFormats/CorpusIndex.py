@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import argparse
+import fnmatch
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+"""
+ * A CorpusIndex stores the byte offsets and the token counts of the sentences of a corpus file in a blank line separated
+ * format. The index is persisted in a binary sidecar file next to the corpus (see CorpusIndex.sidecar) so that a large
+ * corpus only has to be scanned the first time it is opened. The sidecar is keyed by the size and the modification time
+ * of the corpus and is rebuilt if they do not match (or if its checksum is wrong).
+ *
+ * The layout of the sidecar file (all values are little endian):
+ * <ul>
+ * <li>header: magic (8 bytes), version (uint32), checksum (uint32), corpus size (uint64), corpus mtime in ns (int64),
+ *     number of sentences (uint64)</li>
+ * <li>the start offsets of the sentences (int64 each)</li>
+ * <li>the end offsets of the sentences (int64 each)</li>
+ * <li>the token counts of the sentences (uint32 each)</li>
+ * </ul>
+ * The checksum is the CRC32 of everything after the header. The sidecar is memory-mapped when it is loaded, the offset
+ * arrays are memoryviews of the mapping.
+"""
+
+
+class CorpusIndex:
+
+    """
+     * The magic bytes at the beginning of every sidecar file.
+    """
+    MAGIC = b"WWIDX\x00\x00\x00"
+
+    """
+     * The version of the sidecar format.
+    """
+    VERSION = 1
+
+    """
+     * The extension appended to the name of the corpus file to get the name of the sidecar file.
+    """
+    EXTENSION = ".wwidx"
+
+    _header = struct.Struct("<8sIIQqQ")
+
+    """
+     * The start offsets of the sentences.
+    """
+    @property
+    def starts(self):
+        return self._starts
+
+    """
+     * The end offsets of the sentences (exclusive).
+    """
+    @property
+    def ends(self):
+        return self._ends
+
+    """
+     * The number of tokens (non-blank rows) of each sentence.
+    """
+    @property
+    def tokenCounts(self):
+        return self._tokenCounts
+
+    """
+     * The size of the corpus file the index was built for.
+    """
+    @property
+    def size(self):
+        return self._size
+
+    """
+     * The modification time (in nanoseconds) of the corpus file the index was built for.
+    """
+    @property
+    def mtime(self):
+        return self._mtime
+
+    """
+     * Creates a new index from the given arrays.
+     *
+     * @param starts      the start offsets of the sentences.
+     * @param ends        the end offsets of the sentences.
+     * @param tokenCounts the token counts of the sentences.
+     * @param size        the size of the indexed file.
+     * @param mtime       the modification time of the indexed file in nanoseconds.
+     * @param mapping     the memory map that backs the arrays (if any).
+    """
+    def __init__(self, starts, ends, tokenCounts, size, mtime, mapping=None):
+        self._starts = starts
+        self._ends = ends
+        self._tokenCounts = tokenCounts
+        self._size = size
+        self._mtime = mtime
+        self._mapping = mapping
+
+    """
+     * Returns the number of sentences in the index.
+     *
+     * @return the number of sentences.
+    """
+    def __len__(self):
+        return len(self._starts)
+
+    """
+     * Returns the name of the sidecar file of the given corpus file.
+     *
+     * @param path the corpus file.
+     * @return the name of the sidecar file.
+    """
+    @staticmethod
+    def sidecar(path):
+        return path + CorpusIndex.EXTENSION
+
+    """
+     * Scans a corpus file and creates its index. Sentences are separated by (one or more) lines that contain only
+     * white-space characters.
+     *
+     * @param path the corpus file to scan.
+     * @return the index of the file.
+    """
+    @staticmethod
+    def build(path):
+        stat = os.stat(path)
+        starts = array('q')
+        ends = array('q')
+        tokenCounts = array('I')
+        offset = 0
+        start = -1
+        tokens = 0
+        with open(path, 'rb') as file:
+            for line in file:
+                if line.isspace():
+                    if start != -1:
+                        starts.append(start)
+                        ends.append(offset)
+                        tokenCounts.append(tokens)
+                        start = -1
+                else:
+                    if start == -1:
+                        start = offset
+                        tokens = 0
+                    tokens += 1
+                offset += len(line)
+        if start != -1:
+            starts.append(start)
+            ends.append(offset)
+            tokenCounts.append(tokens)
+        return CorpusIndex(starts, ends, tokenCounts, stat.st_size, stat.st_mtime_ns)
+
+    """
+     * Writes the index to the given sidecar file. The file is written to a temporary file first which is then renamed,
+     * so readers never see a half-written index.
+     *
+     * @param sidecar the file to write the index to.
+    """
+    def save(self, sidecar):
+        payload = bytes(memoryview(self._starts).cast('B')) + bytes(memoryview(self._ends).cast('B')) + \
+            bytes(memoryview(self._tokenCounts).cast('B'))
+        header = CorpusIndex._header.pack(CorpusIndex.MAGIC, CorpusIndex.VERSION, zlib.crc32(payload), self._size,
+                                          self._mtime, len(self._starts))
+        tmp = sidecar + ".tmp"
+        with open(tmp, 'wb') as file:
+            file.write(header)
+            file.write(payload)
+        os.replace(tmp, sidecar)
+
+    """
+     * Loads the index from a sidecar file if it matches the given size and modification time.
+     *
+     * @param sidecar the sidecar file.
+     * @param size    the size of the corpus file.
+     * @param mtime   the modification time of the corpus file in nanoseconds.
+     * @return the loaded index or None if the sidecar is missing, outdated or corrupt.
+    """
+    @staticmethod
+    def load(sidecar, size, mtime):
+        try:
+            with open(sidecar, 'rb') as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # ValueError: empty file
+            return None
+        headerSize = CorpusIndex._header.size
+        if len(mapping) < headerSize:
+            mapping.close()
+            return None
+        magic, version, checksum, indexedSize, indexedMtime, count = CorpusIndex._header.unpack_from(mapping)
+        if magic != CorpusIndex.MAGIC or version != CorpusIndex.VERSION or indexedSize != size or \
+                indexedMtime != mtime or len(mapping) != headerSize + 20 * count:
+            mapping.close()
+            return None
+        view = memoryview(mapping)
+        if zlib.crc32(view[headerSize:]) != checksum:
+            view.release()
+            mapping.close()
+            return None
+        starts = view[headerSize:headerSize + 8 * count].cast('q')
+        ends = view[headerSize + 8 * count:headerSize + 16 * count].cast('q')
+        tokenCounts = view[headerSize + 16 * count:].cast('I')
+        return CorpusIndex(starts, ends, tokenCounts, size, mtime, mapping)
+
+    """
+     * Returns the index of the given corpus file. The sidecar file is used if it is up to date, otherwise the corpus is
+     * scanned and the sidecar is (re)written. If the sidecar cannot be written (e.g. the directory is read-only) the
+     * index is only kept in memory.
+     *
+     * @param path    the corpus file.
+     * @param rebuild if true the sidecar is rebuilt even if it is up to date.
+     * @return the index of the corpus file.
+    """
+    @staticmethod
+    def open(path, rebuild=False):
+        sidecar = CorpusIndex.sidecar(path)
+        stat = os.stat(path)
+        if not rebuild:
+            index = CorpusIndex.load(sidecar, stat.st_size, stat.st_mtime_ns)
+            if index is not None:
+                return index
+        index = CorpusIndex.build(path)
+        try:
+            index.save(sidecar)
+        except OSError:
+            pass
+        return index
+
+
+"""
+ * Prebuilds the sidecar indices of the corpora in the given directories.
+"""
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prebuild the sentence offset indices of corpus files.")
+    parser.add_argument("directories", nargs="+", help="directories containing corpus files")
+    parser.add_argument("--pattern", default="*", help="only index the files matching this pattern (default: *)")
+    parser.add_argument("--recursive", action="store_true", help="also index the files in subdirectories")
+    parser.add_argument("--force", action="store_true", help="rebuild the indices even if they are up to date")
+    args = parser.parse_args(argv)
+
+    for directory in args.directories:
+        for root, dirs, files in os.walk(directory):
+            for name in sorted(files):
+                if name.endswith(CorpusIndex.EXTENSION) or name.endswith(CorpusIndex.EXTENSION + ".tmp") or \
+                        not fnmatch.fnmatch(name, args.pattern):
+                    continue
+                path = os.path.join(root, name)
+                index = CorpusIndex.open(path, rebuild=args.force)
+                print("{0}: {1} sentences".format(path, len(index)))
+            if not args.recursive:
+                break
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
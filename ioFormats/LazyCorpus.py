@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import mmap
+
+from NLPInstance import NLPInstance
+from ioFormats.CorpusIndex import CorpusIndex
+from ioFormats.MappedRows import iterMappedRows
+
+"""
+ * A LazyCorpus is a read-only list of NLPInstance objects that is backed by a file in a blank line separated format
+ * (such as the CoNLL or the Malt-TAB formats). When the corpus is opened the file is scanned once to find the byte
+ * offsets of the sentences, or the offsets are loaded from the sidecar index of the file (see ioFormats.CorpusIndex).
+ * The file is memory-mapped and a sentence is only converted by the factory (a TabProcessor, see ioFormats.TabProcessor)
+ * when it is requested by its index. The factory gets the rows as MappedRow objects (see ioFormats.MappedRows) that
+ * only decode the columns it reads. Hence opening a corpus is proportional to the file size (or constant if the sidecar
+ * is up to date) and the memory used is proportional to the number of sentences viewed, and not to the size of the
+ * corpus.
+"""
+
+
+class LazyCorpus:
+
+    """
+     * The file the corpus is read from.
+    """
+    @property
+    def path(self):
+        return self._path
+
+    """
+     * The processor that creates the NLPInstance objects from the rows of a sentence.
+    """
+    @property
+    def factory(self):
+        return self._factory
+
+    """
+     * The sentence offset index of the file.
+    """
+    @property
+    def index(self):
+        return self._index
+
+    """
+     * The render type that is set for every created instance.
+    """
+    @property
+    def renderType(self):
+        return self._renderType
+
+    @renderType.setter
+    def renderType(self, value):
+        self._renderType = value
+
+    """
+     * Creates a new LazyCorpus and indexes the sentence boundaries of the given file.
+     *
+     * @param path       the file to read the corpus from.
+     * @param factory    the processor which creates an NLPInstance from the rows of a sentence.
+     * @param encoding   the encoding of the file.
+     * @param renderType the render type for the created instances.
+    """
+    def __init__(self, path, factory, encoding="utf-8", renderType=NLPInstance.RenderType.single):
+        self._path = path
+        self._factory = factory
+        self._encoding = encoding
+        self._renderType = renderType
+        self._index = CorpusIndex.open(path)
+        self._mapping = None
+        if self._index.size > 0:
+            with open(path, 'rb') as file:
+                self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    """
+     * Returns the rows (stripped lines) of the sentence with the given index. Reading the rows does not change the
+     * mapping, so it is safe to call from several threads.
+     *
+     * @param index the index of the sentence.
+     * @return the list of rows of the sentence.
+    """
+    def getRows(self, index):
+        return list(iterMappedRows(self._mapping, self._index.starts[index], self._index.ends[index], self._encoding))
+
+    """
+     * Returns the number of tokens of the sentence with the given index without reading the sentence.
+     *
+     * @param index the index of the sentence.
+     * @return the number of rows of the sentence.
+    """
+    def getTokenCount(self, index):
+        return self._index.tokenCounts[index]
+
+    """
+     * Reads and creates the instance with the given index.
+     *
+     * @param index the index of the instance.
+     * @return the NLPInstance at the given index.
+    """
+    def __getitem__(self, index):
+        instance = self._factory.create(self.getRows(index))
+        instance.renderType = self._renderType
+        return instance
+
+    """
+     * Returns the number of sentences in the corpus.
+     *
+     * @return the number of sentences in the file.
+    """
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        for index in range(0, len(self._index)):
+            yield self[index]
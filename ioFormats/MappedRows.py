@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+"""
+ * Undecoded access to the rows of memory-mapped corpus files. A MappedRow holds the bytes of one (stripped) line of the
+ * file. It behaves like the string rows the TabProcessor classes expect (strip(), split() and indexing), but splitting
+ * it gives a MappedColumns object that decodes a column only when it is accessed. Hence the columns that a processor
+ * never reads (such as PFeat or PLemma in bulk evaluation runs) are never turned into strings. The lines are copied out
+ * of the mapping, so the mapping can be closed while the rows are still in use.
+"""
+
+
+class MappedColumns:
+    __slots__ = ('_fields', '_decoded', '_encoding')
+
+    """
+     * Creates the columns of a row.
+     *
+     * @param fields   the undecoded columns.
+     * @param encoding the encoding of the file.
+    """
+    def __init__(self, fields, encoding):
+        self._fields = fields
+        self._decoded = [None] * len(fields)
+        self._encoding = encoding
+
+    """
+     * Returns (and decodes if needed) the column with the given index.
+     *
+     * @param index the index of the column (or a slice).
+     * @return the value of the column as a string.
+    """
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._fields)))]
+        value = self._decoded[index]
+        if value is None:
+            value = self._fields[index].decode(self._encoding)
+            self._decoded[index] = value
+        return value
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __iter__(self):
+        for index in range(0, len(self._fields)):
+            yield self[index]
+
+
+class MappedRow:
+    __slots__ = ('_line', '_encoding')
+
+    """
+     * Creates a new row.
+     *
+     * @param line     the bytes of the (stripped) line.
+     * @param encoding the encoding of the file.
+    """
+    def __init__(self, line, encoding="utf-8"):
+        self._line = line
+        self._encoding = encoding
+
+    """
+     * Rows are stripped when they are created.
+     *
+     * @return this row.
+    """
+    def strip(self):
+        return self
+
+    """
+     * Splits the row into columns without decoding them.
+     *
+     * @param sep the separator of the columns or None to split at runs of white-space.
+     * @return the columns of the row.
+    """
+    def split(self, sep=None):
+        if sep is not None:
+            sep = sep.encode(self._encoding)
+        return MappedColumns(self._line.split(sep), self._encoding)
+
+    """
+     * Decodes the whole row.
+     *
+     * @return the row as a string.
+    """
+    def __str__(self):
+        return self._line.decode(self._encoding)
+
+    def __getitem__(self, index):
+        return str(self)[index]
+
+    def __len__(self):
+        return len(str(self))
+
+
+"""
+ * Iterates over the lines of a buffer (usually an mmap of a corpus file) between the given offsets.
+ *
+ * @param buffer   the buffer to read.
+ * @param start    the offset to start at.
+ * @param end      the offset to stop at (exclusive) or None to read until the end of the buffer.
+ * @param encoding the encoding of the buffer.
+ * @return a generator of MappedRow objects for non-blank lines and None for blank lines.
+"""
+def iterMappedRows(buffer, start=0, end=None, encoding="utf-8"):
+    if end is None:
+        end = len(buffer)
+    pos = start
+    while pos < end:
+        newline = buffer.find(b"\n", pos, end)
+        if newline == -1:
+            newline = end
+        line = buffer[pos:newline].strip()
+        if line:
+            yield MappedRow(line, encoding)
+        else:
+            yield None
+        pos = newline + 1
+
+
+"""
+ * Iterates over the sentences (blank line separated blocks of rows) of a buffer between the given offsets.
+ *
+ * @param buffer   the buffer to read.
+ * @param start    the offset to start at.
+ * @param end      the offset to stop at (exclusive) or None to read until the end of the buffer.
+ * @param encoding the encoding of the buffer.
+ * @return a generator of lists of MappedRow objects.
+"""
+def iterMappedSentences(buffer, start=0, end=None, encoding="utf-8"):
+    rows = []
+    for row in iterMappedRows(buffer, start, end, encoding):
+        if row is None:
+            if len(rows) > 0:
+                yield rows
+                rows = []
+        else:
+            rows.append(row)
+    if len(rows) > 0:
+        yield rows
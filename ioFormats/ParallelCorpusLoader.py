@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from NLPInstance import *
+from ioFormats.CorpusIndex import CorpusIndex
+from ioFormats.MappedRows import iterMappedSentences
+
+"""
+ * A ParallelCorpusLoader loads a whole corpus file using several processes. The file is split at sentence boundaries
+ * (using its CorpusIndex) into chunks of sentences, the chunks are parsed by the processor (e.g. CoNLL2009) in a pool of
+ * worker processes and the resulting NLPInstance objects are returned in their original order.
+ *
+ * Pickling NLPInstance objects is slower than parsing them (every Token, TokenProperty and Edge is a separate object),
+ * so the workers send their chunks back in a compact form (see packInstances) that is turned back into instances by
+ * unpackInstances.
+"""
+
+
+class ParallelCorpusLoader:
+
+    """
+     * The processor that creates the NLPInstance objects from the rows of a sentence.
+    """
+    @property
+    def factory(self):
+        return self._factory
+
+    @factory.setter
+    def factory(self, value):
+        self._factory = value
+
+    """
+     * The number of worker processes.
+    """
+    @property
+    def workers(self):
+        return self._workers
+
+    @workers.setter
+    def workers(self, value):
+        self._workers = value
+
+    """
+     * The number of sentences that are parsed by one task of a worker.
+    """
+    @property
+    def chunkSize(self):
+        return self._chunkSize
+
+    @chunkSize.setter
+    def chunkSize(self, value):
+        self._chunkSize = value
+
+    """
+     * Creates a new ParallelCorpusLoader.
+     *
+     * @param factory    the processor that creates an NLPInstance from the rows of a sentence. It has to be picklable
+     *                   (all processors in ioFormats.TabProcessor are).
+     * @param workers    the number of worker processes, None means the number of CPUs.
+     * @param chunkSize  the number of sentences in one chunk.
+     * @param encoding   the encoding of the files.
+     * @param renderType the render type for the created instances.
+    """
+    def __init__(self, factory, workers=None, chunkSize=1000, encoding="utf-8",
+                 renderType=NLPInstance.RenderType.single):
+        self._factory = factory
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._chunkSize = chunkSize
+        self._encoding = encoding
+        self._renderType = renderType
+
+    """
+     * Splits the given corpus file into chunks of sentences.
+     *
+     * @param path the corpus file.
+     * @return a list of (start offset, end offset) pairs, one for each chunk.
+    """
+    def chunks(self, path):
+        index = CorpusIndex.open(path)
+        result = []
+        for first in range(0, len(index), self._chunkSize):
+            last = min(first + self._chunkSize, len(index)) - 1
+            result.append((index.starts[first], index.ends[last]))
+        return result
+
+    """
+     * Parses the given file chunk by chunk in their original order and returns the chunks in packed form (see
+     * packInstances).
+     *
+     * @param path the corpus file.
+     * @return a generator of packed chunks.
+    """
+    def iterPacked(self, path):
+        chunks = self.chunks(path)
+        if self._workers <= 1 or len(chunks) <= 1:
+            for start, end in chunks:
+                yield parseChunk(path, self._factory, start, end, self._encoding, self._renderType)
+            return
+        with ProcessPoolExecutor(max_workers=min(self._workers, len(chunks))) as executor:
+            n = len(chunks)
+            yield from executor.map(parseChunk, [path] * n, [self._factory] * n, [start for start, _ in chunks],
+                                    [end for _, end in chunks], [self._encoding] * n, [self._renderType] * n)
+
+    """
+     * Loads the instances of the given file chunk by chunk in their original order.
+     *
+     * @param path the corpus file.
+     * @return a generator of NLPInstance objects.
+    """
+    def iterLoad(self, path):
+        for packed in self.iterPacked(path):
+            yield from unpackInstances(packed)
+
+    """
+     * Loads all instances of the given file.
+     *
+     * @param path the corpus file.
+     * @return the list of NLPInstance objects in the order of the file.
+    """
+    def load(self, path):
+        return list(self.iterLoad(path))
+
+
+"""
+ * Parses the sentences between two offsets of a corpus file. This is the task the worker processes run.
+ *
+ * @param path       the corpus file.
+ * @param factory    the processor that creates the instances.
+ * @param start      the offset of the first sentence of the chunk.
+ * @param end        the offset after the last sentence of the chunk.
+ * @param encoding   the encoding of the file.
+ * @param renderType the render type for the created instances.
+ * @return the NLPInstance objects of the chunk in packed form.
+"""
+def parseChunk(path, factory, start, end, encoding, renderType):
+    result = []
+    with open(path, 'rb') as file:
+        # An empty file can not be mapped
+        if start < end and os.fstat(file.fileno()).st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                for rows in iterMappedSentences(mapping, start, end, encoding):
+                    instance = factory.create(rows)
+                    instance.renderType = renderType
+                    result.append(instance)
+    return packInstances(result)
+
+
+"""
+ * Packs a list of instances into a compact form made of tuples, lists and strings only. Token properties are replaced
+ * by their index in a property table shared by all instances, and edges refer to their tokens by position.
+ *
+ * @param instances the instances to pack.
+ * @return a (property table, packed instances) pair.
+"""
+def packInstances(instances):
+    propertyIds = {}
+    properties = []
+    packed = []
+    for instance in instances:
+        tokens = instance.tokens
+        positions = {}
+        packedTokens = []
+        for position, token in enumerate(tokens):
+            positions[token] = position
+            values = []
+            for property, value in token.tokenProperties.items():
+                propertyId = propertyIds.get(property)
+                if propertyId is None:
+                    propertyId = len(properties)
+                    propertyIds[property] = propertyId
+                    properties.append((property.name, property.level))
+                values.append(propertyId)
+                values.append(value)
+            packedTokens.append((token.index, values))
+        packedEdges = [(positions[edge.From], positions[edge.To], edge.label, edge.type, edge.note,
+                        edge.renderType == Edge.RenderType.span, edge.description) for edge in instance.getEdges()]
+        packed.append((instance.renderType == NLPInstance.RenderType.alignment, instance.splitPoints, packedTokens,
+                       packedEdges))
+    return properties, packed
+
+
+"""
+ * Creates the instances from their packed form.
+ *
+ * @param packed a (property table, packed instances) pair created by packInstances.
+ * @return the list of NLPInstance objects.
+"""
+def unpackInstances(packed):
+    properties = [TokenProperty(name, level) for name, level in packed[0]]
+    result = []
+    for alignment, splitPoints, packedTokens, packedEdges in packed[1]:
+        tokens = []
+        for index, values in packedTokens:
+            token = Token(index)
+            tokenProperties = token.tokenProperties
+            for i in range(0, len(values), 2):
+                tokenProperties[properties[values[i]]] = values[i + 1]
+            tokens.append(token)
+        edges = [Edge(tokens[From], tokens[to], label, type, note=note, description=description,
+                      renderType=Edge.RenderType.span if span else Edge.RenderType.dependency)
+                 for From, to, label, type, note, span, description in packedEdges]
+        if alignment:
+            renderType = NLPInstance.RenderType.alignment
+        else:
+            renderType = NLPInstance.RenderType.single
+        result.append(NLPInstance(tokens=tokens, edges=edges, renderType=renderType, splitPoints=splitPoints))
+    return result
@@ -5,10 +5,13 @@
 #  CoNLL2004, CoNLL2005, CoNLL2006, CoNLL2008, CoNLL2009 CoNLL2009, Malt-TAB and CCG classes...
 # TabProcessor interface class is omited...
 
+import mmap
+import os
 import sys
 
 from NLPInstance import *
 from ioFormats.CorpusFormat import *
+from ioFormats.MappedRows import iterMappedRows
 
 """
  * A TabFormat loads data from text files where token properties are represented as white-space/tab separated values.
@@ -120,16 +123,44 @@ class TabFormat(CorpusFormat):
                 result[i].merge(openCorpus[i])
         return result
 
-    def loadTabs(self, file, From, to, processor, open):
+    """
+     * Loads the instances from <code>From</code> (inclusive) to <code>to</code> (exclusive) of a file.
+     *
+     * @param file      the (opened) file to load from.
+     * @param From      the index of the first instance.
+     * @param to        the index after the last instance.
+     * @param processor the processor that creates the instances from the rows.
+     * @param open      should the processor create the instances of the open dataset.
+     * @param mapped    if true the file is memory-mapped and the processor gets MappedRow objects (see
+     *                  ioFormats.MappedRows) which only decode the columns the processor reads.
+     * @return the list of loaded instances.
+    """
+    def loadTabs(self, file, From, to, processor, open, mapped=False):
+        if not mapped:
+            return self.loadRows((line.strip() or None for line in file), From, to, processor, open)
+        # An empty file can not be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            return self.loadRows(iterMappedRows(mapping), From, to, processor, open)
+
+    """
+     * Loads the instances from <code>From</code> (inclusive) to <code>to</code> (exclusive) of the stripped lines of a
+     * file (see loadTabs).
+     *
+     * @param lines the rows of the file, None for blank lines.
+     * @return the list of loaded instances.
+    """
+    def loadRows(self, lines, From, to, processor, open):
         corpus = []
         rows = []
         instnceNr = 0
-        for line in file:
+        for line in lines:
             if instnceNr >= to:
                 break
-            line = line.strip()
-            if line == "" or re.match("<\\s>$", line.split()[0]):
-                self._monitor.progressed(instnceNr)
+            if line is None or re.match("<\\s>$", line.split()[0]):
+                if self._monitor is not None:
+                    self._monitor.progressed(instnceNr)
                 instnceNr += 1
                 if instnceNr <= From:  # Equals because ++instnceNr expression
                     continue
@@ -138,12 +169,12 @@ class TabFormat(CorpusFormat):
                 else:
                     instance = processor.create(rows)
                 corpus.append(instance)
-                rows.clear()
+                rows = []
             else:
                 if instnceNr < From:
                     continue
-                rows.append(line.split("\\s+"))  # TODO: rows.add(Arrays.asList(line.split("\\s+")));
-        if len(rows) > 0:
+                rows.append(line)
+        if len(rows) > 0 and instnceNr < to:
             if open:
                 corpus.append(processor.createOpen(rows))
             else:
@@ -1047,3 +1078,13 @@ class CCG:
     @staticmethod
     def supportOpen():
         return False
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+"""
+ * The processors by their command line names: the name of the processor in lower case without spaces and dashes (e.g.
+ * conll2009, malttab).
+"""
+processors = {processor.name.replace(" ", "").replace("-", "").lower(): processor
+              for processor in (CoNLL2000, CoNLL2002, CoNLL2003, CoNLL2004, CoNLL2005, CoNLL2006, CoNLL2008, CoNLL2009,
+                                MaltTab, CCG)}
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8, vim: expandtab:ts=4 -*-
+
+import threading
+from collections import OrderedDict
+
+"""
+ * An LRUCache is a mapping with a maximal number of entries. When it is full, adding an entry removes the least recently
+ * used one. It can be shared by several threads.
+"""
+class LRUCache:
+
+    """
+     * Creates an empty cache.
+     *
+     * @param capacity the maximal number of entries.
+    """
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._map = OrderedDict()
+        self._lock = threading.Lock()
+
+    """
+     * The maximal number of entries. Decreasing it removes the least recently used entries.
+    """
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value):
+        with self._lock:
+            self._capacity = value
+            self._shrink()
+
+    def _shrink(self):
+        while len(self._map) > self._capacity:
+            self._map.popitem(last=False)
+
+    """
+     * Returns the value of a key and marks it as the most recently used entry.
+     *
+     * @param key     the key.
+     * @param default the value to return if the key is not in the cache.
+     * @return the value of the key or the default.
+    """
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._map:
+                return default
+            self._map.move_to_end(key)
+            return self._map[key]
+
+    """
+     * Returns the value of a key without marking it as used.
+     *
+     * @param key     the key.
+     * @param default the value to return if the key is not in the cache.
+     * @return the value of the key or the default.
+    """
+    def peek(self, key, default=None):
+        with self._lock:
+            return self._map.get(key, default)
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._map[key]
+            self._map.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._map[key] = value
+            self._map.move_to_end(key)
+            self._shrink()
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._map[key]
+
+    """
+     * Checks whether a key is in the cache without marking it as used.
+    """
+    def __contains__(self, key):
+        return key in self._map
+
+    def __len__(self):
+        return len(self._map)
+
+    def clear(self):
+        with self._lock:
+            self._map.clear()
@@ -7,6 +7,7 @@ from CorpusNavigator import CorpusNavigator
 from GUI.ChooseFormat import Ui_ChooseFormat
 from GUI.GUI import Ui_MainWindow
 from ioFormats.TabProcessor import *
+from ioFormats.LazyCorpus import LazyCorpus
 
 from TokenFilter import *
 from EdgeLabelFilter import *
@@ -71,6 +72,8 @@ class MyForm(QtGui.QMainWindow):
         self.ui.selectGuessListWidget.itemSelectionChanged.connect(self.refresh)
         self.goldMap = {}
         self.guessMap = {}
+        self.canvas = None
+        self.navigator = None
 
         self.ui.actionExport.setShortcut("Ctrl+S")
         self.ui.actionExport.setStatusTip('Export to SVG')
@@ -104,37 +107,16 @@ class MyForm(QtGui.QMainWindow):
 
     def choosenFile(self, factory, type):
         directory = QtGui.QFileDialog.getOpenFileName(self)
-        corpus = []
+        if not directory:
+            return
+        corpus = LazyCorpus(directory, factory)
         if type == "gold":
             self.goldMap[basename(directory)] = corpus
         if type == "guess":
             self.guessMap[basename(directory)] = corpus
 
-        f = open(directory)
-        l = list(f.readlines())
-
         item = QtGui.QListWidgetItem(basename(directory))
 
-        rows = []
-        instanceNr = 0
-        for line in l:
-            if instanceNr == 200:
-                break
-            line = line.strip()
-            if line == "":
-                instanceNr+=1
-                instance = factory.create(rows)
-                instance.renderType = NLPInstance.RenderType.single
-                corpus.append(instance)
-                del rows[:]
-            else:
-                rows.append(line)
-        if len(rows) > 0:
-            instanceNr+=1
-            instance = factory.create(rows)
-            instance.renderType = NLPInstance.RenderType.single
-            corpus.append(instance)
-
         if type == "gold":
             self.ui.selectGoldListWidget.addItem(item)
             self.ui.selectGoldListWidget.setItemSelected(item, True)
@@ -144,6 +126,12 @@ class MyForm(QtGui.QMainWindow):
             self.ui.selectGuessListWidget.setItemSelected(item, True)
 
     def refresh(self):
+        # The previous navigator and canvas run background threads (prefetching and rendering), stop them first
+        if self.navigator is not None:
+            self.navigator.close()
+            self.navigator = None
+        if self.canvas is not None:
+            self.canvas.close()
 
         self.canvas = NLPCanvas(self.ui)
         self.ui.actionExport.setEnabled(True)
@@ -173,7 +161,8 @@ class MyForm(QtGui.QMainWindow):
             guess = self.guessMap[str(selectedGuess[0].text())]
 
         if gold:
-            CorpusNavigator(canvas=self.canvas, ui=self.ui, goldLoader=gold, guessLoader=guess, edgeTypeFilter=edgeTypeFilter)
+            self.navigator = CorpusNavigator(canvas=self.canvas, ui=self.ui, goldLoader=gold, guessLoader=guess,
+                                             edgeTypeFilter=edgeTypeFilter)
 
     def onItemChanged(self):
         self.refresh()